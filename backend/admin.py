@@ -0,0 +1,19 @@
+from django.contrib import admin
+
+from .models import RedirectRule
+
+
+@admin.register(RedirectRule)
+class RedirectRuleAdmin(admin.ModelAdmin):
+    list_display = (
+        "pattern",
+        "replacement",
+        "match_type",
+        "priority",
+        "is_active",
+        "hits",
+        "last_hit",
+    )
+    list_editable = ("priority", "is_active")
+    list_filter = ("site", "match_type", "is_active")
+    search_fields = ("pattern", "replacement")
@@ -0,0 +1,102 @@
+from typing import NamedTuple
+
+from cms.toolbar.utils import get_toolbar_from_request
+from cms.utils import get_current_site, get_language_from_request
+from cms.utils.placeholder import restore_sekizai_context
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.safestring import mark_safe
+from menus.menu_pool import menu_pool
+from sekizai.helpers import Watcher
+
+from backend import surrogate_keys
+from backend.cache import ALIASES, CATEGORIES, PAGES, POSTS, scoped_key
+
+# Static aliases hold the menu (pages, and the blog's categories and posts
+# in its menu) besides their own plugins.
+GENERATIONS = (ALIASES, PAGES, POSTS, CATEGORIES)
+
+# Stored under the plain key of an alias that renders a menu.
+PER_MENU_PATH = "per-menu-path"
+
+
+class CachedFragment(NamedTuple):
+    content: str
+    # Sekizai blocks (e.g. JavaScript) the alias's plugins add to the page.
+    sekizai: dict
+    surrogate_keys: list
+
+
+def is_cacheable(request):
+    """Whether static aliases are rendered from the cache for ``request``.
+
+    Not for staff, who may edit and see the toolbar, nor in edit or preview
+    mode, which render drafts and editing markup.
+    """
+    toolbar = get_toolbar_from_request(request)
+    if toolbar.edit_mode_active or toolbar.preview_mode_active:
+        return False
+    return not request.user.is_staff
+
+
+def selected_path(request, renderer=None):
+    """Return the selected menu node and its ancestors as far as a cached alias shows them.
+
+    Menus mark the node whose URL is the request path as selected and its
+    parents as ancestors. Only the top ``STATIC_ALIAS_CACHE_MENU_LEVELS``
+    levels are kept, with whether the selected node is among them, so every
+    page below a second-level node shares its navbar.
+    """
+    renderer = renderer or menu_pool.get_renderer(request)
+    node = next((node for node in renderer.get_nodes() if node.selected), None)
+    path = []
+    while node is not None:
+        path.append((node.namespace, node.id))
+        node = node.parent
+    path.reverse()
+    levels = getattr(settings, "STATIC_ALIAS_CACHE_MENU_LEVELS", 2)
+    return path[:levels], len(path) <= levels
+
+
+def _menu_key(key, context):
+    path = selected_path(context["request"], context.get("cms_menu_renderer"))
+    return scoped_key("static-alias-menu", (key, path), generation=GENERATIONS)
+
+
+def render(context, static_code, site_bound, render_alias):
+    """Return the alias rendered by ``render_alias()``, from the cache if there.
+
+    Cached per alias, language, site and whether the visitor is logged in,
+    as menus and plugins show pages and links by login. An alias that
+    renders a menu (it records the ``menu`` surrogate key) is cached per
+    :func:`selected_path` as well, like a ``Vary`` header: only a marker is
+    stored under its plain key. Replays the sekizai blocks and surrogate keys of the alias
+    on a hit.
+    """
+    request = context["request"]
+    scope = (
+        static_code,
+        site_bound,
+        get_language_from_request(request),
+        get_current_site(request).pk,
+        request.user.is_authenticated,
+    )
+    plain_key = key = scoped_key("static-alias", scope, generation=GENERATIONS)
+    fragment = cache.get(key)
+    if fragment == PER_MENU_PATH:
+        key = _menu_key(plain_key, context)
+        fragment = cache.get(key)
+    if fragment is None:
+        watcher = Watcher(context)
+        with surrogate_keys.collect() as keys:
+            content = render_alias()
+        fragment = CachedFragment(str(content), watcher.get_changes(), sorted(keys))
+        timeout = getattr(settings, "STATIC_ALIAS_CACHE_TIMEOUT", 60 * 60)
+        if surrogate_keys.MENU in keys:
+            cache.set(plain_key, PER_MENU_PATH, timeout)
+            key = _menu_key(plain_key, context)
+        cache.set(key, fragment, timeout)
+    else:
+        restore_sekizai_context(context, fragment.sekizai)
+    surrogate_keys.add(*fragment.surrogate_keys)
+    return mark_safe(fragment.content)
@@ -0,0 +1,204 @@
+from django.apps import AppConfig
+
+
+class BackendConfig(AppConfig):
+    name = "backend"
+
+    def ready(self) -> None:
+        from django.contrib.redirects.models import Redirect
+        from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+
+        from cms.models import Page, PageContent, PageUrl
+        from djangocms_alias.models import AliasContent
+        from djangocms_stories.models import Post, PostCategory, PostContent
+        from djangocms_versioning.signals import post_version_operation
+
+        from authors.models import AuthorProfile
+        from backend import cards, reading, related, surrogate_keys
+        from backend.cache import (
+            invalidate_aliases,
+            invalidate_categories,
+            invalidate_pages,
+            invalidate_posts,
+        )
+        from backend.models import PageSearchDocument, PostSearchDocument, RedirectRule
+        from backend.page_cache import invalidate_page_cache
+        from backend.redirects import invalidate_redirects, on_redirect_created
+        from backend.search import on_document_delete, on_version_operation
+
+        for model in (Redirect, RedirectRule):
+            post_save.connect(
+                invalidate_redirects,
+                sender=model,
+                dispatch_uid=f"backend_redirects_save_{model.__name__}",
+            )
+            post_delete.connect(
+                invalidate_redirects,
+                sender=model,
+                dispatch_uid=f"backend_redirects_delete_{model.__name__}",
+            )
+        post_save.connect(
+            on_redirect_created, sender=Redirect, dispatch_uid="backend_redirects_track"
+        )
+
+        for model in (PostContent, PageContent):
+            post_version_operation.connect(
+                on_version_operation,
+                sender=model,
+                dispatch_uid=f"backend_search_version_operation_{model.__name__}",
+            )
+        for model in (PostSearchDocument, PageSearchDocument):
+            post_delete.connect(
+                on_document_delete,
+                sender=model,
+                dispatch_uid=f"backend_search_document_delete_{model.__name__}",
+            )
+
+        # Cards first: their on-commit rebuild then runs before the posts
+        # generation changes, and lookups cached under the new generation
+        # (e.g. backend.neighbours) read the cards.
+        post_version_operation.connect(
+            cards.on_version_operation,
+            sender=PostContent,
+            dispatch_uid="backend_cards_version_operation",
+        )
+        post_save.connect(cards.on_post_change, sender=Post, dispatch_uid="backend_cards_post")
+        m2m_changed.connect(
+            cards.on_post_change,
+            sender=Post.categories.through,
+            dispatch_uid="backend_cards_categories",
+        )
+        post_save.connect(
+            cards.on_author_change, sender=AuthorProfile, dispatch_uid="backend_cards_author"
+        )
+        for model in (PostCategory, PostCategory._parler_meta.root_model):
+            post_save.connect(
+                cards.on_category_change,
+                sender=model,
+                dispatch_uid=f"backend_cards_category_save_{model.__name__}",
+            )
+            pre_delete.connect(
+                cards.on_category_change,
+                sender=model,
+                dispatch_uid=f"backend_cards_category_delete_{model.__name__}",
+            )
+        for model in (Page, PageUrl):
+            post_save.connect(
+                cards.on_page_change, sender=model, dispatch_uid=f"backend_cards_page_{model.__name__}"
+            )
+        # Main images and author photos.
+        post_save.connect(
+            cards.on_image_change,
+            sender=Post._meta.get_field("main_image").related_model,
+            dispatch_uid="backend_cards_image",
+        )
+
+        # Related posts are computed from the cards and search documents.
+        post_version_operation.connect(
+            related.on_version_operation,
+            sender=PostContent,
+            dispatch_uid="backend_related_version_operation",
+        )
+        for field in ("sites", "categories", "tags"):
+            m2m_changed.connect(
+                related.on_post_change,
+                sender=getattr(Post, field).through,
+                dispatch_uid=f"backend_related_{field}",
+            )
+
+        post_version_operation.connect(
+            invalidate_posts,
+            sender=PostContent,
+            dispatch_uid="backend_posts_version_operation",
+        )
+        # Sites, categories, tags and dates live on the post itself.
+        post_save.connect(invalidate_posts, sender=Post, dispatch_uid="backend_posts_save")
+        post_delete.connect(invalidate_posts, sender=Post, dispatch_uid="backend_posts_delete")
+        # Post details and cards show the author's profile.
+        post_save.connect(
+            invalidate_posts, sender=AuthorProfile, dispatch_uid="backend_posts_author"
+        )
+        for field in ("sites", "categories", "tags"):
+            m2m_changed.connect(
+                invalidate_posts,
+                sender=getattr(Post, field).through,
+                dispatch_uid=f"backend_posts_{field}",
+            )
+
+        for model in (PostCategory, PostCategory._parler_meta.root_model):
+            post_save.connect(
+                invalidate_categories,
+                sender=model,
+                dispatch_uid=f"backend_categories_save_{model.__name__}",
+            )
+            post_delete.connect(
+                invalidate_categories,
+                sender=model,
+                dispatch_uid=f"backend_categories_delete_{model.__name__}",
+            )
+
+        # Pages and posts show images; replacing an image's file saves it.
+        for invalidate in (invalidate_posts, invalidate_pages):
+            post_save.connect(
+                invalidate,
+                sender=Post._meta.get_field("main_image").related_model,
+                dispatch_uid=f"backend_{invalidate.__name__}_image",
+            )
+
+        post_version_operation.connect(
+            invalidate_pages,
+            sender=PageContent,
+            dispatch_uid="backend_pages_version_operation",
+        )
+        # Moving a page or changing its slug rewrites its URLs.
+        for model in (Page, PageUrl):
+            post_save.connect(
+                invalidate_pages, sender=model, dispatch_uid=f"backend_pages_save_{model.__name__}"
+            )
+            post_delete.connect(
+                invalidate_pages,
+                sender=model,
+                dispatch_uid=f"backend_pages_delete_{model.__name__}",
+            )
+
+        post_version_operation.connect(
+            invalidate_aliases,
+            sender=AliasContent,
+            dispatch_uid="backend_aliases_version_operation",
+        )
+
+        for model in (PageContent, PostContent, AliasContent):
+            post_version_operation.connect(
+                invalidate_page_cache,
+                sender=model,
+                dispatch_uid=f"backend_page_cache_version_operation_{model.__name__}",
+            )
+
+        for model in (PageContent, PostContent, AliasContent):
+            post_version_operation.connect(
+                surrogate_keys.on_version_operation,
+                sender=model,
+                dispatch_uid=f"backend_surrogate_keys_version_operation_{model.__name__}",
+            )
+        for model in (PostCategory, PostCategory._parler_meta.root_model):
+            post_save.connect(
+                surrogate_keys.on_category_change,
+                sender=model,
+                dispatch_uid=f"backend_surrogate_keys_category_save_{model.__name__}",
+            )
+            post_delete.connect(
+                surrogate_keys.on_category_change,
+                sender=model,
+                dispatch_uid=f"backend_surrogate_keys_category_delete_{model.__name__}",
+            )
+        post_save.connect(
+            surrogate_keys.on_author_change,
+            sender=AuthorProfile,
+            dispatch_uid="backend_surrogate_keys_author",
+        )
+
+        post_version_operation.connect(
+            reading.on_version_operation,
+            sender=PostContent,
+            dispatch_uid="backend_reading_version_operation",
+        )
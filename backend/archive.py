@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractMonth, ExtractYear
+from djangocms_stories.models import PostContent
+
+from backend.cache import scoped_key
+
+
+def archive_months(app_config_id, language, site_id):
+    """Return ``{(year, month): count}`` of the published posts of one blog, newest first.
+
+    Months are those of ``date_published`` in the current time zone, as the
+    archive views filter on; posts without one are in no month. Counted
+    with one grouped query and cached until the next publish or unpublish.
+    """
+    key = scoped_key("archive", (app_config_id, language, site_id))
+    months = cache.get(key)
+    if months is None:
+        rows = (
+            PostContent.objects.filter(language=language, post__app_config=app_config_id)
+            .filter(Q(post__sites__isnull=True) | Q(post__sites=site_id))
+            .exclude(post__date_published=None)
+            .annotate(
+                year=ExtractYear("post__date_published"),
+                month=ExtractMonth("post__date_published"),
+            )
+            .values_list("year", "month")
+            .annotate(count=Count("pk"))
+            .order_by("-year", "-month")
+        )
+        months = {(year, month): count for year, month, count in rows}
+        timeout = getattr(settings, "BLOG_LISTING_CACHE_TIMEOUT", 60 * 60 * 24)
+        cache.set(key, months, timeout)
+    return months
+
+
+def has_posts(app_config_id, language, site_id, year, month=None):
+    """Whether the archive of ``year`` (and ``month``) lists any post."""
+    months = archive_months(app_config_id, language, site_id)
+    if month is not None:
+        return (year, month) in months
+    return any(archived_year == year for archived_year, _month in months)
+
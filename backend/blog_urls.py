@@ -2,11 +2,13 @@ from django.urls import path
 
 from djangocms_stories.urls import urlpatterns as stories_urlpatterns
 
+from .feeds import CachedFBInstantArticles, CachedLatestEntriesFeed, CachedTagFeed
 from .views import (
     OptimizedAuthorEntriesView,
     OptimizedCategoryEntriesView,
     OptimizedPostArchiveView,
     OptimizedTaggedListView,
+    PostSuggestView,
     SearchPostListView,
 )
 
@@ -21,10 +23,25 @@ _optimized = {
     "posts-tagged": OptimizedTaggedListView,
 }
 
+# Feeds we serve from the cache, with conditional GET (see CachedFeedMixin).
+_cached_feeds = {
+    "posts-latest-feed": CachedLatestEntriesFeed,
+    "posts-latest-feed-fb": CachedFBInstantArticles,
+    "posts-tagged-feed": CachedTagFeed,
+}
+
 urlpatterns = []
 for p in stories_urlpatterns:
     view = _optimized.get(p.name)
+    feed = _cached_feeds.get(p.name)
     if view is not None:
         urlpatterns.append(path(str(p.pattern), view.as_view(), name=p.name))
+    elif feed is not None:
+        urlpatterns.append(path(str(p.pattern), feed(), name=p.name))
     else:
         urlpatterns.append(p)
+    if p.name == "posts-latest":
+        # Ahead of the slug-only permalinks, which would match "suggest/" too.
+        urlpatterns.append(
+            path("suggest/", PostSuggestView.as_view(), name="posts-suggest")
+        )
@@ -0,0 +1,151 @@
+import hashlib
+import math
+import time
+from typing import NamedTuple
+from uuid import uuid4
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models import Min, Q
+from django.utils.timezone import now
+
+# Generation of everything derived from the published blog posts.
+POSTS = "posts"
+# Generation of everything derived from the blog categories.
+CATEGORIES = "categories"
+# Generation of everything derived from the published CMS pages.
+PAGES = "pages"
+# Generation of everything derived from the published static aliases.
+ALIASES = "aliases"
+
+
+def _generation_key(name):
+    return f"backend:generations:{name}"
+
+
+def next_post_change():
+    """Return when the next scheduled post goes live or expires, or ``None``.
+
+    Published listings compare the publication window of posts with the
+    current time, so they change then without anything being published.
+    """
+    from djangocms_stories.models import Post
+
+    current = now()
+    dates = Post.objects.aggregate(
+        start=Min("date_published", filter=Q(date_published__gt=current)),
+        end=Min("date_published_end", filter=Q(date_published_end__gt=current)),
+    )
+    return min(filter(None, dates.values()), default=None)
+
+
+# Generation name -> when it changes by itself, see generation_timeout().
+SCHEDULES = {POSTS: next_post_change}
+
+
+def generation_timeout(name):
+    """Seconds until the generation of ``name`` changes by itself, ``None`` for never."""
+    schedule = SCHEDULES.get(name)
+    when = schedule() if schedule is not None else None
+    if when is None:
+        return None
+    # A second late rather than early, so the new generation sees the change.
+    return math.ceil((when - now()).total_seconds()) + 1
+
+
+class Generation(NamedTuple):
+    token: str
+    # Epoch seconds when it changed, and when it changes by itself (or None).
+    changed: float
+    expires: float | None
+
+
+def _new_generation(name):
+    # Random tokens rather than a counter: after an eviction a restarted
+    # counter could reproduce a value a worker built an index under.
+    timeout = generation_timeout(name)
+    current = time.time()
+    expires = current + timeout if timeout is not None else None
+    return Generation(uuid4().hex, current, expires), timeout
+
+
+def generation(name):
+    """Return the current :class:`Generation` of ``name``.
+
+    A generation that is not in the cache (never set, expired or evicted)
+    starts now, so ``changed`` never lies before the data last changed.
+    """
+    key = _generation_key(name)
+    current = cache.get(key)
+    if current is None:
+        current, timeout = _new_generation(name)
+        if not cache.add(key, current, timeout=timeout):
+            current = cache.get(key, current)
+    return current
+
+
+def is_shared():
+    """Whether the default cache, and with it the generations, is shared by all processes.
+
+    A per-process cache (the default without ``CACHE_URL``) only sees the
+    changes saved in its own process.
+    """
+    return not isinstance(caches["default"], (LocMemCache, DummyCache))
+
+
+def get_generation(name):
+    """Return the current generation token for ``name``.
+
+    Process-local lookups (e.g. the redirect index) remember the token they
+    were built under and rebuild once it changes. The token lives in the
+    default cache, so a change saved in one worker is picked up by all of
+    them as long as the cache is shared. A generation with a schedule (see
+    :data:`SCHEDULES`) expires when its data changes by itself.
+    """
+    return generation(name).token
+
+
+def bump_generation(name):
+    """Invalidate everything built under the current generation of ``name``."""
+    current, timeout = _new_generation(name)
+    cache.set(_generation_key(name), current, timeout=timeout)
+
+
+def scoped_key(prefix, scope, generation=POSTS):
+    """Cache key for a value computed for ``scope`` under the current ``generation``.
+
+    ``scope`` is any ``repr``-able value identifying what was computed, e.g.
+    a listing with its arguments, language and site. ``generation`` may be a
+    tuple of names for values derived from several sources; the key changes
+    with any of them.
+    """
+    names = (generation,) if isinstance(generation, str) else generation
+    tokens = ":".join(get_generation(name) for name in names)
+    digest = hashlib.md5(repr(scope).encode(), usedforsecurity=False).hexdigest()
+    return f"backend:{prefix}:{tokens}:{digest}"
+
+
+def invalidate_posts(**kwargs):
+    """Signal receiver: invalidate everything built from the published posts.
+
+    Deferred until the transaction commits, so a worker rebuilding in the
+    meantime cannot store the old state under the new generation.
+    """
+    transaction.on_commit(lambda: bump_generation(POSTS))
+
+
+def invalidate_categories(**kwargs):
+    """Signal receiver: invalidate everything built from the blog categories."""
+    transaction.on_commit(lambda: bump_generation(CATEGORIES))
+
+
+def invalidate_pages(**kwargs):
+    """Signal receiver: invalidate everything built from the published CMS pages."""
+    transaction.on_commit(lambda: bump_generation(PAGES))
+
+
+def invalidate_aliases(**kwargs):
+    """Signal receiver: invalidate everything built from the published static aliases."""
+    transaction.on_commit(lambda: bump_generation(ALIASES))
@@ -0,0 +1,225 @@
+import logging
+
+from cms.models import Page
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils.text import Truncator
+from djangocms_stories.models import Post, PostContent
+from djangocms_stories.settings import get_setting
+from djangocms_versioning.constants import OPERATION_PUBLISH, OPERATION_UNPUBLISH
+from easy_thumbnails.exceptions import InvalidImageFormatError
+from easy_thumbnails.files import get_thumbnailer
+
+from backend.models import PostCard
+
+logger = logging.getLogger(__name__)
+
+# Order of a post's categories; the first one is shown on its card.
+CATEGORY_ORDER = (F("priority").asc(nulls_last=True), "pk")
+
+# Post attribute holding its categories in CATEGORY_ORDER, prefetched by
+# ``backend.views.OptimizedListMixin`` for drafts.
+LISTED_CATEGORIES = "listed_categories"
+
+# Card layout -> (srcset width, thumbnail options) of the main image, as the
+# layout's template used to request them with {% thumbnail %}. The middle
+# size is the ``src``.
+CARD_IMAGES = {
+    # blog/includes/post_item.html
+    "list": [
+        ("300w", {"size": (1000, 800), "quality": 85}),
+        ("450w", {"size": (600, 450), "quality": 55}),
+        ("620w", {"size": (700, 500), "quality": 85}),
+    ],
+    # blog/includes/card_image_top.html
+    "top": [
+        ("400w", {"size": (400, 241), "crop": "smart", "quality": 55}),
+        ("600w", {"size": (600, 362), "crop": "smart", "quality": 55}),
+        ("800w", {"size": (800, 482), "crop": "smart", "quality": 55}),
+    ],
+}
+
+# Author photos are shown at most 135px wide (blog/includes/card_author.html).
+AUTHOR_PHOTO = {"size": (270, 0), "quality": 85}
+
+
+def thumbnail_url(image, options):
+    """Return the URL of a thumbnail of the filer ``image``, or ``""`` if it cannot be made."""
+    try:
+        return (
+            get_thumbnailer(image)
+            .get_thumbnail({**options, "subject_location": image.subject_location})
+            .url
+        )
+    except (InvalidImageFormatError, OSError):
+        logger.warning("Cannot make a thumbnail of image %s", image.pk)
+        return ""
+
+
+def image_sizes(image):
+    """Return ``{layout: {"src": url, "srcset": srcset}}`` for the main ``image``."""
+    sizes = {}
+    for layout, thumbnails in CARD_IMAGES.items():
+        urls = [(width, thumbnail_url(image, options)) for width, options in thumbnails]
+        if not all(url for _width, url in urls):
+            continue
+        sizes[layout] = {
+            "src": urls[len(urls) // 2][1],
+            "srcset": ", ".join(f"{url} {width}" for width, url in urls),
+        }
+    return sizes
+
+
+def primary_category(post):
+    """Return the first category of ``post`` in ``CATEGORY_ORDER``, or ``None``."""
+    categories = getattr(post, LISTED_CATEGORIES, None)
+    if categories is None:
+        return post.categories.order_by(*CATEGORY_ORDER).first()
+    return categories[0] if categories else None
+
+
+def build_card(post_content):
+    """Return an unsaved :class:`PostCard` for ``post_content``."""
+    post = post_content.post
+    language = post_content.language
+    card = PostCard(
+        post=post,
+        language=language,
+        post_content=post_content,
+        title=post_content.title,
+        subtitle=post_content.subtitle or "",
+        url=post_content.get_absolute_url(language),
+    )
+
+    truncate = get_setting("POSTS_LIST_TRUNCWORDS_COUNT")
+    abstract = post_content.abstract or ""
+    card.abstract = Truncator(abstract).words(truncate, html=True) if truncate else abstract
+
+    category = primary_category(post)
+    if category is not None:
+        card.category = category.safe_translation_getter(
+            "name", language_code=language, any_language=True, default=""
+        )
+
+    author = post.author
+    profile = getattr(author, "author_profile", None) if author else None
+    if profile is not None:
+        card.author_has_profile = True
+        card.author_name = profile.name
+        card.author_role = profile.safe_translation_getter(
+            "role", language_code=language, any_language=True, default=""
+        )
+        if profile.photo:
+            card.author_photo_url = thumbnail_url(profile.photo, AUTHOR_PHOTO)
+        card.author_photo_accents = profile.has_photo_accents
+        card.author_photo_shadow = profile.has_drop_shadow
+    elif author is not None:
+        card.author_name = author.get_full_name()
+
+    if post.main_image:
+        card.image_alt = post.main_image.default_alt_text or ""
+        card.images = image_sizes(post.main_image)
+    return card
+
+
+def update_card(post_content):
+    """Store the card of ``post_content`` as its post's card in its language."""
+    card = build_card(post_content)
+    fields = {
+        field.name: getattr(card, field.name)
+        for field in PostCard._meta.concrete_fields
+        if field.name not in ("id", "post", "language")
+    }
+    card, _created = PostCard.objects.update_or_create(
+        post=post_content.post, language=post_content.language, defaults=fields
+    )
+    return card
+
+
+def drop_card(post_content):
+    """Drop the card of ``post_content``'s post in its language."""
+    PostCard.objects.filter(
+        post_id=post_content.post_id, language=post_content.language
+    ).delete()
+
+
+def update_post_cards(post_pks):
+    """Rebuild the cards of the published contents of the posts in ``post_pks``."""
+    # The default manager only returns published versions.
+    for post_content in PostContent.objects.filter(post__in=post_pks).select_related(
+        "post__app_config", "post__main_image", "post__author"
+    ):
+        update_card(post_content)
+
+
+def on_version_operation(sender, obj, operation, **kwargs):
+    """Signal receiver: keep cards in step with what is published."""
+    content = obj.content
+    if operation == OPERATION_PUBLISH:
+        transaction.on_commit(lambda: update_card(content))
+    elif operation == OPERATION_UNPUBLISH and kwargs.get("to_be_published") is None:
+        # When a newer version replaces this one, its publish rebuilds the card.
+        transaction.on_commit(lambda: drop_card(content))
+
+
+def on_post_change(sender, instance, action=None, pk_set=None, **kwargs):
+    """Signal receiver: rebuild the cards of a saved post or of posts changing categories."""
+    if action is not None and not action.startswith("post_"):
+        return
+    if isinstance(instance, Post):
+        post_pks = [instance.pk]
+    elif pk_set:
+        # A category gained or lost posts.
+        post_pks = list(pk_set)
+    else:
+        # A category's posts were cleared; they are no longer known.
+        return
+    transaction.on_commit(lambda: update_post_cards(post_pks))
+
+
+def on_author_change(sender, instance, **kwargs):
+    """Signal receiver: rebuild the cards of the posts of a changed author profile."""
+    if instance.user_id is None:
+        return
+    post_pks = list(Post.objects.filter(author=instance.user_id).values_list("pk", flat=True))
+    transaction.on_commit(lambda: update_post_cards(post_pks))
+
+
+def on_category_change(sender, instance, **kwargs):
+    """Signal receiver: rebuild the cards of the posts of a changed category.
+
+    Connected to ``pre_delete`` as well, while the category's posts are
+    still known.
+    """
+    category_pk = getattr(instance, "master_id", instance.pk)
+    post_pks = list(Post.objects.filter(categories=category_pk).values_list("pk", flat=True))
+    if post_pks:
+        transaction.on_commit(lambda: update_post_cards(post_pks))
+
+
+def on_page_change(sender, instance, **kwargs):
+    """Signal receiver: rebuild the cards of the posts under a moved apphook page.
+
+    Their URLs start with the URL of the page the blog is hooked to.
+    """
+    page = instance if isinstance(instance, Page) else instance.page
+    if not page.application_namespace:
+        return
+    post_pks = list(
+        Post.objects.filter(app_config__namespace=page.application_namespace).values_list(
+            "pk", flat=True
+        )
+    )
+    if post_pks:
+        transaction.on_commit(lambda: update_post_cards(post_pks))
+
+
+def on_image_change(sender, instance, **kwargs):
+    """Signal receiver: rebuild the cards showing a changed or replaced image."""
+    post_pks = list(
+        Post.objects.filter(
+            Q(main_image=instance.pk) | Q(author__author_profile__photo=instance.pk)
+        ).values_list("pk", flat=True)
+    )
+    if post_pks:
+        transaction.on_commit(lambda: update_post_cards(post_pks))
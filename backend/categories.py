@@ -0,0 +1,66 @@
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import NoReverseMatch, reverse
+from django.utils import translation
+from djangocms_stories.models import PostCategory
+
+from backend.cache import CATEGORIES, PAGES, scoped_key
+
+
+class CategoryLink(NamedTuple):
+    pk: int
+    name: str
+    slug: str
+    url: str
+
+
+def blog_categories(language, site, app_config):
+    """Return the categories of ``app_config`` as :class:`CategoryLink`\\s, for navigation.
+
+    Sorted by priority, categories without one last, then by name in
+    ``language``. Categories without a slug cannot be linked and are left
+    out. Cached per language, site and app config until a category or one of
+    its translations changes, or a page is published, which can move the
+    blog's apphook and with it every link.
+    """
+    scope = (language, site.pk, app_config.pk)
+    key = scoped_key("categories", scope, generation=(CATEGORIES, PAGES))
+    links = cache.get(key)
+    if links is None:
+        # Translations are prefetched rather than joined for ordering, which
+        # would list a category once per translation.
+        categories = sorted(
+            PostCategory.objects.filter(app_config=app_config).prefetch_related(
+                "translations"
+            ),
+            key=lambda category: (
+                category.priority is None,
+                category.priority or 0,
+                category.safe_translation_getter(
+                    "name", default="", language_code=language, any_language=True
+                ).casefold(),
+            ),
+        )
+        links = []
+        with translation.override(language):
+            for category in categories:
+                slug = category.safe_translation_getter(
+                    "slug", language_code=language, any_language=True
+                )
+                if not slug:
+                    continue
+                try:
+                    url = reverse(
+                        f"{app_config.namespace}:posts-category", kwargs={"category": slug}
+                    )
+                except NoReverseMatch:
+                    continue
+                name = category.safe_translation_getter(
+                    "name", default="", language_code=language, any_language=True
+                )
+                links.append(CategoryLink(category.pk, name, slug, url))
+        timeout = getattr(settings, "BLOG_LISTING_CACHE_TIMEOUT", 60 * 60 * 24)
+        cache.set(key, links, timeout)
+    return links
@@ -0,0 +1,33 @@
+from cms.plugin_base import CMSPluginBase
+from cms.plugin_pool import plugin_pool
+from cms.utils import get_current_site
+from django.utils.timezone import now
+from django.utils.translation import get_language
+from djangocms_stories import cms_plugins as stories_plugins
+
+from backend.archive import archive_months
+
+# Replaces the library's plugin under the same name, which existing plugin
+# instances are stored with.
+plugin_pool.unregister_plugin(stories_plugins.BlogArchivePlugin)
+
+
+@plugin_pool.register_plugin
+class BlogArchivePlugin(stories_plugins.BlogArchivePlugin):
+    """The library's archive plugin, answered from :func:`backend.archive.archive_months`."""
+
+    def render(self, context, instance, placeholder):
+        """List the months of ``date_published`` in the current language.
+
+        Those are the months the linked month pages list, rather than those
+        of the featured or modification date in any language.
+        """
+        context = CMSPluginBase.render(self, context, instance, placeholder)
+        site = get_current_site(context["request"])
+        months = archive_months(instance.app_config_id, get_language(), site.pk)
+        first = now().replace(day=1)
+        context["dates"] = [
+            {"date": first.replace(year=year, month=month), "count": count}
+            for (year, month), count in months.items()
+        ]
+        return context
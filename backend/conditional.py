@@ -0,0 +1,62 @@
+import hashlib
+import math
+import time
+from typing import NamedTuple
+
+from cms.views import details
+from django.conf import settings
+from djangocms_stories.views import PostDetailView
+
+from backend.cache import ALIASES, CATEGORIES, PAGES, POSTS, generation, is_shared
+from backend.page_cache import shared_params
+
+# What a CMS page or post detail shows besides itself: the menu (all
+# pages), latest-posts plugins, related and adjacent posts (all posts),
+# category names and the static aliases. Publishing any of them changes
+# the validators of every page; the page or post itself is among them.
+GENERATIONS = (PAGES, POSTS, CATEGORIES, ALIASES)
+
+
+def is_content_view(view_func):
+    """Whether ``view_func`` renders a CMS page or a post detail."""
+    if view_func is details:
+        return True
+    view_class = getattr(view_func, "view_class", None)
+    return view_class is not None and issubclass(view_class, PostDetailView)
+
+
+class Validators(NamedTuple):
+    etag: str
+    # Epoch seconds.
+    last_modified: int
+    # Seconds a response may be reused without revalidation.
+    max_age: int
+
+
+def validators(request):
+    """Return the :class:`Validators` of a page or post detail, or ``None`` if personal.
+
+    Computed from the generations the response is rendered from, without
+    looking up or rendering the page: a cache lookup per generation and
+    request. Last-Modified is when the latest of them changed, including
+    scheduled posts going live or expiring (see ``backend.cache.SCHEDULES``).
+    ``max_age`` is ``CONDITIONAL_MAX_AGE``, cut short by the next scheduled
+    change. The ETag is weak, as pages embed a freshly masked CSRF token
+    whenever they render a form.
+
+    ``None`` as well with a per-process cache: a publish in another process
+    would not change the validators, and stale pages would be confirmed.
+    """
+    if shared_params(request) is None or not is_shared():
+        return None
+    generations = [generation(name) for name in GENERATIONS]
+    scope = getattr(request, "LANGUAGE_CODE", settings.LANGUAGE_CODE)
+    tag = ":".join([scope, *(current.token for current in generations)])
+    etag = 'W/"{}"'.format(hashlib.md5(tag.encode(), usedforsecurity=False).hexdigest())
+    # Rounded up, so that a change within the second is not taken for older.
+    last_modified = math.ceil(max(current.changed for current in generations))
+    max_age = getattr(settings, "CONDITIONAL_MAX_AGE", 60)
+    expires = [current.expires for current in generations if current.expires is not None]
+    if expires:
+        max_age = max(0, min(max_age, math.floor(min(expires) - time.time())))
+    return Validators(etag, last_modified, max_age)
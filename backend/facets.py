@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import CharField, Count, F, Value
+from django.db.models.functions import Coalesce, ExtractYear
+from djangocms_stories.models import PostContent
+
+from backend.cache import scoped_key
+
+# Facet name -> expression giving the facet value of a post content row.
+FACETS = {
+    "categories": F("post__categories"),
+    "tags": F("post__tags"),
+    "years": ExtractYear(Coalesce("post__date_published", "post__date_created")),
+}
+
+
+def count_facets(queryset):
+    """Count the posts in ``queryset`` per category, tag and publication year.
+
+    Returns ``{"categories": {pk: count}, "tags": {pk: count}, "years":
+    {year: count}}``, computed by one query: a ``UNION ALL`` of one grouped
+    count per facet, over the primary keys of ``queryset``. Posts without a
+    category or tag do not show up under that facet.
+    """
+    # Ordering, ranking annotations and prefetches of the listing do not
+    # belong in a GROUP BY, so only its primary keys are reused.
+    base = PostContent.admin_manager.filter(pk__in=queryset.order_by().values("pk"))
+    grouped = [
+        base.annotate(facet=Value(name, output_field=CharField()), value=expression)
+        .exclude(value=None)
+        .values_list("facet", "value")
+        .annotate(count=Count("pk"))
+        .order_by()
+        for name, expression in FACETS.items()
+    ]
+    counts = {name: {} for name in FACETS}
+    for name, value, count in grouped[0].union(*grouped[1:], all=True):
+        counts[name][value] = count
+    return counts
+
+
+def cached_facets(queryset, scope):
+    """Return :func:`count_facets` for ``queryset``, cached under ``scope``.
+
+    ``scope`` must identify the result set, e.g. the listing, its URL
+    arguments, the search query, the language and the site. Entries are
+    dropped with the ``posts`` generation, i.e. whenever a post is published
+    or unpublished.
+    """
+    key = scoped_key("facets", scope)
+    facets = cache.get(key)
+    if facets is None:
+        facets = count_facets(queryset)
+        timeout = getattr(settings, "BLOG_LISTING_CACHE_TIMEOUT", 60 * 60 * 24)
+        cache.set(key, facets, timeout)
+    return facets
+
@@ -0,0 +1,92 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.sites.shortcuts import get_current_site
+from django.core.cache import cache
+from django.db.models import Max, Q
+from django.utils.cache import quote_etag
+from django.utils.http import http_date
+from django.utils.timezone import now
+from django.utils.translation import get_language
+from djangocms_stories.feeds import FBInstantArticles, LatestEntriesFeed, TagFeed
+from djangocms_stories.models import Post, PostContent
+from djangocms_versioning.constants import PUBLISHED, UNPUBLISHED
+from djangocms_versioning.models import Version
+
+from backend.cache import POSTS, generation_timeout, scoped_key
+from backend.page_cache import freeze, replay
+
+
+def last_published(namespace):
+    """Return when the posts the blog ``namespace`` lists last changed.
+
+    That is the latest publish or unpublish of one of its post versions, or
+    a scheduled post going live or expiring since.
+    """
+    versions = Version.objects.filter(
+        content_type=ContentType.objects.get_for_model(PostContent),
+        object_id__in=PostContent.admin_manager.filter(
+            post__app_config__namespace=namespace
+        ).values("pk"),
+        state__in=(PUBLISHED, UNPUBLISHED),
+    ).aggregate(last=Max("modified"))
+    current = now()
+    scheduled = Post.objects.filter(app_config__namespace=namespace).aggregate(
+        start=Max("date_published", filter=Q(date_published__lte=current)),
+        end=Max("date_published_end", filter=Q(date_published_end__lte=current)),
+    )
+    return max(filter(None, [versions["last"], *scheduled.values()]), default=None)
+
+
+class CachedFeedMixin:
+    """Render a feed once per publish event and answer conditional GETs from the cache.
+
+    The rendered feed is cached per URL, language, site and scheme under the
+    ``posts`` generation, with its headers as :mod:`backend.page_cache`
+    stores them, plus an ETag (a hash of the feed) and Last-Modified
+    (:func:`last_published`). The entry expires when the next scheduled post
+    goes live or expires. A poll whose ``If-None-Match`` or
+    ``If-Modified-Since`` matches gets a 304 without a query.
+    """
+
+    def __call__(self, request, *args, **kwargs):
+        match = request.resolver_match
+        scope = (
+            match.namespace,
+            match.url_name,
+            sorted(kwargs.items()),
+            get_language(),
+            get_current_site(request).pk,
+            request.is_secure(),
+        )
+        key = scoped_key("feed", scope)
+        feed = cache.get(key)
+        if feed is None:
+            response = super().__call__(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            response["ETag"] = quote_etag(
+                hashlib.md5(response.content, usedforsecurity=False).hexdigest()
+            )
+            last_modified = last_published(match.namespace)
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified.timestamp())
+            feed = freeze(response)
+            timeout = getattr(settings, "BLOG_LISTING_CACHE_TIMEOUT", 60 * 60 * 24)
+            # Scheduled posts enter or leave the feed without a publish.
+            scheduled = generation_timeout(POSTS)
+            cache.set(key, feed, min(timeout, scheduled) if scheduled is not None else timeout)
+        return replay(request, feed)
+
+
+class CachedLatestEntriesFeed(CachedFeedMixin, LatestEntriesFeed):
+    pass
+
+
+class CachedFBInstantArticles(CachedFeedMixin, FBInstantArticles):
+    pass
+
+
+class CachedTagFeed(CachedFeedMixin, TagFeed):
+    pass
@@ -0,0 +1,70 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from djangocms_stories.models import PostContent
+
+from backend.reading import store_reading_time
+
+
+def store_chunk(pks):
+    """Store the reading times of the published post contents in ``pks``."""
+    # The default manager only returns published versions.
+    for post_content in PostContent.objects.filter(pk__in=pks):
+        store_reading_time(post_content)
+    return len(pks)
+
+
+def store_chunk_in_thread(pks):
+    try:
+        return store_chunk(pks)
+    finally:
+        # Each worker thread has opened connections of its own.
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Store the reading time of published post versions that have none. "
+        "Publishing stores it for new versions; run this once after deploying it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            dest="recompute",
+            help="Recompute stored reading times as well, e.g. after changing "
+            "BLOG_READING_WORDS_PER_MINUTE.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of threads extracting text in parallel (default: 4).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=50,
+            help="Posts handed to a worker at a time (default: 50).",
+        )
+
+    def handle(self, *args, recompute, workers, chunk_size, **options):
+        started = time.monotonic()
+        contents = PostContent.objects.order_by("pk")
+        if not recompute:
+            contents = contents.filter(reading_time__isnull=True)
+        pks = list(contents.values_list("pk", flat=True))
+        chunks = [pks[start : start + chunk_size] for start in range(0, len(pks), chunk_size)]
+
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                count = sum(executor.map(store_chunk_in_thread, chunks))
+        else:
+            count = sum(store_chunk(chunk) for chunk in chunks)
+
+        self.stdout.write(
+            f"Stored the reading time of {count} post(s) in {time.monotonic() - started:.1f}s."
+        )
@@ -0,0 +1,104 @@
+from collections import Counter
+from urllib.parse import urlsplit
+
+from cms.models import PageUrl
+from cms.views import details
+from django.contrib.redirects.models import Redirect
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.urls import Resolver404, resolve
+
+from backend.redirects import invalidate_redirects, redirect_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Point every redirect straight at the end of its chain. Only redirects are "
+        "followed, the way PathOnlyRedirectFallbackMiddleware answers them (exact "
+        "path or its trailing-slash variant, forwarding the query string). A chain "
+        "ends at a target that a view or CMS page answers, or that no redirect "
+        "matches; redirect rules are left to the middleware. Cycles are reported "
+        "and left alone."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report hop counts and the changes that would be made.",
+        )
+        parser.add_argument(
+            "--max-hops",
+            type=int,
+            default=20,
+            help="Treat longer chains as cycles (default: 20).",
+        )
+
+    def handle(self, *args, **options):
+        hop_counts = Counter()
+        changed = []
+        cycles = []
+        for redirect in Redirect.objects.order_by("site_id", "old_path"):
+            final, hops, cyclic = self.follow(redirect, options["max_hops"])
+            hop_counts[hops] += 1
+            if cyclic:
+                cycles.append(redirect)
+                self.stdout.write(f"cycle: {redirect.old_path} -> {redirect.new_path}")
+            elif final != redirect.new_path:
+                self.stdout.write(
+                    f"{redirect.old_path}: {redirect.new_path} -> {final or '(gone)'} "
+                    f"({hops} hops)"
+                )
+                redirect.new_path = final
+                changed.append(redirect)
+
+        for hops, count in sorted(hop_counts.items()):
+            self.stdout.write(f"{count} redirect(s) with {hops} hop(s)")
+
+        if options["dry_run"]:
+            verb = "Would rewrite"
+        else:
+            with transaction.atomic():
+                Redirect.objects.bulk_update(changed, ["new_path"], batch_size=500)
+            if changed:
+                # bulk_update sends no post_save, so invalidate the index here.
+                invalidate_redirects()
+            verb = "Rewrote"
+        self.stdout.write(
+            f"{verb} {len(changed)} redirect(s); {len(cycles)} cycle(s) left unchanged."
+        )
+
+    def follow(self, redirect, max_hops):
+        """Return ``(final_target, hops, is_cycle)`` for a visitor hitting ``redirect``."""
+        seen = {redirect.pk}
+        url = redirect.new_path
+        hops = 1
+        while url:
+            parts = urlsplit(url)
+            if parts.scheme or parts.netloc or not parts.path.startswith("/"):
+                break
+            if self.is_live(redirect.site_id, parts.path):
+                break
+            target = redirect_index.lookup(redirect.site_id, parts.path, rules=False)
+            if target is None:
+                break
+            if target.pk in seen or hops >= max_hops:
+                return url, hops, True
+            seen.add(target.pk)
+            hops += 1
+            url = target.new_path
+            if url and parts.query:
+                url = f"{url}{'&' if '?' in url else '?'}{parts.query}"
+        return url, hops, False
+
+    @staticmethod
+    def is_live(site_id, path):
+        """Whether a view or CMS page answers ``path``, so its redirects never apply."""
+        try:
+            match = resolve(path)
+        except Resolver404:
+            return False
+        if match.func is not details:
+            return True
+        slug = match.kwargs.get("slug", "")
+        return PageUrl.objects.filter(page__site_id=site_id, path=slug.strip("/")).exists()
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+from djangocms_stories.models import PostContent
+
+from backend.cards import update_card
+from backend.models import PostCard
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the blog list cards from the published post versions. "
+        "Publishing keeps them current; run this after deploying them and after "
+        "renaming categories, moving the blog page or editing images."
+    )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        PostCard.objects.all().delete()
+        count = 0
+        # The default manager only returns published versions.
+        for post_content in PostContent.objects.select_related(
+            "post__app_config", "post__main_image", "post__author"
+        ).iterator(chunk_size=100):
+            update_card(post_content)
+            count += 1
+        self.stdout.write(f"Built {count} card(s) in {time.monotonic() - started:.1f}s.")
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from backend.models import PostCard
+from backend.related import rebuild_related_posts
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the related posts of every published post. Publishing fits "
+        "new posts in; run this after deploying it and nightly, so that word "
+        "weights follow the posts published since."
+    )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        scopes = (
+            PostCard.objects.values_list("post__app_config", "language")
+            .distinct()
+            .order_by("post__app_config", "language")
+        )
+        count = sum(rebuild_related_posts(*scope) for scope in scopes)
+        self.stdout.write(f"Related {count} post(s) in {time.monotonic() - started:.1f}s.")
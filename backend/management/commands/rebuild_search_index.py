@@ -0,0 +1,100 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cms.models import PageContent
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from djangocms_stories.models import PostContent
+
+from backend.models import PageSearchDocument, PostSearchDocument
+from backend.search import DOCUMENT_FIELDS, INDEXERS
+
+
+def extract_chunk(model, pks):
+    """Return ``(content, fields)`` for the published ``model`` rows in ``pks``."""
+    extract = DOCUMENT_FIELDS[model]
+    # The default managers only return published versions.
+    return [
+        (content, extract(content))
+        for content in model.objects.filter(pk__in=pks).select_related(
+            "page" if model is PageContent else "post"
+        )
+    ]
+
+
+def extract_chunk_in_thread(chunk):
+    try:
+        return extract_chunk(*chunk)
+    finally:
+        # Each worker thread has opened connections of its own.
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the site search index (CMS pages and blog posts) from the "
+        "published versions. Publishing keeps it current; run this after "
+        "deploying it or after changing SEARCH_LANGUAGE_CONFIGS. Documents are "
+        "updated in place and stale ones pruned at the end, so search keeps "
+        "answering while it runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of threads extracting text in parallel (default: 4).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=50,
+            help="Pages or posts handed to a worker at a time (default: 50).",
+        )
+
+    def handle(self, *args, workers, chunk_size, **options):
+        started = time.monotonic()
+        chunks = []
+        for model in (PageContent, PostContent):
+            pks = list(model.objects.order_by("pk").values_list("pk", flat=True))
+            chunks.extend(
+                (model, pks[start : start + chunk_size])
+                for start in range(0, len(pks), chunk_size)
+            )
+
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                count = self.store(chunks, executor.map(extract_chunk_in_thread, chunks))
+        else:
+            count = self.store(chunks, (extract_chunk(*chunk) for chunk in chunks))
+        self.prune()
+
+        self.stdout.write(
+            f"Indexed {count} page(s) and post(s) in {time.monotonic() - started:.1f}s."
+        )
+
+    @staticmethod
+    def store(chunks, extracted):
+        """Write the ``extracted`` documents of ``chunks`` from this thread only.
+
+        Concurrent writers would lock each other out on SQLite.
+        """
+        count = 0
+        for (model, pks), documents in zip(chunks, extracted):
+            index, _unindex = INDEXERS[model]
+            with transaction.atomic():
+                for content, fields in documents:
+                    index(content, fields)
+            count += len(pks)
+        return count
+
+    @staticmethod
+    def prune():
+        """Drop documents of content that is no longer published."""
+        PostSearchDocument.objects.exclude(
+            post_content__in=PostContent.objects.values("pk")
+        ).delete()
+        PageSearchDocument.objects.exclude(
+            page_content__in=PageContent.objects.values("pk")
+        ).delete()
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from backend.redirects import redirect_index
+
+
+class Command(BaseCommand):
+    help = "Show the size of the redirect index."
+
+    def handle(self, *args, **options):
+        stats = redirect_index.stats()
+        self.stdout.write(f"Indexed paths:       {stats['paths']}")
+        self.stdout.write(f"Redirect rules:      {stats['rules']}")
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from django.contrib.redirects.models import Redirect
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils.timezone import now
+
+from backend.models import RedirectRule
+from backend.redirects import hit_counter
+
+
+class Command(BaseCommand):
+    help = (
+        "List redirects and redirect rules that have not been followed for a given "
+        "number of days, and optionally delete them. Redirects that were never hit "
+        "only count once they have been tracked that long; redirects older than "
+        "hit counting are tracked from when it was deployed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=180,
+            help="Consider a redirect unused after this many days without a hit.",
+        )
+        parser.add_argument(
+            "--delete",
+            action="store_true",
+            help="Delete the unused redirects instead of only listing them.",
+        )
+
+    def handle(self, *args, **options):
+        hit_counter.flush()
+        cutoff = now() - timedelta(days=options["days"])
+
+        redirects = Redirect.objects.filter(
+            Q(hit_stats__last_hit__lt=cutoff)
+            | Q(hit_stats__last_hit__isnull=True, hit_stats__created__lt=cutoff)
+        ).select_related("hit_stats")
+        rules = RedirectRule.objects.filter(
+            Q(last_hit__lt=cutoff) | Q(last_hit__isnull=True, created__lt=cutoff)
+        )
+
+        for redirect in redirects:
+            stats = getattr(redirect, "hit_stats", None)
+            self.stdout.write(
+                f"{redirect.old_path} -> {redirect.new_path} ({self.describe(stats)})"
+            )
+        for rule in rules:
+            self.stdout.write(f"[rule] {rule} ({self.describe(rule)})")
+
+        redirect_count, rule_count = redirects.count(), rules.count()
+        if options["delete"]:
+            redirects.delete()
+            rules.delete()
+            verb = "Deleted"
+        else:
+            verb = "Found"
+        self.stdout.write(
+            f"{verb} {redirect_count} redirect(s) and {rule_count} rule(s) "
+            f"unused for {options['days']} days."
+        )
+
+    @staticmethod
+    def describe(stats):
+        if stats is None or stats.last_hit is None:
+            return "never hit"
+        return f"{stats.hits} hit(s), last {stats.last_hit:%Y-%m-%d}"
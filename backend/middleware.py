@@ -1,11 +1,16 @@
+from functools import partial
 from urllib.parse import urlunsplit
 
 from django.conf import settings
 from django.contrib.redirects.middleware import RedirectFallbackMiddleware
-from django.contrib.redirects.models import Redirect
 from django.contrib.sites.shortcuts import get_current_site
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from django.http import HttpResponseRedirect, HttpResponsePermanentRedirect
 
+from backend import conditional, page_cache, surrogate_keys
+from backend.redirects import hit_counter, redirect_index
+
 
 class CanonicalHostRedirectMiddleware:
     """Redirect alias domains to the canonical host, keeping path and query string.
@@ -65,6 +70,12 @@ class PathOnlyRedirectFallbackMiddleware(RedirectFallbackMiddleware):
     Redirects are issued as temporary (302) rather than the stock permanent
     (301), so targets can be refined later without browsers having cached a
     permanent redirect to ``/``.
+
+    Lookups go through the per-process :data:`backend.redirects.redirect_index`
+    rather than the database, so bots probing random URLs cost a dict lookup.
+    Paths without an exact ``Redirect`` fall back to the prefix and regex
+    :class:`backend.models.RedirectRule` rows. Hits are counted in memory
+    and flushed in bulk by :data:`backend.redirects.hit_counter`.
     """
 
     response_redirect_class = HttpResponseRedirect
@@ -77,21 +88,13 @@ class PathOnlyRedirectFallbackMiddleware(RedirectFallbackMiddleware):
         path = request.path
         current_site = get_current_site(request)
 
-        r = None
-        try:
-            r = Redirect.objects.get(site=current_site, old_path=path)
-        except Redirect.DoesNotExist:
-            pass
-        if r is None and not path.endswith("/"):
-            try:
-                r = Redirect.objects.get(site=current_site, old_path=path + "/")
-            except Redirect.DoesNotExist:
-                pass
-
-        if r is not None:
-            if r.new_path == "":
+        target = redirect_index.lookup(current_site.pk, path)
+
+        if target is not None:
+            hit_counter.record(target)
+            new_path = target.new_path
+            if new_path == "":
                 return self.response_gone_class()
-            new_path = r.new_path
             # Forward the original query string (e.g. UTM params) to the target
             # so analytics attribution survives the redirect.
             query_string = request.META.get("QUERY_STRING", "")
@@ -101,3 +104,92 @@ class PathOnlyRedirectFallbackMiddleware(RedirectFallbackMiddleware):
             return self.response_redirect_class(new_path)
 
         return response
+
+
+class AnonymousPageCacheMiddleware:
+    """Serve anonymous visitors complete pages from the cache.
+
+    Which requests qualify and what they are keyed by is decided by
+    :func:`backend.page_cache.cache_scope`: anonymous ``GET``/``HEAD``
+    requests without a session, per site, host, scheme, language, path and
+    content-selecting query parameters. A hit skips the CMS page lookup,
+    the toolbar and rendering. HTML responses that are the same for every
+    visitor are stored until a page, post or alias is published or
+    unpublished.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        scope = page_cache.cache_scope(request)
+        if scope is None:
+            return self.get_response(request)
+        response = page_cache.fetch(request, scope)
+        if response is not None:
+            return response
+        response = self.get_response(request)
+        if request.method == "GET" and page_cache.is_cacheable(request, response):
+            page_cache.store(scope, response)
+        return response
+
+
+class SurrogateKeyMiddleware:
+    """Tag responses with the surrogate keys of what they rendered, for a CDN to purge by.
+
+    Pages, posts, static aliases, categories and authors record their keys
+    while the response renders (see :mod:`backend.surrogate_keys`); they are
+    sent as ``Surrogate-Key`` and ``Cache-Tag`` headers. Sits below the page
+    cache, so cached pages carry the headers as well.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with surrogate_keys.collect():
+            return surrogate_keys.tag(request, self.get_response(request))
+
+    def process_template_response(self, request, response):
+        # Tag the response as soon as it is rendered, ahead of the CMS page
+        # cache's post-render callback: it stores the headers its hits replay.
+        response._post_render_callbacks.insert(0, partial(surrogate_keys.tag, request))
+        return response
+
+
+class ConditionalContentMiddleware:
+    """Answer revalidations of CMS pages and post details before they are rendered.
+
+    Responses of both carry an ``ETag``, ``Last-Modified`` and a bounded
+    ``max-age`` computed by :func:`backend.conditional.validators` from what
+    was published, not from the rendered content. A request whose ``If-None-Match`` or
+    ``If-Modified-Since`` still matches gets a 304 before the page is looked
+    up. Only requests answered the same for every visitor are validated,
+    and only with a cache shared by all processes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        validators = getattr(request, "_content_validators", None)
+        if validators is not None and response.status_code == 200:
+            if not response.has_header("ETag"):
+                response["ETag"] = validators.etag
+            if not response.has_header("Last-Modified"):
+                response["Last-Modified"] = http_date(validators.last_modified)
+            # Keeps the lower of this and the CMS page cache's max-age.
+            patch_cache_control(response, max_age=validators.max_age)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not conditional.is_content_view(view_func):
+            return None
+        validators = conditional.validators(request)
+        if validators is None:
+            return None
+        request._content_validators = validators
+        return get_conditional_response(
+            request, etag=validators.etag, last_modified=validators.last_modified
+        )
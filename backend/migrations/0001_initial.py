@@ -0,0 +1,33 @@
+# Generated by Django 6.1 on 2026-10-18 10:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('sites', '0002_alter_domain_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RedirectRule',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('match_type', models.CharField(choices=[('prefix', 'Path prefix'), ('regex', 'Regular expression')], default='prefix', max_length=10, verbose_name='match type')),
+                ('pattern', models.CharField(help_text='A path prefix such as "/en/blog/2019/", or a regular expression matched against the whole path, e.g. "/en/news/(?P<slug>[-\\w]+)/".', max_length=200, verbose_name='match')),
+                ('replacement', models.CharField(blank=True, help_text='Prefix rules append the rest of the path to this target. Regex rules can insert captured groups with "\\1" or "\\g<slug>". Leave empty to answer 410 Gone.', max_length=200, verbose_name='redirect to')),
+                ('priority', models.IntegerField(default=0, help_text='Rules with lower numbers are tried first.', verbose_name='priority')),
+                ('is_active', models.BooleanField(default=True, verbose_name='active')),
+                ('site', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='sites.site', verbose_name='site')),
+            ],
+            options={
+                'verbose_name': 'redirect rule',
+                'verbose_name_plural': 'redirect rules',
+                'ordering': ('priority', 'pk'),
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.1 on 2026-10-18 10:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0001_initial'),
+        ('redirects', '0002_alter_redirect_new_path_help_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RedirectHit',
+            fields=[
+                ('redirect', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='hit_stats', serialize=False, to='redirects.redirect', verbose_name='redirect')),
+                ('hits', models.PositiveBigIntegerField(default=0, verbose_name='hits')),
+                ('last_hit', models.DateTimeField(db_index=True, null=True, verbose_name='last hit')),
+            ],
+            options={
+                'verbose_name': 'redirect hit count',
+                'verbose_name_plural': 'redirect hit counts',
+            },
+        ),
+        migrations.AddField(
+            model_name='redirectrule',
+            name='hits',
+            field=models.PositiveBigIntegerField(default=0, editable=False, verbose_name='hits'),
+        ),
+        migrations.AddField(
+            model_name='redirectrule',
+            name='last_hit',
+            field=models.DateTimeField(editable=False, null=True, verbose_name='last hit'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 6.1 on 2026-10-18 11:02
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import OperationalError, migrations, models
+
+# Vendor-specific parts of the search index; see backend.search.
+GIN_INDEX = "backend_postsearch_vector_gin"
+FTS_TABLE = "backend_postsearch_fts"
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE INDEX {GIN_INDEX} ON backend_postsearchdocument "
+            "USING GIN (search_vector)"
+        )
+    elif connection.vendor == "sqlite":
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, abstract, body)"
+            )
+        except OperationalError:
+            # SQLite built without FTS5: search falls back to plain LIKE filtering.
+            pass
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {GIN_INDEX}")
+    elif connection.vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0002_redirect_hits'),
+        ('djangocms_stories', '0003_alter_post_options_alter_postcontent_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSearchDocument',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=15, verbose_name='language')),
+                ('title', models.TextField(blank=True, verbose_name='title')),
+                ('abstract', models.TextField(blank=True, verbose_name='abstract')),
+                ('body', models.TextField(blank=True, verbose_name='body')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='djangocms_stories.post')),
+                ('post_content', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='search_document', to='djangocms_stories.postcontent')),
+            ],
+            options={
+                'verbose_name': 'post search document',
+                'verbose_name_plural': 'post search documents',
+                'constraints': [models.UniqueConstraint(fields=('post', 'language'), name='backend_post_search_language')],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
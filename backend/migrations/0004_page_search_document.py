@@ -0,0 +1,62 @@
+# Generated by Django 6.1 on 2026-10-18 14:37
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import OperationalError, migrations, models
+
+GIN_INDEX = "backend_pagesearch_vector_gin"
+FTS_TABLE = "backend_pagesearch_fts"
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE INDEX {GIN_INDEX} ON backend_pagesearchdocument "
+            "USING GIN (search_vector)"
+        )
+    elif connection.vendor == "sqlite":
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, abstract, body)"
+            )
+        except OperationalError:
+            pass
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {GIN_INDEX}")
+    elif connection.vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0003_post_search_document'),
+        ('cms', '0038_alter_page_site'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageSearchDocument',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=15, verbose_name='language')),
+                ('title', models.TextField(blank=True, verbose_name='title')),
+                ('abstract', models.TextField(blank=True, verbose_name='abstract')),
+                ('body', models.TextField(blank=True, verbose_name='body')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='cms.page')),
+                ('page_content', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='search_document', to='cms.pagecontent')),
+            ],
+            options={
+                'verbose_name': 'page search document',
+                'verbose_name_plural': 'page search documents',
+                'constraints': [models.UniqueConstraint(fields=('page', 'language'), name='backend_page_search_language')],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 6.1 on 2026-10-18 15:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0004_page_search_document'),
+        ('djangocms_stories', '0003_alter_post_options_alter_postcontent_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostCard',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=15, verbose_name='language')),
+                ('title', models.TextField(blank=True, verbose_name='title')),
+                ('subtitle', models.TextField(blank=True, verbose_name='subtitle')),
+                ('url', models.CharField(blank=True, max_length=2048, verbose_name='URL')),
+                ('abstract', models.TextField(blank=True, verbose_name='abstract')),
+                ('category', models.TextField(blank=True, verbose_name='primary category')),
+                ('author_name', models.TextField(blank=True, verbose_name='author name')),
+                ('author_role', models.TextField(blank=True, verbose_name='author role')),
+                ('author_has_profile', models.BooleanField(default=False, verbose_name='author has a profile')),
+                ('author_photo_url', models.CharField(blank=True, max_length=2048, verbose_name='author photo URL')),
+                ('author_photo_accents', models.BooleanField(default=False, verbose_name='author photo accents')),
+                ('author_photo_shadow', models.BooleanField(default=False, verbose_name='author photo drop shadow')),
+                ('image_alt', models.TextField(blank=True, verbose_name='main image alt text')),
+                ('images', models.JSONField(blank=True, default=dict, help_text='"src" and "srcset" of the main image per card layout.', verbose_name='main image sizes')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='djangocms_stories.post')),
+                ('post_content', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='card', to='djangocms_stories.postcontent')),
+            ],
+            options={
+                'verbose_name': 'post card',
+                'verbose_name_plural': 'post cards',
+                'constraints': [models.UniqueConstraint(fields=('post', 'language'), name='backend_post_card_language')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.1 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0005_post_card'),
+        ('djangocms_stories', '0003_alter_post_options_alter_postcontent_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReadingTime',
+            fields=[
+                ('post_content', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='reading_time', serialize=False, to='djangocms_stories.postcontent')),
+                ('words', models.PositiveIntegerField(verbose_name='words')),
+                ('minutes', models.PositiveIntegerField(verbose_name='minutes')),
+            ],
+            options={
+                'verbose_name': 'reading time',
+                'verbose_name_plural': 'reading times',
+            },
+        ),
+    ]
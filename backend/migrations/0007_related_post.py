@@ -0,0 +1,29 @@
+# Generated by Django 6.1 on 2026-10-18 16:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0006_reading_time'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedPost',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='rank')),
+                ('score', models.FloatField(verbose_name='similarity')),
+                ('card', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_posts', to='backend.postcard')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='backend.postcard')),
+            ],
+            options={
+                'verbose_name': 'related post',
+                'verbose_name_plural': 'related posts',
+                'constraints': [models.UniqueConstraint(fields=('card', 'rank'), name='backend_related_post_rank')],
+            },
+        ),
+    ]
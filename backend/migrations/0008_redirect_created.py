@@ -0,0 +1,24 @@
+# Generated by Django 6.1 on 2026-10-18 17:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0007_related_post'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='redirecthit',
+            name='created',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='created'),
+        ),
+        migrations.AddField(
+            model_name='redirectrule',
+            name='created',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='created'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.1 on 2026-10-18 19:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0008_redirect_created'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postsearchdocument',
+            name='words',
+            field=models.JSONField(editable=False, null=True, verbose_name='word counts'),
+        ),
+    ]
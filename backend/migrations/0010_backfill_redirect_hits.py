@@ -0,0 +1,31 @@
+# Generated by Django 6.1 on 2026-10-18 21:40
+
+from django.db import migrations
+from django.utils import timezone
+
+
+def backfill_redirect_hits(apps, schema_editor):
+    # Start counting redirects that predate hit counting now, so that
+    # unused_redirects judges them by the same --days period as new ones.
+    Redirect = apps.get_model('redirects', 'Redirect')
+    RedirectHit = apps.get_model('backend', 'RedirectHit')
+    created = timezone.now()
+    RedirectHit.objects.bulk_create(
+        [
+            RedirectHit(redirect_id=pk, created=created)
+            for pk in Redirect.objects.filter(hit_stats__isnull=True).values_list('pk', flat=True)
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0009_post_search_document_words'),
+        ('redirects', '0002_alter_redirect_new_path_help_text'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_redirect_hits, migrations.RunPython.noop),
+    ]
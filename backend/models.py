@@ -0,0 +1,293 @@
+import re
+
+from cms.models import Page, PageContent
+from django.contrib.postgres.search import SearchVectorField
+from django.contrib.redirects.models import Redirect
+from django.contrib.sites.models import Site
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils.timezone import now
+from django.utils.translation import gettext_lazy as _
+from djangocms_stories.models import Post, PostContent
+
+
+class RedirectRule(models.Model):
+    """Redirect a whole family of legacy URLs with one row.
+
+    Complements :class:`django.contrib.redirects.models.Redirect`, which maps a
+    single path. Exact redirects always win; active rules are then tried in
+    ``priority`` order by :class:`backend.redirects.RuleMatcher`.
+    """
+
+    class MatchType(models.TextChoices):
+        PREFIX = "prefix", _("Path prefix")
+        REGEX = "regex", _("Regular expression")
+
+    site = models.ForeignKey(Site, on_delete=models.CASCADE, verbose_name=_("site"))
+    match_type = models.CharField(
+        _("match type"),
+        max_length=10,
+        choices=MatchType.choices,
+        default=MatchType.PREFIX,
+    )
+    pattern = models.CharField(
+        _("match"),
+        max_length=200,
+        help_text=_(
+            'A path prefix such as "/en/blog/2019/", or a regular expression '
+            'matched against the whole path, e.g. "/en/news/(?P<slug>[-\\w]+)/".'
+        ),
+    )
+    replacement = models.CharField(
+        _("redirect to"),
+        max_length=200,
+        blank=True,
+        help_text=_(
+            "Prefix rules append the rest of the path to this target. Regex rules "
+            'can insert captured groups with "\\1" or "\\g<slug>". Leave empty to '
+            "answer 410 Gone."
+        ),
+    )
+    priority = models.IntegerField(
+        _("priority"), default=0, help_text=_("Rules with lower numbers are tried first.")
+    )
+    is_active = models.BooleanField(_("active"), default=True)
+    hits = models.PositiveBigIntegerField(_("hits"), default=0, editable=False)
+    last_hit = models.DateTimeField(_("last hit"), null=True, editable=False)
+    created = models.DateTimeField(_("created"), default=now, editable=False)
+
+    class Meta:
+        verbose_name = _("redirect rule")
+        verbose_name_plural = _("redirect rules")
+        ordering = ("priority", "pk")
+
+    def __str__(self):
+        return f"{self.pattern} ---> {self.replacement}"
+
+    def regex_source(self):
+        """Return the pattern as it is embedded in the combined rule matcher.
+
+        Prefix rules become an escaped literal followed by ``.*``. Named groups
+        of regex rules are turned into plain groups so that several rules can
+        reuse a name; the substitution itself runs on the rule's own regex.
+        """
+        if self.match_type == self.MatchType.PREFIX:
+            return re.escape(self.pattern) + ".*"
+        return re.sub(r"\(\?P<\w+>", "(", self.pattern)
+
+    def has_backreference(self):
+        """Whether a regex rule refers back to one of its own groups.
+
+        Rules are combined into a single regex, which renumbers groups.
+        """
+        return self.match_type == self.MatchType.REGEX and bool(
+            re.search(r"\\[1-9]|\(\?P=", self.pattern)
+        )
+
+    def clean(self):
+        if self.match_type == self.MatchType.PREFIX:
+            if not self.pattern.startswith("/"):
+                raise ValidationError({"pattern": _("A prefix must start with a slash.")})
+            return
+        try:
+            regex = re.compile(self.pattern)
+            re.compile(f"(?:{self.regex_source()})")
+        except re.error as exc:
+            raise ValidationError({"pattern": _("Invalid regular expression: %s") % exc})
+        if self.has_backreference():
+            raise ValidationError(
+                {"pattern": _("Backreferences inside the pattern are not supported.")}
+            )
+        for reference in re.findall(r"\\g<(\w+)>|\\(\d+)", self.replacement):
+            name = reference[0] or reference[1]
+            if name.isdigit():
+                known = 0 < int(name) <= regex.groups
+            else:
+                known = name in regex.groupindex
+            if not known:
+                raise ValidationError(
+                    {"replacement": _("Unknown group reference: %s") % name}
+                )
+
+
+class RedirectHit(models.Model):
+    """How often a :class:`Redirect` has been followed, and when it was last.
+
+    Written in bulk by :class:`backend.redirects.HitCounter`, never per request.
+    A row is created along with each new redirect, so ``created`` tells how
+    long a redirect that was never hit has been around.
+    """
+
+    redirect = models.OneToOneField(
+        Redirect,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="hit_stats",
+        verbose_name=_("redirect"),
+    )
+    hits = models.PositiveBigIntegerField(_("hits"), default=0)
+    last_hit = models.DateTimeField(_("last hit"), null=True, db_index=True)
+    created = models.DateTimeField(_("created"), default=now, editable=False)
+
+    class Meta:
+        verbose_name = _("redirect hit count")
+        verbose_name_plural = _("redirect hit counts")
+
+    def __str__(self):
+        return f"{self.redirect}: {self.hits}"
+
+
+class PostSearchDocument(models.Model):
+    """Searchable text of the published version of a post in one language.
+
+    Maintained by :mod:`backend.search` when post versions are published or
+    unpublished. On Postgres ``search_vector`` is filled and carries a GIN
+    index; on SQLite the text is mirrored into an FTS5 table instead.
+    """
+
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="+")
+    language = models.CharField(_("language"), max_length=15)
+    post_content = models.OneToOneField(
+        PostContent, on_delete=models.CASCADE, related_name="search_document"
+    )
+    title = models.TextField(_("title"), blank=True)
+    abstract = models.TextField(_("abstract"), blank=True)
+    body = models.TextField(_("body"), blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Weighted word counts of the text, filled in by ``backend.related``.
+    words = models.JSONField(_("word counts"), null=True, editable=False)
+
+    class Meta:
+        verbose_name = _("post search document")
+        verbose_name_plural = _("post search documents")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["post", "language"], name="backend_post_search_language"
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class PageSearchDocument(models.Model):
+    """Searchable text of the published version of a CMS page in one language.
+
+    The page counterpart of :class:`PostSearchDocument`: ``abstract`` holds
+    the meta description and ``body`` the text of all its placeholders.
+    """
+
+    page = models.ForeignKey(Page, on_delete=models.CASCADE, related_name="+")
+    language = models.CharField(_("language"), max_length=15)
+    page_content = models.OneToOneField(
+        PageContent, on_delete=models.CASCADE, related_name="search_document"
+    )
+    title = models.TextField(_("title"), blank=True)
+    abstract = models.TextField(_("abstract"), blank=True)
+    body = models.TextField(_("body"), blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        verbose_name = _("page search document")
+        verbose_name_plural = _("page search documents")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["page", "language"], name="backend_page_search_language"
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class PostCard(models.Model):
+    """What a blog list card shows of the published version of a post in one language.
+
+    Maintained by :mod:`backend.cards` when post versions are published or
+    unpublished and when posts change, so that list pages render every card
+    from this one row instead of the post, its categories, author profile
+    and image thumbnails.
+    """
+
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="+")
+    language = models.CharField(_("language"), max_length=15)
+    post_content = models.OneToOneField(
+        PostContent, on_delete=models.CASCADE, related_name="card"
+    )
+    title = models.TextField(_("title"), blank=True)
+    subtitle = models.TextField(_("subtitle"), blank=True)
+    url = models.CharField(_("URL"), max_length=2048, blank=True)
+    abstract = models.TextField(_("abstract"), blank=True)
+    category = models.TextField(_("primary category"), blank=True)
+    author_name = models.TextField(_("author name"), blank=True)
+    author_role = models.TextField(_("author role"), blank=True)
+    author_has_profile = models.BooleanField(_("author has a profile"), default=False)
+    author_photo_url = models.CharField(_("author photo URL"), max_length=2048, blank=True)
+    author_photo_accents = models.BooleanField(_("author photo accents"), default=False)
+    author_photo_shadow = models.BooleanField(_("author photo drop shadow"), default=False)
+    image_alt = models.TextField(_("main image alt text"), blank=True)
+    images = models.JSONField(
+        _("main image sizes"),
+        default=dict,
+        blank=True,
+        help_text=_('"src" and "srcset" of the main image per card layout.'),
+    )
+
+    class Meta:
+        verbose_name = _("post card")
+        verbose_name_plural = _("post cards")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["post", "language"], name="backend_post_card_language"
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class ReadingTime(models.Model):
+    """Estimated reading time of one version of a post, stored when it is published.
+
+    Published versions do not change, so the estimate never goes stale;
+    see :mod:`backend.reading`.
+    """
+
+    post_content = models.OneToOneField(
+        PostContent,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="reading_time",
+    )
+    words = models.PositiveIntegerField(_("words"))
+    minutes = models.PositiveIntegerField(_("minutes"))
+
+    class Meta:
+        verbose_name = _("reading time")
+        verbose_name_plural = _("reading times")
+
+    def __str__(self):
+        return f"{self.minutes} min"
+
+
+class RelatedPost(models.Model):
+    """One of the posts most similar to a published post, by shared categories, tags and words.
+
+    Computed by :mod:`backend.related` between the cards of one blog and
+    language, so that unpublishing either post drops the row with its card.
+    """
+
+    card = models.ForeignKey(PostCard, on_delete=models.CASCADE, related_name="related_posts")
+    related = models.ForeignKey(PostCard, on_delete=models.CASCADE, related_name="+")
+    rank = models.PositiveSmallIntegerField(_("rank"))
+    score = models.FloatField(_("similarity"))
+
+    class Meta:
+        verbose_name = _("related post")
+        verbose_name_plural = _("related posts")
+        constraints = [
+            models.UniqueConstraint(fields=["card", "rank"], name="backend_related_post_rank"),
+        ]
+
+    def __str__(self):
+        return f"{self.card} → {self.related}"
@@ -0,0 +1,93 @@
+from bisect import bisect_left
+from datetime import datetime
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+from django.utils.timezone import now
+from djangocms_stories.models import PostContent
+
+from backend.cache import PAGES, POSTS, scoped_key
+
+
+class Neighbour(NamedTuple):
+    post_id: int
+    url: str
+    date_published: datetime | None
+    date_published_end: datetime | None
+
+    def visible(self, at):
+        return (self.date_published is None or self.date_published <= at) and (
+            self.date_published_end is None or self.date_published_end > at
+        )
+
+
+def post_sequence(app_config_id, language, site_id):
+    """Return ``(keys, neighbours)`` for the published posts of one blog, oldest first.
+
+    ``keys`` holds the ``(sort date, post id)`` of each post, the order blog
+    listings use (newest first) reversed. Built with one query and cached
+    until the next publish or unpublish of a post or page (the URLs run
+    through the blog's apphook page), so most lookups cost no query. URLs
+    are read from the post cards; posts published before the cards existed
+    (see ``rebuild_post_cards``) fall back to building theirs. Publication
+    windows are checked by :func:`adjacent_urls`, as they open and close
+    without a publish.
+    """
+    key = scoped_key(
+        "neighbours", (app_config_id, language, site_id), generation=(POSTS, PAGES)
+    )
+    sequence = cache.get(key)
+    if sequence is None:
+        # The default manager only returns published versions.
+        contents = (
+            PostContent.objects.filter(language=language, post__app_config=app_config_id)
+            .filter(Q(post__sites__isnull=True) | Q(post__sites=site_id))
+            .annotate(sort_date=Coalesce("post__date_published", "post__date_created"))
+            .select_related("post__app_config", "card")
+            .order_by("sort_date", "post_id")
+        )
+        keys, neighbours = [], []
+        for content in contents:
+            post = content.post
+            card = getattr(content, "card", None)
+            url = card.url if card is not None else content.get_absolute_url(language)
+            keys.append((content.sort_date, post.pk))
+            neighbours.append(
+                Neighbour(post.pk, url, post.date_published, post.date_published_end)
+            )
+        sequence = (keys, neighbours)
+        timeout = getattr(settings, "BLOG_LISTING_CACHE_TIMEOUT", 60 * 60 * 24)
+        cache.set(key, sequence, timeout)
+    return sequence
+
+
+def adjacent_urls(post_content, site):
+    """Return ``{"previous": url, "next": url}`` around ``post_content`` in list order.
+
+    "previous" is the next newer post that is visible now, "next" the next
+    older one; either is ``""`` at the ends. ``post_content`` itself need not
+    be listed, e.g. a draft in preview.
+    """
+    post = post_content.post
+    keys, neighbours = post_sequence(post.app_config_id, post_content.language, site.pk)
+    position = bisect_left(keys, (post.date_published or post.date_created, post.pk))
+    at = now()
+    newer = (
+        neighbours[index]
+        for index in range(position, len(neighbours))
+        if neighbours[index].post_id != post.pk and neighbours[index].visible(at)
+    )
+    older = (
+        neighbours[index]
+        for index in range(position - 1, -1, -1)
+        if neighbours[index].visible(at)
+    )
+    previous_post = next(newer, None)
+    next_post = next(older, None)
+    return {
+        "previous": previous_post.url if previous_post else "",
+        "next": next_post.url if next_post else "",
+    }
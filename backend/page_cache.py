@@ -0,0 +1,157 @@
+from typing import NamedTuple
+from urllib.parse import parse_qsl
+
+from cms.cache import invalidate_cms_page_cache
+from django.conf import settings
+from django.contrib.sites.shortcuts import get_current_site
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import cc_delim_re, get_conditional_response, has_vary_header
+from django.utils.http import parse_http_date_safe
+from djangocms_versioning.constants import OPERATION_PUBLISH, OPERATION_UNPUBLISH
+
+from backend.cache import bump_generation, scoped_key
+
+GENERATION = "page_cache"
+
+# Hop-by-hop and per-response headers that are not replayed from the cache.
+UNCACHED_HEADERS = frozenset({"set-cookie", "content-length", "connection", "date"})
+
+
+class CachedPage(NamedTuple):
+    status: int
+    headers: list
+    content: bytes
+
+
+def _setting(name, default):
+    return getattr(settings, f"PAGE_CACHE_{name}", default)
+
+
+def shared_params(request):
+    """Return the query parameters ``request`` is answered by, or ``None`` if personal.
+
+    Only anonymous ``GET`` and ``HEAD`` requests are answered the same for
+    every visitor. Requests carrying a session cookie are not: staff,
+    editors and toolbar users all have one, so the toolbar and edit mode are
+    never shared, and checking the cookie costs no session lookup. Query
+    parameters must be listed in ``PAGE_CACHE_QUERY_PARAMS`` (returned) or
+    ``PAGE_CACHE_IGNORED_QUERY_PARAMS`` (e.g. campaign tracking, dropped);
+    any other, such as the toolbar's ``?edit`` or ``?toolbar_on``, makes the
+    request personal.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None
+    if settings.SESSION_COOKIE_NAME in request.COOKIES:
+        return None
+    if request.path.startswith(tuple(_setting("EXCLUDED_PATHS", ("/admin/",)))):
+        return None
+    keyed = set(_setting("QUERY_PARAMS", ()))
+    ignored = set(_setting("IGNORED_QUERY_PARAMS", ()))
+    params = []
+    for name, value in parse_qsl(request.META.get("QUERY_STRING", ""), keep_blank_values=True):
+        if name in keyed:
+            params.append((name, value))
+        elif name not in ignored:
+            return None
+    return sorted(params)
+
+
+def cache_scope(request):
+    """Return the part of ``request`` a cached page is stored under, or ``None`` to bypass.
+
+    Only requests answered the same for every visitor are cached, see
+    :func:`shared_params`.
+    """
+    if not _setting("ENABLED", True):
+        return None
+    params = shared_params(request)
+    if params is None:
+        return None
+    return (
+        get_current_site(request).pk,
+        request.get_host(),
+        request.is_secure(),
+        getattr(request, "LANGUAGE_CODE", settings.LANGUAGE_CODE),
+        request.path,
+        params,
+    )
+
+
+def cache_key(scope):
+    return scoped_key("page", scope, generation=GENERATION)
+
+
+def is_cacheable(request, response):
+    """Whether ``response`` is a complete HTML page the same for every anonymous visitor."""
+    if response.status_code != 200 or response.streaming or response.cookies:
+        return False
+    if not response.get("Content-Type", "").startswith("text/html"):
+        return False
+    # A page rendering a CSRF token would set a cookie on its way out.
+    if request.META.get("CSRF_COOKIE_NEEDS_UPDATE") or has_vary_header(response, "Cookie"):
+        return False
+    # The session and message middleware act on the response after this
+    # one: a page that wrote to either, read a session that holds data or
+    # showed messages is personal, and would set a cookie on its way out.
+    session = getattr(request, "session", None)
+    if session is not None and (
+        session.modified or (session.accessed and not session.is_empty())
+    ):
+        return False
+    messages = getattr(request, "_messages", None)
+    if messages is not None and (messages.added_new or (messages.used and len(messages))):
+        return False
+    cache_control = {
+        directive.split("=")[0].strip().lower()
+        for directive in cc_delim_re.split(response.get("Cache-Control", ""))
+    }
+    return not cache_control & {"private", "no-cache", "no-store"}
+
+
+def freeze(response):
+    """Return ``response`` as a :class:`CachedPage`, without its per-response headers."""
+    return CachedPage(
+        response.status_code,
+        [(name, value) for name, value in response.items() if name.lower() not in UNCACHED_HEADERS],
+        response.content,
+    )
+
+
+def replay(request, page):
+    """Return the response to ``request`` from the cached ``page``, a 304 if unchanged."""
+    response = HttpResponse(page.content, status=page.status)
+    for name, value in page.headers:
+        response[name] = value
+    return get_conditional_response(
+        request,
+        etag=response.get("ETag"),
+        last_modified=parse_http_date_safe(response.get("Last-Modified", "")),
+        response=response,
+    )
+
+
+def store(scope, response):
+    cache.set(cache_key(scope), freeze(response), _setting("TIMEOUT", 60 * 10))
+
+
+def fetch(request, scope):
+    """Return the cached response for ``scope``, or ``None``."""
+    page = cache.get(cache_key(scope))
+    if page is None:
+        return None
+    return replay(request, page)
+
+
+def invalidate_page_cache(sender, operation, **kwargs):
+    """Signal receiver: drop all cached pages when a version is published or unpublished.
+
+    Pages, posts and aliases show up in menus, listings and static aliases
+    on pages of their own, so there is no narrower set of pages to drop.
+    The CMS page cache below this one is dropped as well: the CMS drops it
+    when pages are published only, and would hand back the old page.
+    """
+    if operation in (OPERATION_PUBLISH, OPERATION_UNPUBLISH):
+        transaction.on_commit(lambda: bump_generation(GENERATION))
+        transaction.on_commit(invalidate_cms_page_cache)
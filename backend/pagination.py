@@ -0,0 +1,172 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, InvalidPage, Page, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
+
+from backend.cache import scoped_key
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Query parameters carrying a cursor, next to the page number.
+AFTER = "after"
+BEFORE = "before"
+
+
+def encode_cursor(post_content):
+    """Return the cursor of a listed post: its sort date in microseconds and post id."""
+    microseconds = (post_content.sort_date - EPOCH) // timedelta(microseconds=1)
+    return f"{microseconds}.{post_content.post_id}"
+
+
+def decode_cursor(cursor):
+    """Return ``(sort_date, post_id)`` for ``cursor``; raise ``InvalidPage`` if malformed."""
+    try:
+        microseconds, post_id = (int(part) for part in cursor.split("."))
+        return EPOCH + timedelta(microseconds=microseconds), post_id
+    except (ValueError, OverflowError):
+        raise InvalidPage("Invalid cursor")
+
+
+def estimate_count(queryset):
+    """Return the Postgres planner's row estimate for ``queryset``, or ``None``.
+
+    Reads ``Plan Rows`` from ``EXPLAIN``, which costs no scan at all. Other
+    databases return ``None``.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().values("pk").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator that caches its ``count`` under ``count_scope``.
+
+    ``count_scope`` identifies the listing (see ``backend.cache.scoped_key``);
+    counts are dropped with the ``posts`` generation, i.e. on every publish
+    or unpublish. Without a scope, e.g. in edit mode, counts are not cached.
+
+    With ``estimate``, a planner estimate above
+    ``BLOG_ESTIMATED_COUNT_THRESHOLD`` is used instead of an exact count. Page
+    links are then approximate; :class:`KeysetPaginator` answers pages past
+    the real end with ``EmptyPage``.
+    """
+
+    def __init__(
+        self, object_list, per_page, count_scope=None, estimate=False, **kwargs
+    ):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_scope = count_scope
+        self.estimate = estimate
+        self.count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        if self.count_scope is None:
+            return super().count
+        key = scoped_key("count", self.count_scope)
+        cached = cache.get(key)
+        if cached is None:
+            count = self._estimated_count() if self.estimate else None
+            cached = (count, True) if count is not None else (super().count, False)
+            timeout = getattr(settings, "BLOG_LISTING_CACHE_TIMEOUT", 60 * 60 * 24)
+            cache.set(key, cached, timeout)
+        count, self.count_is_estimate = cached
+        return count
+
+    def _estimated_count(self):
+        estimate = estimate_count(self.object_list)
+        threshold = getattr(settings, "BLOG_ESTIMATED_COUNT_THRESHOLD", 10000)
+        return estimate if estimate is not None and estimate > threshold else None
+
+
+class KeysetPage(Page):
+    """A page that knows the cursors leading to its neighbours.
+
+    ``cursors`` maps the previous and next page number to the query
+    parameter and value that select them, for ``page_url`` in ``blog_tags``.
+    """
+
+    def __init__(self, object_list, number, paginator):
+        object_list = list(object_list)
+        super().__init__(object_list, number, paginator)
+        self.cursors = {}
+        if object_list:
+            if self.has_previous():
+                self.cursors[number - 1] = (BEFORE, encode_cursor(object_list[0]))
+            if self.has_next():
+                self.cursors[number + 1] = (AFTER, encode_cursor(object_list[-1]))
+
+
+class KeysetPaginator(CachedCountPaginator):
+    """Paginate ``PostContent`` listings by (sort date, post id), newest first.
+
+    This is the order ``adjacent_post_urls`` walks as well; the sort date is
+    the publication date, or the creation date of posts without one.
+
+    Numbered pages are read with ``OFFSET`` from whichever end of the listing
+    is nearer, which is cheap for the first and last ``numbered_pages``.
+    Pages in between are only reached through cursors: the previous and next
+    page are selected by comparing with the first or last row of the current
+    page, so reading page 400 costs no more than reading page 2. Asking for
+    such a page by number alone raises ``InvalidPage``, as it would need a
+    deep ``OFFSET``.
+    """
+
+    def __init__(self, object_list, per_page, numbered_pages=5, **kwargs):
+        object_list = object_list.annotate(
+            sort_date=Coalesce("post__date_published", "post__date_created")
+        ).order_by("-sort_date", "-post_id")
+        super().__init__(object_list, per_page, **kwargs)
+        self.numbered_pages = numbered_pages
+
+    def _get_page(self, object_list, number, paginator):
+        page = KeysetPage(object_list, number, paginator)
+        if not page.object_list and number > 1:
+            # Past the real end of an estimated count, or of a stale cursor.
+            raise EmptyPage("That page contains no results")
+        return page
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if number <= self.numbered_pages:
+            return super().page(number)
+        if self.num_pages - number >= self.numbered_pages:
+            raise InvalidPage("Pages this deep are only reachable through cursors")
+        # Near the end: read backwards from the oldest post. With an
+        # estimated count these pages are as approximate as their numbers.
+        start = max(self.count - number * self.per_page, 0)
+        stop = self.count - (number - 1) * self.per_page
+        rows = list(self.object_list.reverse()[start:stop])
+        return self._get_page(rows[::-1], number, self)
+
+    def cursor_page(self, number, after=None, before=None):
+        """Return page ``number``, selected by the cursor of a neighbouring page."""
+        number = self.validate_number(number)
+        if after is not None:
+            sort_date, post_id = decode_cursor(after)
+            rows = list(
+                self.object_list.filter(
+                    Q(sort_date__lt=sort_date) | Q(sort_date=sort_date, post_id__lt=post_id)
+                )[: self.per_page]
+            )
+        else:
+            sort_date, post_id = decode_cursor(before)
+            rows = list(
+                self.object_list.filter(
+                    Q(sort_date__gt=sort_date) | Q(sort_date=sort_date, post_id__gt=post_id)
+                ).reverse()[: self.per_page]
+            )[::-1]
+        return self._get_page(rows, number, self)
@@ -0,0 +1,39 @@
+from math import ceil
+
+from django.conf import settings
+from django.db import transaction
+from djangocms_versioning.constants import OPERATION_PUBLISH
+
+from backend.models import ReadingTime
+from backend.text import post_content_text
+
+
+def estimate(post_content):
+    """Return an unsaved :class:`ReadingTime` for ``post_content``.
+
+    Counts the words of the post's "Blog Content" placeholder (markdown,
+    text and code plugins) and its ``post_text``. Every post takes at least
+    a minute.
+    """
+    words = len(post_content_text(post_content).split())
+    per_minute = getattr(settings, "BLOG_READING_WORDS_PER_MINUTE", 200)
+    return ReadingTime(
+        post_content=post_content, words=words, minutes=max(1, ceil(words / per_minute))
+    )
+
+
+def store_reading_time(post_content):
+    """Compute and store the reading time of ``post_content``."""
+    reading_time = estimate(post_content)
+    reading_time, _created = ReadingTime.objects.update_or_create(
+        post_content=post_content,
+        defaults={"words": reading_time.words, "minutes": reading_time.minutes},
+    )
+    return reading_time
+
+
+def on_version_operation(sender, obj, operation, **kwargs):
+    """Signal receiver: store the reading time of a version when it is published."""
+    if operation == OPERATION_PUBLISH:
+        content = obj.content
+        transaction.on_commit(lambda: store_reading_time(content))
@@ -0,0 +1,289 @@
+import atexit
+import logging
+import re
+import time
+from collections import defaultdict
+from threading import Lock
+from typing import NamedTuple
+
+from django.conf import settings
+from django.contrib.redirects.models import Redirect
+from django.db import DatabaseError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils.timezone import now
+
+from backend.cache import bump_generation, get_generation, is_shared
+from backend.models import RedirectHit, RedirectRule
+
+logger = logging.getLogger(__name__)
+
+GENERATION = "redirects"
+
+
+class RedirectTarget(NamedTuple):
+    """Where a path redirects to, and the row (``Redirect`` or rule) that says so."""
+
+    model: type
+    pk: int
+    new_path: str
+
+
+class RuleMatcher:
+    """The active :class:`RedirectRule` rows of one site, compiled into one regex.
+
+    Each rule becomes an alternative wrapped in a named group ``r<index>``;
+    alternatives are tried in priority order and ``lastgroup`` of a full match
+    identifies the winning rule, so a path is scanned once no matter how many
+    rules exist. Invalid rules and rules with backreferences are skipped; if
+    the rest do not combine, they are matched one by one.
+    """
+
+    def __init__(self, rules):
+        self._rules = []
+        alternatives = []
+        for rule in rules:
+            if rule.has_backreference():
+                logger.warning("Skipping redirect rule %s: backreference in pattern", rule.pk)
+                continue
+            try:
+                source = rule.regex_source()
+                compiled = re.compile(
+                    source if rule.match_type == RedirectRule.MatchType.PREFIX else rule.pattern
+                )
+                re.compile(source)
+            except re.error:
+                logger.warning("Skipping redirect rule %s: invalid pattern", rule.pk)
+                continue
+            alternatives.append(f"(?P<r{len(self._rules)}>{source})")
+            self._rules.append((rule, compiled))
+        self._regex = None
+        if alternatives:
+            try:
+                self._regex = re.compile("|".join(alternatives))
+            except re.error:
+                # E.g. an inline flag that is only valid at the start of a pattern.
+                logger.warning("Redirect rules do not combine, matching them one by one")
+
+    def __len__(self):
+        return len(self._rules)
+
+    def _find(self, path):
+        if self._regex is not None:
+            match = self._regex.fullmatch(path)
+            return None if match is None else self._rules[int(match.lastgroup[1:])]
+        return next(
+            ((rule, compiled) for rule, compiled in self._rules if compiled.fullmatch(path)),
+            None,
+        )
+
+    def match(self, path):
+        """Return a :class:`RedirectTarget` for the first rule matching ``path``."""
+        found = self._find(path)
+        if found is None:
+            return None
+        rule, compiled = found
+        if not rule.replacement:
+            new_path = ""
+        elif rule.match_type == RedirectRule.MatchType.PREFIX:
+            new_path = rule.replacement + path[len(rule.pattern):]
+        else:
+            new_path = compiled.fullmatch(path).expand(rule.replacement)
+        return RedirectTarget(RedirectRule, rule.pk, new_path)
+
+
+class RedirectIndex:
+    """Per-process lookup table of :class:`Redirect` rows.
+
+    Keys are ``(site_id, path)`` and values :class:`RedirectTarget`. The
+    table is loaded on first use and reloaded whenever the ``redirects``
+    generation changes, so answering a 404 never touches the database.
+
+    With a per-process cache (see :func:`backend.cache.is_shared`) the
+    table is also reloaded every ``REDIRECT_INDEX_MAX_AGE`` seconds, so
+    redirects imported or flattened by another process show up.
+
+    A redirect stored with a trailing slash (``/en/faq/``) is also entered
+    under the slash-less path (``/en/faq``) unless that path has a redirect of
+    its own, so the slash variant costs no second lookup.
+
+    Paths without an exact redirect fall through to the site's
+    :class:`RuleMatcher`, which covers whole legacy URL families.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._state = None
+
+    def lookup(self, site_id, path, rules=True):
+        """Return the :class:`RedirectTarget` for ``path``, or ``None``.
+
+        With ``rules=False`` only :class:`Redirect` rows are considered.
+        """
+        _generation, entries, matchers = self._current()
+        target = entries.get((site_id, path))
+        if target is not None:
+            return target
+        if not rules:
+            return None
+        matcher = matchers.get(site_id)
+        return matcher.match(path) if matcher is not None else None
+
+    def stats(self):
+        """Describe the loaded index."""
+        _generation, entries, matchers = self._current()
+        return {
+            "paths": len(entries),
+            "rules": sum(len(matcher) for matcher in matchers.values()),
+        }
+
+    def _current(self):
+        generation = get_generation(GENERATION)
+        if not is_shared():
+            # Changes saved by other processes never reach this one's
+            # generation; reload after a while instead.
+            max_age = getattr(settings, "REDIRECT_INDEX_MAX_AGE", 60)
+            generation = (generation, int(time.monotonic() // max_age))
+        state = self._state
+        if state is None or state[0] != generation:
+            with self._lock:
+                state = self._state
+                if state is None or state[0] != generation:
+                    state = (generation, *self._load())
+                    self._state = state
+        return state
+
+    def _load(self):
+        """Return ``(entries, matchers)`` built from the database."""
+        entries = {
+            (site_id, old_path): RedirectTarget(Redirect, pk, new_path)
+            for pk, site_id, old_path, new_path in Redirect.objects.values_list(
+                "pk", "site_id", "old_path", "new_path"
+            )
+        }
+        for (site_id, old_path), entry in list(entries.items()):
+            stripped = old_path[:-1]
+            if old_path.endswith("/") and stripped and not stripped.endswith("/"):
+                entries.setdefault((site_id, stripped), entry)
+
+        rules = defaultdict(list)
+        for rule in RedirectRule.objects.filter(is_active=True):
+            rules[rule.site_id].append(rule)
+        matchers = {site_id: RuleMatcher(site_rules) for site_id, site_rules in rules.items()}
+        return entries, matchers
+
+
+redirect_index = RedirectIndex()
+
+
+def invalidate_redirects(**kwargs):
+    """Signal receiver: make every worker reload its redirect index.
+
+    Deferred until the transaction commits, so a worker reloading in the
+    meantime cannot load the old rows under the new generation.
+    """
+    transaction.on_commit(lambda: bump_generation(GENERATION))
+
+
+def track_redirects(redirects):
+    """Start hit statistics for new ``redirects``, which dates them for ``unused_redirects``."""
+    RedirectHit.objects.bulk_create(
+        [RedirectHit(redirect=redirect) for redirect in redirects], ignore_conflicts=True
+    )
+
+
+def on_redirect_created(sender, instance, created, raw=False, **kwargs):
+    """Signal receiver: start hit statistics for a new :class:`Redirect`."""
+    if created and not raw:
+        track_redirects([instance])
+
+
+class HitCounter:
+    """Counts followed redirects in memory and writes them to the database in bulk.
+
+    Counts are flushed once ``REDIRECT_HITS_FLUSH_THRESHOLD`` hits are pending
+    or ``REDIRECT_HITS_FLUSH_INTERVAL`` seconds have passed since the last
+    flush, whichever comes first, so a redirected request normally adds no
+    write at all. Each flush adds the aggregated counts with ``F()``
+    expressions and only moves ``last_hit`` forward, which keeps concurrent
+    flushes from several workers correct.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._pending = {}
+        self._pending_hits = 0
+        self._last_flush = time.monotonic()
+
+    def record(self, target):
+        """Count one hit of the redirect or rule behind ``target``."""
+        key = (target.model, target.pk)
+        with self._lock:
+            count, _last_hit = self._pending.get(key, (0, None))
+            self._pending[key] = (count + 1, now())
+            self._pending_hits += 1
+            due = self._pending_hits >= getattr(
+                settings, "REDIRECT_HITS_FLUSH_THRESHOLD", 100
+            ) or time.monotonic() - self._last_flush >= getattr(
+                settings, "REDIRECT_HITS_FLUSH_INTERVAL", 60
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write all pending counts; keep them for the next flush if that fails."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._pending_hits = 0
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        try:
+            self._write(pending)
+        except DatabaseError:
+            logger.exception("Could not store redirect hit counts")
+            with self._lock:
+                for key, (count, last_hit) in pending.items():
+                    current, newer = self._pending.get(key, (0, last_hit))
+                    self._pending[key] = (current + count, max(last_hit, newer))
+                    self._pending_hits += count
+
+    def _write(self, pending):
+        redirects = {pk: hit for (model, pk), hit in pending.items() if model is Redirect}
+        rules = {pk: hit for (model, pk), hit in pending.items() if model is RedirectRule}
+        with transaction.atomic():
+            if redirects:
+                # Redirects deleted since they were counted are dropped here.
+                existing = Redirect.objects.filter(pk__in=redirects).values_list(
+                    "pk", flat=True
+                )
+                RedirectHit.objects.bulk_create(
+                    [RedirectHit(redirect_id=pk) for pk in existing],
+                    ignore_conflicts=True,
+                )
+                RedirectHit.objects.bulk_update(
+                    [
+                        RedirectHit(
+                            redirect_id=pk, hits=F("hits") + count, last_hit=_latest(last_hit)
+                        )
+                        for pk, (count, last_hit) in redirects.items()
+                    ],
+                    ["hits", "last_hit"],
+                )
+            if rules:
+                RedirectRule.objects.bulk_update(
+                    [
+                        RedirectRule(pk=pk, hits=F("hits") + count, last_hit=_latest(last_hit))
+                        for pk, (count, last_hit) in rules.items()
+                    ],
+                    ["hits", "last_hit"],
+                )
+
+
+def _latest(last_hit):
+    # GREATEST() is NULL on SQLite as soon as one argument is.
+    return Greatest(Coalesce(F("last_hit"), Value(last_hit)), Value(last_hit))
+
+
+hit_counter = HitCounter()
+atexit.register(hit_counter.flush)
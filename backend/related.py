@@ -0,0 +1,281 @@
+import re
+from collections import Counter, defaultdict
+from math import log, sqrt
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.timezone import now
+from djangocms_stories.models import Post
+from djangocms_versioning.constants import OPERATION_PUBLISH, OPERATION_UNPUBLISH
+
+from backend.models import PostCard, PostSearchDocument, RelatedPost
+
+# Words of three letters or more; digits and underscores split words.
+WORD = re.compile(r"[^\W\d_]{3,}")
+
+# How often a word counts per occurrence in each field of the search document.
+FIELD_WEIGHTS = {"title": 3, "abstract": 2, "body": 1}
+
+DEFAULT_WEIGHTS = {"categories": 1.0, "tags": 1.0, "text": 2.0}
+
+
+def related_count():
+    return getattr(settings, "BLOG_RELATED_POSTS_COUNT", 3)
+
+
+def words(title, abstract, body):
+    """Count the words of a post, those of its title and abstract more than once."""
+    counts = Counter()
+    for field, text in (("title", title), ("abstract", abstract), ("body", body)):
+        for word in WORD.findall((text or "").casefold()):
+            counts[word] += FIELD_WEIGHTS[field]
+    return counts
+
+
+def normalized(features, weight):
+    """Scale ``{feature: value}`` to length ``sqrt(weight)``."""
+    length = sqrt(sum(value * value for value in features.values()))
+    if not length or not weight:
+        return {}
+    scale = sqrt(weight) / length
+    return {feature: value * scale for feature, value in features.items()}
+
+
+class Document(NamedTuple):
+    post_id: int
+    card_id: int
+    sites: frozenset
+    vector: dict
+
+
+class RelatedIndex:
+    """Sparse feature vectors of the published posts of one blog in one language.
+
+    The similarity of two posts is the dot product of their vectors: the
+    cosine similarity of their categories, of their tags and of the TF-IDF
+    weights of their words, each multiplied by its weight in
+    ``BLOG_RELATED_POSTS_WEIGHTS``. An inverted index from feature to posts
+    limits the products computed to posts that share a feature.
+    """
+
+    def __init__(self, documents):
+        self.documents = {document.post_id: document for document in documents}
+        self.postings = defaultdict(list)
+        for document in documents:
+            for feature, value in document.vector.items():
+                self.postings[feature].append((document.post_id, value))
+
+    @classmethod
+    def build(cls, app_config_id, language):
+        """Read the cards and word counts of the blog in four queries.
+
+        Word counts are stored with the search documents, so only posts
+        whose text changed since are counted again.
+        """
+        rows = list(
+            PostCard.objects.filter(
+                language=language, post__app_config=app_config_id
+            ).values_list(
+                "pk",
+                "post_id",
+                "post_content__search_document",
+                "post_content__search_document__words",
+            )
+        )
+        counts = {post_id: Counter(post_words or {}) for _card_id, post_id, _pk, post_words in rows}
+        uncounted = {
+            document_id: post_id
+            for _card_id, post_id, document_id, post_words in rows
+            if document_id is not None and post_words is None
+        }
+        if uncounted:
+            documents = []
+            for document_id, *texts in PostSearchDocument.objects.filter(
+                pk__in=uncounted
+            ).values_list("pk", "title", "abstract", "body"):
+                post_words = words(*texts)
+                counts[uncounted[document_id]] = post_words
+                documents.append(PostSearchDocument(pk=document_id, words=post_words))
+            PostSearchDocument.objects.bulk_update(documents, ["words"])
+
+        post_ids = [row[1] for row in rows]
+        related = {field: defaultdict(set) for field in ("categories", "tags", "sites")}
+        for field, values in related.items():
+            for post_id, value in Post.objects.filter(
+                pk__in=post_ids, **{f"{field}__isnull": False}
+            ).values_list("pk", field):
+                values[post_id].add(value)
+
+        frequency = Counter(word for post_words in counts.values() for word in post_words)
+        # Smoothed, so that words shared by the first few posts still count.
+        idf = {word: log((1 + len(rows)) / (1 + df)) + 1 for word, df in frequency.items()}
+        weights = {**DEFAULT_WEIGHTS, **getattr(settings, "BLOG_RELATED_POSTS_WEIGHTS", {})}
+
+        documents = []
+        for card_id, post_id, *_document in rows:
+            vector = {}
+            for field in ("categories", "tags"):
+                vector.update(
+                    normalized(
+                        {(field, value): 1.0 for value in related[field][post_id]},
+                        weights[field],
+                    )
+                )
+            tfidf = {
+                ("text", word): (1 + log(count)) * idf[word]
+                for word, count in counts[post_id].items()
+            }
+            vector.update(normalized(tfidf, weights["text"]))
+            documents.append(
+                Document(post_id, card_id, frozenset(related["sites"][post_id]), vector)
+            )
+        return cls(documents)
+
+    def shown_together(self, document, other):
+        """Whether ``other`` can be shown on a site ``document`` is shown on."""
+        return not document.sites or not other.sites or bool(document.sites & other.sites)
+
+    def similar(self, post_id):
+        """Return ``{post_id: score}`` for the posts sharing a feature with ``post_id``."""
+        document = self.documents[post_id]
+        scores = defaultdict(float)
+        for feature, value in document.vector.items():
+            for other_id, other_value in self.postings[feature]:
+                scores[other_id] += value * other_value
+        scores.pop(post_id, None)
+        return {
+            other_id: score
+            for other_id, score in scores.items()
+            if score > 0 and self.shown_together(document, self.documents[other_id])
+        }
+
+    def top(self, scores, count):
+        """Return the ``count`` best ``(post_id, score)`` pairs, newer posts first on ties."""
+        return sorted(scores.items(), key=lambda item: (-item[1], -item[0]))[:count]
+
+    def store(self, post_id, ranked):
+        """Replace the related posts stored for ``post_id`` with ``ranked`` pairs."""
+        card_id = self.documents[post_id].card_id
+        RelatedPost.objects.filter(card=card_id).delete()
+        RelatedPost.objects.bulk_create(
+            RelatedPost(
+                card_id=card_id,
+                related_id=self.documents[other_id].card_id,
+                rank=rank,
+                score=score,
+            )
+            for rank, (other_id, score) in enumerate(ranked)
+        )
+
+
+def rebuild_related_posts(app_config_id, language):
+    """Recompute the related posts of every published post of one blog in one language."""
+    index = RelatedIndex.build(app_config_id, language)
+    count = related_count()
+    with transaction.atomic():
+        for post_id in index.documents:
+            index.store(post_id, index.top(index.similar(post_id), count))
+    return len(index.documents)
+
+
+def update_related_posts(app_config_id, language, post_id):
+    """Recompute the related posts of one post, and fit it into those of the others.
+
+    Posts that now rank it among their best get it added; posts that listed
+    it already are recomputed, its score to them may have dropped. Word
+    weights of the other posts are left as they were; a nightly
+    ``rebuild_related_posts`` catches up on those.
+    """
+    index = RelatedIndex.build(app_config_id, language)
+    if post_id not in index.documents:
+        return
+    count = related_count()
+    scores = index.similar(post_id)
+    listed = defaultdict(dict)
+    for listing_id, related_id, score in RelatedPost.objects.filter(
+        card__language=language, card__post__app_config=app_config_id
+    ).values_list("card__post_id", "related__post_id", "score"):
+        listed[listing_id][related_id] = score
+
+    with transaction.atomic():
+        index.store(post_id, index.top(scores, count))
+        for other_id in index.documents:
+            current = listed[other_id]
+            score = scores.get(other_id, 0.0)
+            if post_id in current:
+                index.store(other_id, index.top(index.similar(other_id), count))
+            elif score and (len(current) < count or score > min(current.values())):
+                index.store(other_id, index.top({**current, post_id: score}, count))
+
+
+def relate_posts(app_config_id, language, post_ids):
+    """Recompute the related posts of the published posts in ``post_ids``."""
+    index = RelatedIndex.build(app_config_id, language)
+    count = related_count()
+    with transaction.atomic():
+        for post_id in post_ids:
+            if post_id in index.documents:
+                index.store(post_id, index.top(index.similar(post_id), count))
+
+
+def on_version_operation(sender, obj, operation, **kwargs):
+    """Signal receiver: fit newly published posts in, replace unpublished ones."""
+    content = obj.content
+    scope = (content.post.app_config_id, content.language)
+    if operation == OPERATION_PUBLISH:
+        transaction.on_commit(lambda: update_related_posts(*scope, content.post_id))
+    elif operation == OPERATION_UNPUBLISH and kwargs.get("to_be_published") is None:
+        # Dropping the card deletes the rows listing the post; the posts
+        # that listed it get their next best instead.
+        listing = list(
+            RelatedPost.objects.filter(
+                related__post=content.post_id, related__language=content.language
+            ).values_list("card__post_id", flat=True)
+        )
+        if listing:
+            transaction.on_commit(lambda: relate_posts(*scope, listing))
+
+
+def on_post_change(sender, instance, action=None, pk_set=None, **kwargs):
+    """Signal receiver: re-relate posts whose categories, tags or sites changed."""
+    if action is not None and not action.startswith("post_"):
+        return
+    if isinstance(instance, Post):
+        post_ids = [instance.pk]
+    elif pk_set:
+        # Changed from the category's side.
+        post_ids = list(pk_set)
+    else:
+        return
+
+    def update():
+        for post_id, app_config_id, language in PostCard.objects.filter(
+            post__in=post_ids
+        ).values_list("post_id", "post__app_config", "language"):
+            update_related_posts(app_config_id, language, post_id)
+
+    transaction.on_commit(update)
+
+
+def related_posts(post_content):
+    """Return the cards of the posts related to ``post_content`` that are visible now.
+
+    One query on the ``(card, rank)`` index. Drafts get the related posts of
+    their post's published version.
+    """
+    at = now()
+    rows = (
+        RelatedPost.objects.filter(
+            card__post=post_content.post_id, card__language=post_content.language
+        )
+        .select_related("related__post")
+        .order_by("rank")
+    )
+    return [row.related for row in rows if visible(row.related.post, at)]
+
+
+def visible(post, at):
+    return (post.date_published is None or post.date_published <= at) and (
+        post.date_published_end is None or post.date_published_end > at
+    )
@@ -0,0 +1,354 @@
+import logging
+import re
+from typing import NamedTuple
+
+from cms.models import PageContent
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import OperationalError, connection, transaction
+from django.db.models import Case, Exists, F, IntegerField, OuterRef, Q, When
+from djangocms_stories.models import Post, PostContent
+from djangocms_versioning.constants import OPERATION_PUBLISH, OPERATION_UNPUBLISH
+
+from backend.models import PageSearchDocument, PostSearchDocument
+from backend.text import html_to_text, page_content_text, post_content_text
+
+logger = logging.getLogger(__name__)
+
+# Created by migrations 0003 and 0004 on SQLite builds with FTS5.
+FTS_TABLES = {
+    PostSearchDocument: "backend_postsearch_fts",
+    PageSearchDocument: "backend_pagesearch_fts",
+}
+
+# Ranked SQLite results are mapped back onto the listing queryset with a
+# CASE expression, so the number of hits carried over is capped.
+MAX_RANKED_RESULTS = 1000
+
+
+def search_config(language):
+    """Return the Postgres text search configuration for ``language``."""
+    configs = getattr(settings, "SEARCH_LANGUAGE_CONFIGS", {})
+    return configs.get(language) or configs.get(language.split("-")[0], "simple")
+
+
+class FallbackSearchBackend:
+    """Case-insensitive substring matching; used when the database has no full-text search."""
+
+    def update(self, document):
+        pass
+
+    def remove(self, model, pks):
+        pass
+
+    def ranked(self, documents, query, language, limit):
+        """Return up to ``limit`` ``(document, score)`` pairs for ``query``, best first."""
+        matches = documents.filter(
+            Q(title__icontains=query)
+            | Q(abstract__icontains=query)
+            | Q(body__icontains=query)
+        )
+        return [(document, 0.0) for document in matches[:limit]]
+
+    def search(self, queryset, query, language):
+        """Filter a ``PostContent`` queryset down to matches for ``query``, best first."""
+        return queryset.filter(
+            Q(title__icontains=query)
+            | Q(abstract__icontains=query)
+            | Q(search_document__body__icontains=query)
+        )
+
+
+class PostgresSearchBackend(FallbackSearchBackend):
+    """``tsvector`` column with a GIN index, ranked with ``ts_rank``."""
+
+    def update(self, document):
+        config = search_config(document.language)
+        type(document).objects.filter(pk=document.pk).update(
+            search_vector=SearchVector("title", weight="A", config=config)
+            + SearchVector("abstract", weight="B", config=config)
+            + SearchVector("body", weight="C", config=config)
+        )
+
+    def _query(self, query, language):
+        return SearchQuery(query, search_type="websearch", config=search_config(language))
+
+    def ranked(self, documents, query, language, limit):
+        search_query = self._query(query, language)
+        matches = (
+            documents.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F("search_vector"), search_query))
+            .order_by("-rank")
+        )
+        return [(document, document.rank) for document in matches[:limit]]
+
+    def search(self, queryset, query, language):
+        search_query = self._query(query, language)
+        return (
+            queryset.filter(search_document__search_vector=search_query)
+            .annotate(rank=SearchRank(F("search_document__search_vector"), search_query))
+            .order_by("-rank", "-post__date_published")
+        )
+
+
+class SQLiteSearchBackend(FallbackSearchBackend):
+    """FTS5 tables keyed by document pk, ranked with ``bm25``.
+
+    Every word of the query must match, as a prefix, so results narrow while
+    the visitor types. Title matches weigh most, then the abstract.
+    """
+
+    def update(self, document):
+        table = FTS_TABLES[type(document)]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {table} WHERE rowid = %s", [document.pk])
+                cursor.execute(
+                    f"INSERT INTO {table} (rowid, title, abstract, body) "
+                    "VALUES (%s, %s, %s, %s)",
+                    [document.pk, document.title, document.abstract, document.body],
+                )
+        except OperationalError:
+            logger.warning("Full-text table %s is not available", table)
+
+    def remove(self, model, pks):
+        if not pks:
+            return
+        placeholders = ", ".join(["%s"] * len(pks))
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {FTS_TABLES[model]} WHERE rowid IN ({placeholders})",
+                    list(pks),
+                )
+        except OperationalError:
+            pass
+
+    def _match(self, model, query, limit):
+        """Return ``(document_pk, score)`` pairs, best first, or ``None`` without FTS5."""
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return []
+        table = FTS_TABLES[model]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT rowid, bm25({table}, 10.0, 5.0, 1.0) AS score FROM {table} "
+                    f"WHERE {table} MATCH %s ORDER BY score LIMIT %s",
+                    [" ".join(f'"{term}"*' for term in terms), limit],
+                )
+                # bm25() is lower for better matches; flip it so higher is better.
+                return [(pk, -score) for pk, score in cursor.fetchall()]
+        except OperationalError:
+            return None
+
+    def ranked(self, documents, query, language, limit):
+        # Documents of other languages or sites are filtered out afterwards,
+        # so ask FTS5 for more than ``limit``.
+        matches = self._match(documents.model, query, MAX_RANKED_RESULTS)
+        if matches is None:
+            return super().ranked(documents, query, language, limit)
+        found = documents.in_bulk([pk for pk, _score in matches])
+        return [(found[pk], score) for pk, score in matches if pk in found][:limit]
+
+    def search(self, queryset, query, language):
+        matches = self._match(PostSearchDocument, query, MAX_RANKED_RESULTS)
+        if matches is None:
+            return super().search(queryset, query, language)
+        content_pks = dict(
+            PostSearchDocument.objects.filter(
+                pk__in=[pk for pk, _score in matches]
+            ).values_list("pk", "post_content_id")
+        )
+        ranked = [content_pks[pk] for pk, _score in matches if pk in content_pks]
+        if not ranked:
+            return queryset.none()
+        return queryset.filter(pk__in=ranked).order_by(
+            Case(
+                *(When(pk=pk, then=position) for position, pk in enumerate(ranked)),
+                output_field=IntegerField(),
+            )
+        )
+
+
+def get_backend():
+    if connection.vendor == "postgresql":
+        return PostgresSearchBackend()
+    if connection.vendor == "sqlite":
+        return SQLiteSearchBackend()
+    return FallbackSearchBackend()
+
+
+def post_document_fields(post_content):
+    """Return the searchable text of ``post_content`` as document fields."""
+    return {
+        "title": post_content.title,
+        "abstract": " ".join(
+            filter(None, [post_content.subtitle, html_to_text(post_content.abstract)])
+        ),
+        "body": post_content_text(post_content),
+    }
+
+
+def index_post_content(post_content, fields=None):
+    """Store the searchable text of ``post_content`` as its post's document.
+
+    ``fields`` are those of :func:`post_document_fields`, if already extracted.
+    """
+    document, _created = PostSearchDocument.objects.update_or_create(
+        post_id=post_content.post_id,
+        language=post_content.language,
+        defaults={
+            "post_content": post_content,
+            **(fields or post_document_fields(post_content)),
+            # Counted again from the new text when next needed.
+            "words": None,
+        },
+    )
+    get_backend().update(document)
+    return document
+
+
+def unindex_post_content(post_content):
+    """Drop the document of ``post_content``'s post in its language."""
+    PostSearchDocument.objects.filter(
+        post_id=post_content.post_id, language=post_content.language
+    ).delete()
+
+
+def page_document_fields(page_content):
+    """Return the searchable text of ``page_content`` as document fields.
+
+    ``None`` for pages that require a login, so that their text cannot leak
+    through search results.
+    """
+    if page_content.page.login_required:
+        return None
+    return {
+        "title": page_content.page_title or page_content.title,
+        "abstract": page_content.meta_description or "",
+        "body": page_content_text(page_content),
+    }
+
+
+def index_page_content(page_content, fields=None):
+    """Store the searchable text of ``page_content`` as its page's document.
+
+    ``fields`` are those of :func:`page_document_fields`, if already extracted.
+    Pages that require a login are left out.
+    """
+    fields = fields or page_document_fields(page_content)
+    if fields is None:
+        unindex_page_content(page_content)
+        return None
+    document, _created = PageSearchDocument.objects.update_or_create(
+        page_id=page_content.page_id,
+        language=page_content.language,
+        defaults={"page_content": page_content, **fields},
+    )
+    get_backend().update(document)
+    return document
+
+
+def unindex_page_content(page_content):
+    """Drop the document of ``page_content``'s page in its language."""
+    PageSearchDocument.objects.filter(
+        page_id=page_content.page_id, language=page_content.language
+    ).delete()
+
+
+# Content model -> (index, unindex) for every kind of versioned content we index.
+INDEXERS = {
+    PostContent: (index_post_content, unindex_post_content),
+    PageContent: (index_page_content, unindex_page_content),
+}
+
+# Content model -> extraction of its document fields, see index_*_content().
+DOCUMENT_FIELDS = {
+    PostContent: post_document_fields,
+    PageContent: page_document_fields,
+}
+
+
+def search_posts(queryset, query, language):
+    """Filter a ``PostContent`` queryset down to matches for ``query``, best first."""
+    return get_backend().search(queryset, query, language)
+
+
+class SearchResult(NamedTuple):
+    """One hit of :func:`search_site`, ready for display."""
+
+    title: str
+    url: str
+    summary: str
+    score: float
+
+
+def _normalised(ranked):
+    """Scale the scores of ``ranked`` so that the best is 1."""
+    top = max((score for _document, score in ranked), default=0)
+    if top <= 0:
+        return [(document, 0.0) for document, _score in ranked]
+    return [(document, score / top) for document, score in ranked]
+
+
+def search_site(query, language, site, limit=50):
+    """Search published pages and posts of ``site`` in ``language``, best first.
+
+    Pages and posts are ranked in separate tables with their own weights, so
+    their scores are normalised to the best hit of each before merging.
+    """
+    backend = get_backend()
+    post_sites = Post.sites.through.objects.filter(post_id=OuterRef("post_id"))
+    pages = backend.ranked(
+        PageSearchDocument.objects.filter(language=language, page__site=site).select_related(
+            "page"
+        ),
+        query,
+        language,
+        limit,
+    )
+    posts = backend.ranked(
+        # Exists() rather than a join on the sites, which repeats posts.
+        PostSearchDocument.objects.filter(language=language)
+        .filter(~Exists(post_sites) | Exists(post_sites.filter(site=site)))
+        .select_related("post_content__post__app_config"),
+        query,
+        language,
+        limit,
+    )
+    results = [
+        SearchResult(
+            document.title,
+            document.page.get_absolute_url(language),
+            document.abstract or document.body,
+            score,
+        )
+        for document, score in _normalised(pages)
+    ] + [
+        SearchResult(
+            document.title,
+            document.post_content.get_absolute_url(language),
+            document.abstract or document.body,
+            score,
+        )
+        for document, score in _normalised(posts)
+    ]
+    results.sort(key=lambda result: result.score, reverse=True)
+    return results[:limit]
+
+
+def on_version_operation(sender, obj, operation, **kwargs):
+    """Signal receiver: keep documents in step with what is published."""
+    index, unindex = INDEXERS[sender]
+    content = obj.content
+    if operation == OPERATION_PUBLISH:
+        transaction.on_commit(lambda: index(content))
+    elif operation == OPERATION_UNPUBLISH and kwargs.get("to_be_published") is None:
+        # When a newer version replaces this one, its publish re-indexes it.
+        transaction.on_commit(lambda: unindex(content))
+
+
+def on_document_delete(sender, instance, **kwargs):
+    """Signal receiver: drop the backend's copy of a deleted document."""
+    get_backend().remove(sender, [instance.pk])
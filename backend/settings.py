@@ -147,15 +147,34 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django.middleware.locale.LocaleMiddleware",
+    # Only acts on the response; above the page cache so cached pages set
+    # the language cookie as well.
+    "cms.middleware.language.LanguageCookieMiddleware",
+    # Answers anonymous visitors without running the CMS middleware and
+    # views below (see backend.page_cache).
+    "backend.middleware.AnonymousPageCacheMiddleware",
+    # Tags responses with what they rendered for CDN purges (below the page
+    # cache, which then stores the tags with the page).
+    "backend.middleware.SurrogateKeyMiddleware",
     "cms.middleware.user.CurrentUserMiddleware",
     "cms.middleware.page.CurrentPageMiddleware",
     "cms.middleware.toolbar.ToolbarMiddleware",
-    "cms.middleware.language.LanguageCookieMiddleware",
+    # Answers revalidations of CMS pages and post details with a 304 before
+    # they are looked up or rendered (see backend.conditional).
+    "backend.middleware.ConditionalContentMiddleware",
     # Serves Redirect entries (must be last: it acts on 404 responses).
     # Custom subclass matches on request.path so query strings don't block a match.
     "backend.middleware.PathOnlyRedirectFallbackMiddleware",
 ]
 
+# Seconds a process keeps its redirect index when the cache is not shared,
+# so redirects imported or rewritten by another process are picked up.
+REDIRECT_INDEX_MAX_AGE = 60
+# Redirect hit counts are kept in memory and written in bulk after this many
+# hits or seconds, whichever comes first.
+REDIRECT_HITS_FLUSH_THRESHOLD = 100
+REDIRECT_HITS_FLUSH_INTERVAL = 60
+
 ROOT_URLCONF = "backend.urls"
 
 TEMPLATES = [
@@ -208,6 +227,41 @@ DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite://:memory:")
 DATABASES = {"default": dj_database_url.parse(DATABASE_URL)}
 
 
+# Cache
+# https://docs.djangoproject.com/en/stable/topics/cache/
+
+# Cached listings, pages, aliases and the redirect index are invalidated
+# through generation tokens kept in the default cache (see backend.cache),
+# which only reach every process when the cache is shared. Point CACHE_URL
+# at Redis ("redis://host:6379/0", needs the redis package) or memcached
+# ("pymemcache://host:11211", needs pymemcache). Without it each process
+# caches on its own: revalidations are answered in full and the redirect
+# index reloads every REDIRECT_INDEX_MAX_AGE seconds.
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+    "rediss": "django.core.cache.backends.redis.RedisCache",
+    "pymemcache": "django.core.cache.backends.memcached.PyMemcacheCache",
+}
+
+
+def _cache_config(url):
+    scheme, _, location = url.partition("://")
+    if scheme not in CACHE_BACKENDS:
+        raise ImproperlyConfigured(
+            f"CACHE_URL must start with one of: {', '.join(CACHE_BACKENDS)}."
+        )
+    # Redis takes the whole URL, memcached and locmem what follows the scheme.
+    return {
+        "BACKEND": CACHE_BACKENDS[scheme],
+        "LOCATION": url if scheme.startswith("redis") else location,
+    }
+
+
+CACHE_URL = os.environ.get("CACHE_URL", "locmem://")
+CACHES = {"default": _cache_config(CACHE_URL)}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
 
@@ -359,10 +413,75 @@ META_SITE_PROTOCOL = os.environ.get("META_SITE_PROTOCOL", "https")
 META_SITE_DOMAIN = os.environ.get("DOMAIN", "localhost:8000")
 META_USE_SITES = True
 
+# sitemap.xml lists every URL up to this many, and becomes an index of
+# per-section sitemaps above it (see backend.sitemaps).
+SITEMAP_INDEX_THRESHOLD = 10000
+# Seconds a rendered sitemap is cached. Publishing re-renders the affected
+# section anyway, so this only bounds stale cache entries.
+SITEMAP_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Full-page cache for anonymous visitors (see backend.page_cache). Publishing
+# or unpublishing a page, post or alias drops it; the timeout bounds how long
+# edits that need no publish (e.g. post dates or menus) take to show.
+PAGE_CACHE_ENABLED = True
+PAGE_CACHE_TIMEOUT = 60 * 10
+# Query parameters that select different content, and those that do not
+# (tracking). Requests with any other parameter bypass the cache.
+PAGE_CACHE_QUERY_PARAMS = ("q", "p", "page", "after", "before")
+PAGE_CACHE_IGNORED_QUERY_PARAMS = (
+    "utm_source",
+    "utm_medium",
+    "utm_campaign",
+    "utm_term",
+    "utm_content",
+    "gclid",
+    "fbclid",
+)
+
+# Seconds browsers may reuse a CMS page or post detail before revalidating
+# it with its ETag / Last-Modified (see backend.conditional); shortened to
+# the next scheduled post going live or expiring.
+CONDITIONAL_MAX_AGE = 60
+
+# Responses carry Surrogate-Key and Cache-Tag headers naming the pages,
+# posts, aliases, categories and authors they show, and publishing purges
+# those keys through this backend (see backend.surrogate_keys). Point it at
+# the CDN in front of the site; the logging backend only logs purges.
+SURROGATE_KEY_PURGE_BACKEND = "backend.surrogate_keys.LoggingPurgeBackend"
+
+# Static aliases rendered with {% cached_static_alias %} (navbar, footer,
+# mega menus) are cached per alias, language, site and, when they show a
+# menu, selected menu path. They are re-rendered when an alias, page, post
+# or category changes (see backend.alias_cache). The timeout bounds
+# plugins showing other data.
+STATIC_ALIAS_CACHE_TIMEOUT = 60 * 60
+# Menu levels whose selected and ancestor classes the cached aliases show;
+# the navbar renders two.
+STATIC_ALIAS_CACHE_MENU_LEVELS = 2
+
 # djangocms-stories settings
 STORIES_URLCONF = "backend.blog_urls"
 # djangocms-stories settings
 STORIES_PAGINATION = 25
+# Blog listings link this many pages at either end by number; the pages in
+# between are reached through keyset cursors (see backend.pagination).
+BLOG_NUMBERED_PAGES = 5
+# Postgres text search configuration used to stem post text, per language
+# code. Languages not listed use the "simple" configuration.
+SEARCH_LANGUAGE_CONFIGS = {"en": "english"}
+# Seconds the post count and category/tag/year counts of a blog listing are
+# cached. They are invalidated on publish and when a scheduled post goes
+# live or expires anyway, so this only bounds stale cache entries.
+BLOG_LISTING_CACHE_TIMEOUT = 60 * 60 * 24
+# Unfiltered blog listings on Postgres show the planner's row estimate
+# instead of an exact count once it exceeds this many posts.
+BLOG_ESTIMATED_COUNT_THRESHOLD = 10000
+# Reading speed behind the reading time shown on posts (see backend.reading).
+BLOG_READING_WORDS_PER_MINUTE = 200
+# Related posts listed beside a post, and how much shared categories, tags
+# and words count towards them (see backend.related).
+BLOG_RELATED_POSTS_COUNT = 3
+BLOG_RELATED_POSTS_WEIGHTS = {"categories": 1.0, "tags": 1.0, "text": 2.0}
 STORIES_LATEST_ENTRIES = 5
 STORIES_ENABLE_TAGS = True
 STORIES_TEMPLATE_CHOICES = (("blog/post_list.html", _("Default")),)
@@ -0,0 +1,191 @@
+import datetime
+import gzip
+import hashlib
+import re
+from typing import NamedTuple
+
+from cms.sitemaps import CMSSitemap
+from django.conf import settings
+from django.contrib.sitemaps.views import SitemapIndexItem
+from django.contrib.sites.shortcuts import get_current_site
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from djangocms_stories.sitemaps import StoriesSitemap
+
+from backend.cache import PAGES, POSTS, scoped_key
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only the gzip variant is stored.
+    brotli = None
+
+# Section -> (sitemap class, generations it is built under). Publishing a post
+# only regenerates "stories"; post URLs start with the URL of the page the
+# blog is hooked to, so pages regenerate both.
+SECTIONS = {
+    "cmspages": (CMSSitemap, (PAGES,)),
+    "stories": (StoriesSitemap, (POSTS, PAGES)),
+}
+
+ACCEPTS_BROTLI = re.compile(r"\bbr\b")
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+
+class Section(NamedTuple):
+    """The URL entries of every page of a section's sitemap."""
+
+    pages: list
+    lastmod: datetime.datetime | None
+
+
+class RenderedSitemap(NamedTuple):
+    """A sitemap document, uncompressed and precompressed."""
+
+    content: bytes
+    gzip: bytes
+    brotli: bytes | None
+    etag: str
+    last_modified: int | None
+
+
+def latest_lastmod(lastmods):
+    """Return the latest of ``lastmods`` (dates or datetimes), or ``None`` if any is missing."""
+    latest = None
+    for lastmod in lastmods:
+        if lastmod is None:
+            return None
+        if not isinstance(lastmod, datetime.datetime):
+            lastmod = datetime.datetime.combine(lastmod, datetime.time.min)
+        if timezone.is_naive(lastmod):
+            lastmod = timezone.make_aware(lastmod, datetime.timezone.utc)
+        latest = lastmod if latest is None else max(latest, lastmod)
+    return latest
+
+
+def timeout():
+    return getattr(settings, "SITEMAP_CACHE_TIMEOUT", 60 * 60 * 24)
+
+
+def get_section(name, site, protocol):
+    """Return the :class:`Section` ``name`` for ``site``, cached until its generations change."""
+    sitemap_class, generations = SECTIONS[name]
+    key = scoped_key("sitemap-section", (name, site.pk, protocol), generation=generations)
+    section = cache.get(key)
+    if section is None:
+        sitemap = sitemap_class()
+        pages = []
+        for page in sitemap.paginator.page_range:
+            urls = sitemap.get_urls(page=page, site=site, protocol=protocol)
+            # The model instances behind the entries are not needed to render.
+            pages.append([{k: v for k, v in url.items() if k != "item"} for url in urls])
+        lastmods = [url["lastmod"] for urls in pages for url in urls]
+        section = Section(pages, latest_lastmod(lastmods) if lastmods else None)
+        cache.set(key, section, timeout())
+    return section
+
+
+def compress(content, lastmod):
+    """Return the :class:`RenderedSitemap` of ``content``."""
+    return RenderedSitemap(
+        content=content,
+        gzip=gzip.compress(content, mtime=0),
+        brotli=brotli.compress(content) if brotli is not None else None,
+        etag=hashlib.md5(content, usedforsecurity=False).hexdigest(),
+        last_modified=int(lastmod.timestamp()) if lastmod else None,
+    )
+
+
+def render_urlset(urls, lastmod):
+    return compress(render_to_string("sitemap.xml", {"urlset": urls}).encode(), lastmod)
+
+
+def render_root(site, protocol):
+    """Render ``sitemap.xml``: every URL while they are few, else an index of the sections.
+
+    The index links each page of each section and switches on once the
+    sections hold more than ``SITEMAP_INDEX_THRESHOLD`` URLs in total.
+    """
+    sections = {name: get_section(name, site, protocol) for name in SECTIONS}
+    total = sum(len(urls) for section in sections.values() for urls in section.pages)
+    lastmod = latest_lastmod(section.lastmod for section in sections.values())
+    if total <= getattr(settings, "SITEMAP_INDEX_THRESHOLD", 10000):
+        urls = [url for section in sections.values() for urls in section.pages for url in urls]
+        return render_urlset(urls, lastmod)
+    items = []
+    for name, section in sections.items():
+        location = f"{protocol}://{site.domain}{reverse('sitemap-section', args=[name])}"
+        for page in range(1, len(section.pages) + 1):
+            items.append(
+                SitemapIndexItem(location if page == 1 else f"{location}?p={page}", section.lastmod)
+            )
+    content = render_to_string("sitemap_index.xml", {"sitemaps": items}).encode()
+    return compress(content, lastmod)
+
+
+def rendered_sitemap(site, protocol, section=None, page=1):
+    """Return the pre-rendered root sitemap, or one page of ``section``.
+
+    Cached until the generation of any section it shows changes, so
+    publishing a post re-renders the root and the "stories" pages only.
+    Returns ``None`` for a page the section does not have.
+    """
+    names = tuple(SECTIONS) if section is None else (section,)
+    generations = tuple(
+        dict.fromkeys(generation for name in names for generation in SECTIONS[name][1])
+    )
+    key = scoped_key("sitemap", (section, page, site.pk, protocol), generation=generations)
+    rendered = cache.get(key)
+    if rendered is None:
+        if section is None:
+            rendered = render_root(site, protocol)
+        else:
+            pages = get_section(section, site, protocol)
+            if not 1 <= page <= len(pages.pages):
+                return None
+            rendered = render_urlset(pages.pages[page - 1], pages.lastmod)
+        cache.set(key, rendered, timeout())
+    return rendered
+
+
+def sitemap_view(request, section=None):
+    """Serve a pre-rendered sitemap, compressed as the client accepts, with conditional GET.
+
+    ``sitemap.xml`` is the root, ``sitemap-<section>.xml?p=<page>`` a page of
+    one section once the root has become an index.
+    """
+    if section is not None and section not in SECTIONS:
+        raise Http404(f"No sitemap available for section: {section!r}")
+    try:
+        page = int(request.GET.get("p", 1))
+    except ValueError:
+        raise Http404(f"No page {request.GET['p']!r}")
+    rendered = rendered_sitemap(get_current_site(request), request.scheme, section, page)
+    if rendered is None:
+        raise Http404(f"Page {page} empty")
+
+    accept_encoding = request.headers.get("Accept-Encoding", "")
+    if rendered.brotli is not None and ACCEPTS_BROTLI.search(accept_encoding):
+        content, encoding = rendered.brotli, "br"
+    elif ACCEPTS_GZIP.search(accept_encoding):
+        content, encoding = rendered.gzip, "gzip"
+    else:
+        content, encoding = rendered.content, None
+    # Each encoding is a different representation and needs its own ETag.
+    etag = f'"{rendered.etag}-{encoding}"' if encoding else f'"{rendered.etag}"'
+
+    response = HttpResponse(content, content_type="application/xml")
+    if encoding:
+        response["Content-Encoding"] = encoding
+    response["ETag"] = etag
+    if rendered.last_modified is not None:
+        response["Last-Modified"] = http_date(rendered.last_modified)
+    response["X-Robots-Tag"] = "noindex, noodp, noarchive"
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return get_conditional_response(
+        request, etag=etag, last_modified=rendered.last_modified, response=response
+    )
@@ -0,0 +1,100 @@
+from bisect import bisect_left
+from collections import defaultdict
+from threading import Lock
+from typing import NamedTuple
+
+from djangocms_stories.models import PostContent
+
+from backend.cache import PAGES, POSTS, get_generation
+
+
+class Suggestion(NamedTuple):
+    post_id: int
+    title: str
+    url: str
+    site_ids: frozenset
+
+
+class SuggestIndex:
+    """Per-process prefix index of published post titles.
+
+    One sorted list of keys per ``(namespace, language)``. Every title is
+    entered once per word, from that word to its end, so "cms" finds
+    "django CMS 5 released" as well as "CMS plugins". A lookup is a
+    :func:`bisect.bisect_left` plus a short scan over the keys starting with
+    the prefix, and never touches the database.
+
+    Like :class:`backend.redirects.RedirectIndex`, the index is rebuilt on
+    first use after the ``posts`` or ``pages`` generation has changed; the
+    latter because post URLs run through the blog's apphook page.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._state = None
+
+    def lookup(self, namespace, language, site_id, prefix, limit=8):
+        """Return up to ``limit`` posts with a title word starting with ``prefix``."""
+        prefix = " ".join(prefix.casefold().split())
+        if not prefix:
+            return []
+        _generation, tables = self._current()
+        keys, suggestions = tables.get((namespace, language), ((), ()))
+        results = []
+        seen = set()
+        position = bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            suggestion = suggestions[position]
+            position += 1
+            if suggestion.post_id in seen:
+                continue
+            if suggestion.site_ids and site_id not in suggestion.site_ids:
+                continue
+            seen.add(suggestion.post_id)
+            results.append(suggestion)
+            if len(results) == limit:
+                break
+        return results
+
+    def _current(self):
+        generation = (get_generation(POSTS), get_generation(PAGES))
+        state = self._state
+        if state is None or state[0] != generation:
+            with self._lock:
+                state = self._state
+                if state is None or state[0] != generation:
+                    state = (generation, self._load())
+                    self._state = state
+        return state
+
+    def _load(self):
+        """Return ``{(namespace, language): (keys, suggestions)}`` built from the database."""
+        entries = defaultdict(list)
+        # The default manager only returns published versions.
+        contents = PostContent.objects.select_related(
+            "post__app_config"
+        ).prefetch_related("post__sites")
+        for content in contents:
+            suggestion = Suggestion(
+                content.post_id,
+                content.title,
+                content.get_absolute_url(content.language),
+                frozenset(site.pk for site in content.post.sites.all()),
+            )
+            words = content.title.casefold().split()
+            table = entries[(content.post.app_config.namespace, content.language)]
+            for start in range(len(words)):
+                table.append((" ".join(words[start:]), suggestion))
+        tables = {}
+        for key, table in entries.items():
+            # Ties are broken by title, so equal keys list alphabetically.
+            table.sort(key=lambda entry: (entry[0], entry[1].title))
+            tables[key] = (
+                [entry[0] for entry in table],
+                [entry[1] for entry in table],
+            )
+        return tables
+
+
+suggest_index = SuggestIndex()
+
@@ -0,0 +1,178 @@
+import functools
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from cms.models import Page, PageContent
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils.functional import SimpleLazyObject
+from django.utils.module_loading import import_string
+from djangocms_alias.models import Alias, AliasContent
+from djangocms_stories.models import Post, PostCategory, PostContent
+from djangocms_versioning.constants import OPERATION_PUBLISH, OPERATION_UNPUBLISH
+
+from backend.models import PostCard
+
+logger = logging.getLogger(__name__)
+
+# Keys of responses that depend on a set of objects rather than on single
+# ones: listings of posts (new posts join them), the category navigation
+# and the page menu (new and moved pages show up in it).
+POSTS = "posts"
+CATEGORIES = "categories"
+MENU = "menu"
+
+_collected = ContextVar("surrogate_keys", default=None)
+
+
+def object_keys(obj):
+    """Return the surrogate keys of ``obj``: a model instance, a key, or ``None``."""
+    if obj is None or obj == "":
+        return []
+    if isinstance(obj, str):
+        return [obj]
+    if isinstance(obj, Page):
+        return [f"page-{obj.pk}"]
+    if isinstance(obj, PageContent):
+        return [f"page-{obj.page_id}"]
+    if isinstance(obj, Post):
+        # The post shows its author's profile.
+        keys = [f"post-{obj.pk}"]
+        return keys + [f"author-{obj.author_id}"] if obj.author_id else keys
+    if isinstance(obj, (PostContent, PostCard)):
+        return [f"post-{obj.post_id}"]
+    if isinstance(obj, Alias):
+        return [f"alias-{obj.pk}"]
+    if isinstance(obj, AliasContent):
+        return [f"alias-{obj.alias_id}"]
+    if isinstance(obj, PostCategory):
+        return [f"category-{obj.pk}"]
+    if isinstance(obj, get_user_model()):
+        return [f"author-{obj.pk}"]
+    raise TypeError(f"No surrogate key for {obj!r}")
+
+
+@contextmanager
+def collect():
+    """Collect the keys of everything rendered in the block into the yielded set."""
+    keys = set()
+    token = _collected.set(keys)
+    try:
+        yield keys
+    finally:
+        _collected.reset(token)
+
+
+def add(*objects):
+    """Record that the response being rendered depends on ``objects``.
+
+    Does nothing outside :func:`collect`, e.g. in management commands.
+    """
+    keys = _collected.get()
+    if keys is not None:
+        for obj in objects:
+            keys.update(object_keys(obj))
+
+
+def rendered_page(request):
+    """The CMS page ``request`` was answered with, or ``None``.
+
+    ``CurrentPageMiddleware`` looks the page up lazily; a page nothing has
+    looked up yet (e.g. on a feed or an API endpoint) is not looked up here.
+    """
+    page = request.__dict__.get("current_page")
+    if isinstance(page, SimpleLazyObject):
+        return getattr(request, "_current_page_cache", None)
+    return page
+
+
+def tag(request, response):
+    """Send the keys collected so far as ``Surrogate-Key`` and ``Cache-Tag`` headers.
+
+    ``Surrogate-Key`` is read by Fastly & co., ``Cache-Tag`` by Cloudflare.
+    Adds the key of ``request``'s page first.
+    """
+    add(rendered_page(request))
+    keys = sorted(_collected.get() or ())
+    if keys:
+        response["Surrogate-Key"] = " ".join(keys)
+        response["Cache-Tag"] = ",".join(keys)
+    return response
+
+
+class PurgeBackend:
+    """Purges the cached responses tagged with any of a set of keys from a CDN."""
+
+    def purge(self, keys):
+        raise NotImplementedError
+
+
+class LoggingPurgeBackend(PurgeBackend):
+    """Logs the keys it is asked to purge, for sites without a CDN in front (the default)."""
+
+    def purge(self, keys):
+        logger.info("Purge surrogate keys: %s", " ".join(sorted(keys)))
+
+
+class InMemoryPurgeBackend(PurgeBackend):
+    """Records the keys it is asked to purge, in place of a CDN (tests)."""
+
+    def __init__(self):
+        self.purged = []
+
+    def purge(self, keys):
+        self.purged.append(sorted(keys))
+
+
+@functools.cache
+def _load_backend(path):
+    return import_string(path)()
+
+
+def get_purge_backend():
+    """The :class:`PurgeBackend` configured in ``SURROGATE_KEY_PURGE_BACKEND``."""
+    return _load_backend(
+        getattr(
+            settings,
+            "SURROGATE_KEY_PURGE_BACKEND",
+            "backend.surrogate_keys.LoggingPurgeBackend",
+        )
+    )
+
+
+def purge(*objects):
+    """Purge the responses depending on ``objects`` once the transaction commits."""
+    keys = {key for obj in objects for key in object_keys(obj)}
+    transaction.on_commit(lambda: get_purge_backend().purge(keys))
+
+
+def on_version_operation(sender, obj, operation, **kwargs):
+    """Signal receiver: purge what shows a page, post or alias when it is (un)published."""
+    if operation == OPERATION_UNPUBLISH and kwargs.get("to_be_published"):
+        # The publish of the version replacing this one purges.
+        return
+    if operation not in (OPERATION_PUBLISH, OPERATION_UNPUBLISH):
+        return
+    content = obj.content
+    if isinstance(content, PageContent):
+        purge(content, MENU)
+    elif isinstance(content, PostContent):
+        purge(content, POSTS)
+    else:
+        purge(content)
+
+
+def on_category_change(sender, instance, **kwargs):
+    """Signal receiver: purge what shows a saved or deleted category or its translation."""
+    category_pk = getattr(instance, "master_id", instance.pk)
+    purge(f"category-{category_pk}", CATEGORIES)
+
+
+def on_author_change(sender, instance, **kwargs):
+    """Signal receiver: purge what shows a changed author profile, including post cards."""
+    if instance.user_id is None:
+        return
+    post_pks = Post.objects.filter(author=instance.user_id).values_list("pk", flat=True)
+    purge(f"author-{instance.user_id}", *(f"post-{pk}" for pk in post_pks))
@@ -1,28 +1,83 @@
 from django import template
-from django.db.models import Q
-from django.db.models.functions import Coalesce
-from django.utils.timezone import now
-from djangocms_stories.models import PostCategory, PostContent
+from django.db.models import prefetch_related_objects
+from django.utils.translation import get_language
+from djangocms_stories.settings import get_setting as get_stories_setting
 from cms.utils import get_current_site
 
+from backend import cards, neighbours, reading, related, surrogate_keys
+from backend.categories import blog_categories
+from backend.models import PostCard, ReadingTime
+from backend.pagination import AFTER, BEFORE
+
 register = template.Library()
 
 
+@register.simple_tag(takes_context=True)
+def get_blog_categories(context):
+    """Categories of the current blog, see :func:`backend.categories.blog_categories`."""
+    request = context["request"]
+    app_config = getattr(request, get_stories_setting("CURRENT_NAMESPACE"), None)
+    if app_config is None:
+        return []
+    surrogate_keys.add(surrogate_keys.CATEGORIES)
+    return blog_categories(get_language(), get_current_site(request), app_config)
+
+
+@register.filter
+def primary_category(post):
+    """First category of ``post`` by priority, e.g. ``post_content.post|primary_category``.
+
+    Uses the categories prefetched by ``OptimizedListMixin`` when present, so
+    list cards cost no query of their own.
+    """
+    category = cards.primary_category(post)
+    surrogate_keys.add(category)
+    return category
+
+
 @register.simple_tag
-def get_blog_categories():
-    return (
-        PostCategory.objects
-        .prefetch_related("translations")
-        .order_by("priority", "translations__name")
-    )
+def post_card(post_content):
+    """The :class:`PostCard` of ``post_content``: ``{% post_card post_content as card %}``.
+
+    Drafts have no stored card; theirs is built on the fly.
+    """
+    try:
+        card = post_content.card
+    except PostCard.DoesNotExist:
+        card = cards.build_card(post_content)
+    surrogate_keys.add(card)
+    return card
+
+
+@register.filter
+def with_cards(post_contents):
+    """Fetch the cards of ``post_contents`` in one query, for lists not from ``OptimizedListMixin``."""
+    post_contents = list(post_contents)
+    prefetch_related_objects(post_contents, "card")
+    return post_contents
+
+
+@register.filter
+def facet_count(counts, key):
+    """Count for ``key`` in one facet, e.g. ``facets.categories|facet_count:cat.pk``."""
+    return (counts or {}).get(key, 0)
 
 
 @register.simple_tag(takes_context=True)
 def page_url(context, page_number):
-    """Build a pagination URL preserving existing GET parameters."""
+    """Build a pagination URL preserving existing GET parameters.
+
+    Neighbours of a keyset-paginated page (see ``backend.pagination``) are
+    linked through their cursor, other pages by number.
+    """
     request = context["request"]
     params = request.GET.copy()
+    for key in (AFTER, BEFORE):
+        params.pop(key, None)
     params[context.get("view").page_kwarg] = page_number
+    cursor = getattr(context.get("page_obj"), "cursors", {}).get(page_number)
+    if cursor is not None:
+        params[cursor[0]] = cursor[1]
     return "?{}".format(params.urlencode())
 
 
@@ -53,62 +108,38 @@ def pagination_range(current_page, total_pages, neighbours=1):
 
 @register.filter
 def est_read_time(post_content):
-    return 5
+    """Estimated reading time of ``post_content`` in minutes.
+
+    Stored when the version was published (see ``backend.reading``); only
+    drafts are estimated while rendering.
+    """
+    try:
+        return post_content.reading_time.minutes
+    except ReadingTime.DoesNotExist:
+        return reading.estimate(post_content).minutes
 
 
 @register.simple_tag(name="adjacent_post_urls", takes_context=True)
 def adjacent_post_urls(context, post_content):
     """
-    Returns a dict with previous_url and next_url for the given PostContent.
-    previous_url = newer post in list order
-    next_url = older post in list order
-    """
-    if not post_content:
-        return {"previous_url": "", "next_url": ""}
+    Returns a dict with previous and next URLs for the given PostContent.
+    previous = newer post in list order
+    next = older post in list order
 
+    Looked up in the cached post sequence of ``backend.neighbours``.
+    """
     request = context.get("request")
-    if request is None:
-        return {"previous_url": "", "next_url": ""}
-
-    ts = now()
-    current = post_content
-    current_sort_date = current.post.date_published or current.post.date_created
-
-    base = (
-        PostContent.objects
-        .filter(
-            language=current.language,
-            post__app_config=current.post.app_config,
-        )
-        .on_site(get_current_site(request))
-        .filter(
-            Q(post__date_published__isnull=True) | Q(post__date_published__lte=ts),
-            Q(post__date_published_end__isnull=True) | Q(post__date_published_end__gt=ts),
-        )
-        .annotate(sort_date=Coalesce("post__date_published", "post__date_created"))
-    )
-    # next in list order (new -> old) = older
-    next_obj = (
-        base.filter(
-            Q(sort_date__lt=current_sort_date) |
-            Q(sort_date=current_sort_date, post_id__lt=current.post_id)
-        )
-        .order_by("-sort_date", "-post_id")
-        .first()
-    )
-
-    # previous in list order = newer
-    previous_obj = (
-        base.filter(
-            Q(sort_date__gt=current_sort_date) |
-            Q(sort_date=current_sort_date, post_id__gt=current.post_id)
-        )
-        .order_by("sort_date", "post_id")
-        .last()
-    )
-
-    result = {
-        "previous": previous_obj.get_absolute_url() if previous_obj else "",
-        "next": next_obj.get_absolute_url() if next_obj else "",
-    }
-    return result
\ No newline at end of file
+    if not post_content or request is None:
+        return {"previous": "", "next": ""}
+    surrogate_keys.add(surrogate_keys.POSTS)
+    return neighbours.adjacent_urls(post_content, get_current_site(request))
+
+
+@register.simple_tag
+def related_post_cards(post_content):
+    """Cards of the posts most like ``post_content``, precomputed by ``backend.related``."""
+    if not post_content:
+        return []
+    related_cards = related.related_posts(post_content)
+    surrogate_keys.add(surrogate_keys.POSTS, *related_cards)
+    return related_cards
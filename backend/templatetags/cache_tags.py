@@ -0,0 +1,59 @@
+from classytags.arguments import Argument, MultiValueArgument
+from cms.templatetags.cms_tags import PlaceholderOptions
+from django import template
+from djangocms_alias.templatetags.djangocms_alias_tags import StaticAlias
+
+from backend import alias_cache
+from backend import surrogate_keys as keys
+
+register = template.Library()
+
+
+@register.simple_tag
+def surrogate_keys(*objects):
+    """Record what the response depends on: ``{% surrogate_keys post_content.post "posts" %}``.
+
+    Takes model instances and literal keys, see :mod:`backend.surrogate_keys`.
+    Renders nothing.
+    """
+    keys.add(*objects)
+    return ""
+
+
+class CachedStaticAlias(StaticAlias):
+    """``{% static_alias %}``, rendered from the cache outside edit mode.
+
+    ``{% cached_static_alias "navbar" %}`` is cached per alias, language,
+    site and, if it shows a menu, selected menu path until an alias, page,
+    post or category changes, see :mod:`backend.alias_cache`. The alias
+    tags the response it renders in, see :mod:`backend.surrogate_keys`.
+    """
+
+    name = "cached_static_alias"
+    options = PlaceholderOptions(
+        Argument("static_code", resolve=True),
+        MultiValueArgument("extra_bits", required=False, resolve=False),
+        blocks=[
+            ("endcached_static_alias", "nodelist"),
+        ],
+    )
+
+    def _get_alias(self, request, static_code, extra_bits):
+        alias = super()._get_alias(request, static_code, extra_bits)
+        keys.add(alias)
+        return alias
+
+    def render_tag(self, context, static_code, extra_bits, nodelist=None):
+        request = context.get("request")
+        if not static_code or request is None or not alias_cache.is_cacheable(request):
+            return super().render_tag(context, static_code, extra_bits, nodelist)
+        return alias_cache.render(
+            context,
+            static_code,
+            "site" in extra_bits,
+            lambda: super(CachedStaticAlias, self).render_tag(
+                context, static_code, extra_bits, nodelist
+            ),
+        )
+
+register.tag(CachedStaticAlias.name, CachedStaticAlias)
@@ -0,0 +1,114 @@
+from unittest import mock
+
+from cms.api import add_plugin, create_page
+from cms.models import PageContent
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from djangocms_alias.models import Alias, AliasContent, Category
+from djangocms_alias.templatetags.djangocms_alias_tags import StaticAlias
+from djangocms_versioning.models import Version
+
+from backend.alias_cache import selected_path
+from backend.tests.utils import TEST_STORAGES, ApphookTestCase, create_user
+
+
+# With both page caches off, every request renders its static aliases.
+@override_settings(STORAGES=TEST_STORAGES, PAGE_CACHE_ENABLED=False, CMS_PAGE_CACHE=False)
+class CachedStaticAliasTests(ApphookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        self.about = self.publish_page("About", "about")
+        self.team = self.publish_page("Team", "team")
+        self.category = Category.objects.create(name="Static")
+        self.alias = Alias.objects.create(static_code="footer", category=self.category)
+        self.publish_footer("Made with care")
+
+    def publish_page(self, title, slug):
+        page = create_page(
+            title, "cms_theme/base.html", "en", slug=slug, created_by=self.user, in_navigation=True
+        )
+        content = PageContent.admin_manager.get(page=page, language="en")
+        with self.captureOnCommitCallbacks(execute=True):
+            Version.objects.get_for_content(content).publish(self.user)
+        return page
+
+    def publish_alias(self, alias, plugin_type, **data):
+        with self.captureOnCommitCallbacks(execute=True):
+            content = AliasContent.objects.with_user(self.user).create(
+                alias=alias, name=alias.static_code, language="en"
+            )
+            add_plugin(content.placeholder, plugin_type, "en", **data)
+            Version.objects.get_for_content(content).publish(self.user)
+
+    def publish_footer(self, text):
+        self.publish_alias(self.alias, "TextPlugin", body=f"<p>{text}</p>")
+
+    def get(self, url="/about/"):
+        return self.client.get(url, secure=True)
+
+    def test_rendered_once(self):
+        self.assertContains(self.get(), "Made with care")
+        with mock.patch.object(StaticAlias, "_get_alias", side_effect=AssertionError):
+            response = self.get()
+        self.assertContains(response, "Made with care")
+        self.assertIn(f"alias-{self.alias.pk}", response["Surrogate-Key"])
+
+    def test_rerendered_on_publish(self):
+        self.get()
+        version = Version.objects.get(
+            content_type__model="aliascontent", object_id=self.alias.get_content("en").pk
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            draft = version.copy(self.user)
+            draft.content.placeholder.get_plugins().delete()
+            add_plugin(draft.content.placeholder, "TextPlugin", "en", body="<p>New footer</p>")
+            draft.publish(self.user)
+        self.assertContains(self.get(), "New footer")
+
+    # The CMS placeholder cache does not tell pages apart.
+    @override_settings(CMS_PLACEHOLDER_CACHE=False)
+    def test_menu_cached_per_selected_menu_path(self):
+        navbar = Alias.objects.create(static_code="navbar", category=self.category)
+        self.publish_alias(navbar, "NavbarPlugin")
+        self.get("/about/")
+        self.get("/team/")
+        with mock.patch.object(StaticAlias, "_get_alias", side_effect=AssertionError):
+            about = self.get("/about/")
+            team = self.get("/team/")
+        self.assertContains(about, 'class="nav-link active" href="/about/"')
+        self.assertContains(team, 'class="nav-link active" href="/team/"')
+        self.assertNotContains(team, 'class="nav-link active" href="/about/"')
+
+    def test_footer_cached_once_for_all_pages(self):
+        self.get("/about/")
+        with mock.patch("backend.alias_cache.selected_path") as path:
+            with mock.patch.object(StaticAlias, "_get_alias", side_effect=AssertionError):
+                self.assertContains(self.get("/team/"), "Made with care")
+        path.assert_not_called()
+
+    def test_selected_path(self):
+        about = self.get("/about/").wsgi_request
+        team = self.get("/team/").wsgi_request
+        self.assertEqual(selected_path(about), ([("CMSMenu", self.about.pk)], True))
+        self.assertNotEqual(selected_path(team), selected_path(about))
+        self.assertEqual(selected_path(self.get("/about/?x").wsgi_request), selected_path(about))
+
+    def test_not_cached_for_staff(self):
+        self.get()
+        self.client.force_login(self.user)
+        with mock.patch.object(StaticAlias, "_get_alias", return_value=None) as get_alias:
+            self.assertNotContains(self.get(), "Made with care")
+        self.assertTrue(get_alias.called)
+
+    def test_cached_apart_for_logged_in_visitors(self):
+        self.get()
+        self.client.force_login(get_user_model().objects.create_user("member"))
+        get_alias = StaticAlias._get_alias
+        with mock.patch.object(
+            StaticAlias, "_get_alias", autospec=True, side_effect=get_alias
+        ) as lookup:
+            self.assertContains(self.get(), "Made with care")
+        self.assertTrue(lookup.called)
+        with mock.patch.object(StaticAlias, "_get_alias", side_effect=AssertionError):
+            self.assertContains(self.get(), "Made with care")
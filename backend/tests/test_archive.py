@@ -0,0 +1,97 @@
+from datetime import datetime, timezone
+
+from cms.plugin_pool import plugin_pool
+from django.contrib.sites.models import Site
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from djangocms_stories.models import GenericBlogPlugin
+
+from backend.archive import archive_months, has_posts
+from backend.tests.utils import (
+    TEST_STORAGES,
+    ApphookTestCase,
+    create_app_config,
+    create_blog_page,
+    create_post,
+    create_user,
+)
+
+
+class ArchiveMonthTests(ApphookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        self.config = create_app_config()
+        self.site = Site.objects.get_current()
+
+    def publish(self, title, year, month, language="en", config=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            content = create_post(config or self.config, self.user, title, language=language)
+            content.post.date_published = datetime(year, month, 15, tzinfo=timezone.utc)
+            content.post.save()
+        return content
+
+    def months(self, language="en"):
+        return archive_months(self.config.pk, language, self.site.pk)
+
+    def test_counts_per_month(self):
+        self.publish("One", 2024, 3)
+        self.publish("Two", 2024, 3)
+        self.publish("Three", 2025, 1)
+        self.publish("German", 2024, 5, language="de")
+        self.publish("Other blog", 2024, 6, config=create_app_config(namespace="other"))
+        create_post(self.config, self.user, "Draft", publish=False)
+
+        self.assertEqual(list(self.months().items()), [((2025, 1), 1), ((2024, 3), 2)])
+        self.assertEqual(self.months("de"), {(2024, 5): 1})
+
+    def test_other_sites_left_out(self):
+        content = self.publish("Elsewhere", 2024, 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            content.post.sites.set([Site.objects.create(domain="other.example.com", name="Other")])
+        self.assertEqual(self.months(), {})
+
+    def test_cached_until_publish(self):
+        self.publish("One", 2024, 3)
+        self.months()
+        with self.assertNumQueries(0):
+            self.assertTrue(has_posts(self.config.pk, "en", self.site.pk, 2024, 3))
+            self.assertTrue(has_posts(self.config.pk, "en", self.site.pk, 2024))
+            self.assertFalse(has_posts(self.config.pk, "en", self.site.pk, 2024, 4))
+            self.assertFalse(has_posts(self.config.pk, "en", self.site.pk, 2023))
+
+        self.publish("Two", 2024, 4)
+        self.assertTrue(has_posts(self.config.pk, "en", self.site.pk, 2024, 4))
+
+    @override_settings(STORAGES=TEST_STORAGES, PAGE_CACHE_ENABLED=False)
+    def test_empty_month_page_skips_list_queries(self):
+        create_blog_page(self.user, self.config)
+        self.publish("One", 2024, 3)
+        self.client.get("/blog/2024/3/", secure=True)
+
+        response = self.client.get("/blog/2024/3/", secure=True)
+        self.assertEqual(len(response.context["postcontent_list"]), 1)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/blog/2024/4/", secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["postcontent_list"]), 0)
+        self.assertFalse(
+            [query for query in queries if "djangocms_stories_postcontent" in query["sql"]]
+        )
+
+    def test_archive_plugin(self):
+        self.publish("One", 2024, 3)
+        self.publish("Two", 2025, 1)
+        instance = GenericBlogPlugin(app_config=self.config)
+        plugin = plugin_pool.get_plugin("BlogArchivePlugin")
+        self.assertEqual(plugin.__module__, "backend.cms_plugins")
+        context = plugin().render({"request": RequestFactory().get("/")}, instance, None)
+        self.assertEqual(
+            [
+                (entry["date"].year, entry["date"].month, entry["count"])
+                for entry in context["dates"]
+            ],
+            [(2025, 1, 1), (2024, 3, 1)],
+        )
@@ -0,0 +1,178 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import SimpleTestCase, TestCase, override_settings
+from djangocms_stories.models import PostContent
+from djangocms_versioning.models import Version
+
+from authors.models import AuthorProfile
+from backend.cards import image_sizes
+from backend.models import PostCard
+from backend.tests.utils import (
+    ApphookTestCase,
+    create_app_config,
+    create_blog_page,
+    create_category,
+    create_post,
+    create_user,
+)
+
+
+class PostCardTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.config = create_app_config()
+
+    def publish(self, title="Post", **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return create_post(self.config, self.user, title, **fields)
+
+    def test_built_on_publish(self):
+        content = self.publish("Release", subtitle="Now out", abstract="<p>Read all about it</p>")
+        with self.captureOnCommitCallbacks(execute=True):
+            content.post.categories.add(
+                create_category(self.config, "Guides", priority=2),
+                create_category(self.config, "News", priority=1),
+            )
+
+        card = PostCard.objects.get(post=content.post, language="en")
+
+        self.assertEqual(card.post_content, content)
+        self.assertEqual(card.title, "Release")
+        self.assertEqual(card.subtitle, "Now out")
+        self.assertEqual(card.url, content.get_absolute_url("en"))
+        self.assertEqual(card.abstract, "<p>Read all about it</p>")
+        self.assertEqual(card.category, "News")
+        self.assertFalse(card.author_has_profile)
+        self.assertEqual(card.images, {})
+
+    def test_not_built_for_drafts(self):
+        create_post(self.config, self.user, "Draft", publish=False)
+        self.assertFalse(PostCard.objects.exists())
+
+    @override_settings(STORIES_POSTS_LIST_TRUNCWORDS_COUNT=3)
+    def test_abstract_truncated(self):
+        content = self.publish(abstract="<p>one two three four five</p>")
+        self.assertEqual(content.card.abstract, "<p>one two three…</p>")
+
+    def test_new_version_replaces_card(self):
+        content = self.publish("First")
+        version = Version.objects.get_for_content(content)
+        with self.captureOnCommitCallbacks(execute=True):
+            draft = version.copy(self.user)
+            draft.content.title = "Second"
+            draft.content.save()
+            draft.publish(self.user)
+
+        card = PostCard.objects.get(post=content.post)
+        self.assertEqual(card.post_content, draft.content)
+        self.assertEqual(card.title, "Second")
+
+    def test_dropped_on_unpublish(self):
+        content = self.publish()
+        with self.captureOnCommitCallbacks(execute=True):
+            Version.objects.get_for_content(content).unpublish(self.user)
+        self.assertFalse(PostCard.objects.exists())
+
+    def test_author_profile(self):
+        profile = AuthorProfile.objects.create(user=self.user, name="Ada", slug="ada")
+        content = self.publish()
+        self.assertTrue(content.card.author_has_profile)
+        self.assertEqual(content.card.author_name, "Ada")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.name = "Ada L."
+            profile.save()
+
+        self.assertEqual(PostCard.objects.get().author_name, "Ada L.")
+
+    def test_category_rename(self):
+        category = create_category(self.config, "News")
+        content = self.publish()
+        with self.captureOnCommitCallbacks(execute=True):
+            content.post.categories.add(category)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            category.set_current_language("en")
+            category.name = "Updates"
+            category.save()
+
+        self.assertEqual(PostCard.objects.get().category, "Updates")
+
+    def test_category_delete(self):
+        category = create_category(self.config, "News")
+        content = self.publish()
+        with self.captureOnCommitCallbacks(execute=True):
+            content.post.categories.add(category)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            category.delete()
+
+        self.assertEqual(PostCard.objects.get().category, "")
+
+    def test_post_card_tag_builds_drafts(self):
+        published = self.publish("Published")
+        draft = create_post(self.config, self.user, "Draft", publish=False)
+        template = Template(
+            "{% load blog_tags %}{% for content in contents|with_cards %}"
+            "{% post_card content as card %}{{ card.title }};{% endfor %}"
+        )
+        contents = list(
+            PostContent.admin_manager.filter(pk__in=[published.pk, draft.pk]).order_by("pk")
+        )
+
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                template.render(Context({"contents": contents[:1]})), "Published;"
+            )
+        self.assertEqual(template.render(Context({"contents": contents})), "Published;Draft;")
+        self.assertFalse(PostCard.objects.filter(post_content=draft).exists())
+
+    def test_rebuild_command(self):
+        content = create_post(self.config, self.user, "Imported")
+        create_post(self.config, self.user, "Draft", publish=False)
+        out = StringIO()
+
+        call_command("rebuild_post_cards", stdout=out)
+
+        self.assertIn("Built 1 card(s)", out.getvalue())
+        self.assertEqual(PostCard.objects.get().post_content, content)
+
+
+class PostCardPageTests(ApphookTestCase):
+    def test_apphook_page_change(self):
+        user = create_user()
+        config = create_app_config()
+        page = create_blog_page(user, config)
+        with self.captureOnCommitCallbacks(execute=True):
+            content = create_post(config, user, "Post")
+        PostCard.objects.update(url="/old-blog/post/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            page.urls.get(language="en").save()
+
+        self.assertEqual(PostCard.objects.get().url, content.get_absolute_url("en"))
+
+
+class ImageSizeTests(SimpleTestCase):
+    def test_srcset_per_layout(self):
+        with mock.patch(
+            "backend.cards.thumbnail_url",
+            side_effect=lambda image, options: "/{}x{}.jpg".format(*options["size"]),
+        ):
+            sizes = image_sizes(object())
+
+        self.assertEqual(
+            sizes["top"],
+            {
+                "src": "/600x362.jpg",
+                "srcset": "/400x241.jpg 400w, /600x362.jpg 600w, /800x482.jpg 800w",
+            },
+        )
+        self.assertEqual(sizes["list"]["src"], "/600x450.jpg")
+
+    def test_layout_left_out_without_thumbnails(self):
+        with mock.patch("backend.cards.thumbnail_url", return_value=""):
+            self.assertEqual(image_sizes(object()), {})
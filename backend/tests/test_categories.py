@@ -0,0 +1,87 @@
+from django.contrib.sites.models import Site
+from django.template import Context, Template
+from django.test import RequestFactory
+
+from backend.cache import PAGES, bump_generation
+from backend.categories import blog_categories
+from backend.tests.utils import (
+    ApphookTestCase,
+    create_app_config,
+    create_blog_page,
+    create_category,
+    create_user,
+)
+
+
+class BlogCategoryTests(ApphookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        self.config = create_app_config()
+        create_blog_page(self.user, self.config)
+        self.site = Site.objects.get_current()
+
+    def names(self, language="en", app_config=None):
+        return [
+            link.name for link in blog_categories(language, self.site, app_config or self.config)
+        ]
+
+    def test_one_row_per_category(self):
+        category = create_category(self.config, "News")
+        category.set_current_language("de")
+        category.name = "Neuigkeiten"
+        category.slug = "neuigkeiten"
+        category.save()
+
+        self.assertEqual(self.names(), ["News"])
+
+    def test_priority_then_name(self):
+        create_category(self.config, "Zebra")
+        create_category(self.config, "apple")
+        create_category(self.config, "Late", priority=2)
+        create_category(self.config, "Early", priority=1)
+        self.assertEqual(self.names(), ["Early", "Late", "apple", "Zebra"])
+
+    def test_links(self):
+        category = create_category(self.config, "Release Notes")
+        (link,) = blog_categories("en", self.site, self.config)
+        self.assertEqual(link.pk, category.pk)
+        self.assertEqual(link.slug, "release-notes")
+        self.assertEqual(link.url, "/blog/category/release-notes/")
+
+    def test_cached_until_a_category_changes(self):
+        category = create_category(self.config, "News")
+        self.names()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names(), ["News"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            category.name = "Announcements"
+            category.save()
+        self.assertEqual(self.names(), ["Announcements"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            category.delete()
+        self.assertEqual(self.names(), [])
+
+    def test_rebuilt_when_pages_change(self):
+        create_category(self.config, "News")
+        self.names()
+
+        bump_generation(PAGES)
+        with self.assertNumQueries(2):
+            self.assertEqual(self.names(), ["News"])
+
+    def test_other_blogs_left_out(self):
+        other = create_app_config(namespace="other")
+        create_category(self.config, "News")
+        create_category(other, "Elsewhere")
+        self.assertEqual(self.names(), ["News"])
+
+    def test_template_tag_outside_a_blog(self):
+        create_category(self.config, "News")
+        template = Template(
+            "{% load blog_tags %}{% get_blog_categories as categories %}{{ categories|length }}"
+        )
+        request = RequestFactory().get("/")
+        self.assertEqual(template.render(Context({"request": request})), "0")
@@ -0,0 +1,128 @@
+import math
+from datetime import timedelta
+from unittest import mock
+
+from cms.api import create_page
+from cms.models import PageContent
+from django.test import override_settings
+from django.utils.cache import get_max_age
+from django.utils.http import http_date
+from django.utils.timezone import now
+from djangocms_alias.models import Alias, AliasContent, Category
+from djangocms_versioning.models import Version
+
+from authors.models import AuthorProfile
+from backend.cache import generation
+from backend.conditional import GENERATIONS
+from backend.tests.utils import (
+    TEST_STORAGES,
+    ApphookTestCase,
+    create_app_config,
+    create_blog_page,
+    create_post,
+    create_user,
+)
+
+
+@override_settings(STORAGES=TEST_STORAGES, PAGE_CACHE_ENABLED=False)
+class ConditionalContentTests(ApphookTestCase):
+    def setUp(self):
+        super().setUp()
+        # The validators only hold with a cache shared by all processes.
+        shared = mock.patch("backend.conditional.is_shared", return_value=True)
+        shared.start()
+        self.addCleanup(shared.stop)
+        self.user = create_user()
+        self.config = create_app_config()
+        with self.captureOnCommitCallbacks(execute=True):
+            create_blog_page(self.user, self.config)
+            page = create_page(
+                "About", "cms_theme/base.html", "en", slug="about", created_by=self.user
+            )
+            content = PageContent.admin_manager.get(page=page, language="en")
+            Version.objects.get_for_content(content).publish(self.user)
+            self.post = create_post(self.config, self.user, "First post")
+
+    def get(self, url="/about/", **headers):
+        self.client.cookies.clear()
+        return self.client.get(url, secure=True, headers=headers)
+
+    def assertRevalidates(self, url):
+        response = self.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertIn("Last-Modified", response)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get(url, if_none_match=response["ETag"]).status_code, 304)
+        self.assertEqual(
+            self.get(url, if_modified_since=response["Last-Modified"]).status_code, 304
+        )
+        return response["ETag"]
+
+    def test_page(self):
+        self.assertRevalidates("/about/")
+
+    def test_post_detail(self):
+        self.assertRevalidates(self.post.get_absolute_url())
+
+    def test_changed_by_publishing(self):
+        url = self.post.get_absolute_url()
+        etag = self.assertRevalidates(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            create_post(self.config, self.user, "Second post")
+        self.assertEqual(self.get(url, if_none_match=etag).status_code, 200)
+
+        etag = self.assertRevalidates("/about/")
+        alias = Alias.objects.create(
+            static_code="footer", category=Category.objects.create(name="Static")
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            content = AliasContent.objects.with_user(self.user).create(
+                alias=alias, name="footer", language="en"
+            )
+            Version.objects.get_for_content(content).publish(self.user)
+        response = self.get("/about/", if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_changed_by_author_profile_edits(self):
+        etag = self.assertRevalidates(self.post.get_absolute_url())
+        with self.captureOnCommitCallbacks(execute=True):
+            AuthorProfile.objects.create(user=self.user, name="Ada", slug="ada")
+        response = self.get(self.post.get_absolute_url(), if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_last_modified_is_the_latest_change(self):
+        response = self.get()
+        changed = max(generation(name).changed for name in GENERATIONS)
+        self.assertEqual(response["Last-Modified"], http_date(math.ceil(changed)))
+
+    @override_settings(CONDITIONAL_MAX_AGE=60 * 60 * 24)
+    def test_max_age_bounded_by_the_next_scheduled_post(self):
+        self.assertEqual(get_max_age(self.get()), 60)
+        with self.captureOnCommitCallbacks(execute=True):
+            post = create_post(self.config, self.user, "Scheduled").post
+            post.date_published = now() + timedelta(hours=1)
+            post.save()
+        self.assertLessEqual(get_max_age(self.get()), 60 * 60 + 1)
+
+    def test_personal_requests(self):
+        etag = self.get()["ETag"]
+        self.client.force_login(self.user)
+        response = self.client.get("/about/", secure=True, headers={"if_none_match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+        self.assertEqual(self.get("/about/?edit", if_none_match=etag).status_code, 200)
+
+    def test_not_validated_with_a_per_process_cache(self):
+        etag = self.get()["ETag"]
+        with mock.patch("backend.conditional.is_shared", return_value=False):
+            response = self.get(if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+
+    def test_other_views(self):
+        response = self.get("/blog/")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+        self.assertNotIn("ETag", self.get("/missing/"))
@@ -0,0 +1,95 @@
+from datetime import datetime, timezone
+
+from django.test import TestCase, override_settings
+from djangocms_stories.models import PostContent
+from djangocms_versioning.models import Version
+
+from backend.facets import cached_facets, count_facets
+from backend.tests.utils import (
+    TEST_STORAGES,
+    ApphookTestCase,
+    create_app_config,
+    create_blog_page,
+    create_category,
+    create_post,
+    create_user,
+)
+
+
+class FacetTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.config = create_app_config()
+        self.news = create_category(self.config, "News")
+        self.guides = create_category(self.config, "Guides")
+
+    def publish(self, title, year, categories=(), tags=()):
+        with self.captureOnCommitCallbacks(execute=True):
+            content = create_post(self.config, self.user, title)
+            post = content.post
+            post.date_published = datetime(year, 6, 1, tzinfo=timezone.utc)
+            post.save()
+            post.categories.set(categories)
+            post.tags.add(*tags)
+        return content
+
+    def test_counts_in_one_query(self):
+        self.publish("One", 2024, [self.news], ["release"])
+        self.publish("Two", 2025, [self.news, self.guides], ["release", "plugins"])
+        self.publish("Three", 2025)
+        create_post(self.config, self.user, "Draft", publish=False)
+
+        with self.assertNumQueries(1):
+            facets = count_facets(PostContent.objects.all())
+
+        self.assertEqual(facets["categories"], {self.news.pk: 2, self.guides.pk: 1})
+        self.assertEqual(sorted(facets["tags"].values()), [1, 2])
+        self.assertEqual(facets["years"], {2024: 1, 2025: 2})
+
+    def test_counts_follow_the_result_set(self):
+        self.publish("One", 2024, [self.news])
+        self.publish("Two", 2025, [self.guides])
+
+        facets = count_facets(
+            PostContent.objects.filter(post__categories=self.guides).order_by("-pk")
+        )
+
+        self.assertEqual(facets["categories"], {self.guides.pk: 1})
+        self.assertEqual(facets["years"], {2025: 1})
+
+    def test_cached_until_publish(self):
+        self.publish("One", 2024, [self.news])
+        scope = ("djangocms_stories", "posts-latest", "", "en", 1)
+        cached_facets(PostContent.objects.all(), scope)
+
+        with self.assertNumQueries(0):
+            facets = cached_facets(PostContent.objects.all(), scope)
+        self.assertEqual(facets["years"], {2024: 1})
+
+        content = self.publish("Two", 2024, [self.news])
+        self.assertEqual(cached_facets(PostContent.objects.all(), scope)["years"], {2024: 2})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Version.objects.get_for_content(content).unpublish(self.user)
+        self.assertEqual(cached_facets(PostContent.objects.all(), scope)["years"], {2024: 1})
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class FacetViewTests(ApphookTestCase):
+    def test_sidebar_shows_category_counts(self):
+        user = create_user()
+        config = create_app_config()
+        news = create_category(config, "News")
+        create_blog_page(user, config)
+        with self.captureOnCommitCallbacks(execute=True):
+            for title in ("One", "Two"):
+                create_post(config, user, title).post.categories.add(news)
+
+        response = self.client.get("/blog/", secure=True)
+
+        self.assertEqual(response.context["facets"]["categories"], {news.pk: 2})
+        self.assertContains(response, '<span class="blog-facet-count">(2)</span>')
+
+        # Counts of a narrowed listing would show every other category as (0).
+        for url in (news.get_absolute_url(), "/blog/?q=one"):
+            self.assertNotContains(self.client.get(url, secure=True), "blog-facet-count")
@@ -0,0 +1,108 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.utils.http import http_date
+from django.utils.timezone import now
+from djangocms_stories.feeds import LatestEntriesFeed
+from djangocms_stories.models import Post
+from djangocms_versioning.models import Version
+
+from backend.feeds import last_published
+from backend.tests.utils import (
+    ApphookTestCase,
+    create_app_config,
+    create_blog_page,
+    create_post,
+    create_user,
+)
+
+
+class CachedFeedTests(ApphookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        self.config = create_app_config()
+        create_blog_page(self.user, self.config)
+        self.content = self.publish("First post")
+
+    def publish(self, title):
+        with self.captureOnCommitCallbacks(execute=True):
+            content = create_post(self.config, self.user, title)
+            content.post.tags.add("release")
+        return content
+
+    def get(self, url="/blog/feed/", **headers):
+        return self.client.get(url, secure=True, headers=headers)
+
+    def test_headers(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "First post")
+        self.assertTrue(response["ETag"].startswith('"'))
+        version = Version.objects.get_for_content(self.content)
+        self.assertEqual(response["Last-Modified"], http_date(version.modified.timestamp()))
+
+    def test_headers_replayed(self):
+        render = LatestEntriesFeed.__call__
+
+        def tagged(feed, request, *args, **kwargs):
+            response = render(feed, request, *args, **kwargs)
+            response["X-Robots-Tag"] = "noindex"
+            return response
+
+        with mock.patch.object(LatestEntriesFeed, "__call__", tagged):
+            self.get()
+        response = self.get()
+        self.assertEqual(response["X-Robots-Tag"], "noindex")
+        self.assertTrue(response["Content-Type"].startswith("application/rss+xml"))
+
+    def test_expires_with_the_next_scheduled_post(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            post = create_post(self.config, self.user, "Scheduled").post
+            post.date_published = now() + timedelta(hours=1)
+            post.save()
+        with mock.patch.object(cache, "set", wraps=cache.set) as cache_set:
+            self.get()
+        [(_key, _feed, timeout)] = [call.args for call in cache_set.call_args_list]
+        self.assertLessEqual(timeout, 60 * 60 + 1)
+
+    def test_last_modified_when_a_post_expires(self):
+        expired = now()
+        Post.objects.filter(pk=self.content.post_id).update(date_published_end=expired)
+        self.assertEqual(last_published(self.config.namespace), expired)
+
+    def test_rendered_once_per_publish(self):
+        etag = self.get()["ETag"]
+        with mock.patch.object(LatestEntriesFeed, "items", side_effect=AssertionError):
+            response = self.get()
+        self.assertEqual(response["ETag"], etag)
+        self.assertContains(response, "First post")
+
+        self.publish("Second post")
+        response = self.get()
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertContains(response, "Second post")
+
+    def test_not_modified(self):
+        response = self.get()
+        with mock.patch.object(LatestEntriesFeed, "items", side_effect=AssertionError):
+            self.assertEqual(self.get(if_none_match=response["ETag"]).status_code, 304)
+            self.assertEqual(self.get(if_modified_since=response["Last-Modified"]).status_code, 304)
+            self.assertEqual(self.get(if_none_match='"stale"').status_code, 200)
+
+    def test_modified_after_unpublish(self):
+        etag = self.get()["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            Version.objects.get_for_content(self.content).unpublish(self.user)
+        response = self.get(if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "First post")
+
+    def test_tag_feed(self):
+        response = self.get("/blog/tag/release/feed/")
+        self.assertContains(response, "First post")
+        self.assertEqual(
+            self.get("/blog/tag/release/feed/", if_none_match=response["ETag"]).status_code, 304
+        )
+        self.assertNotContains(self.get("/blog/tag/other/feed/"), "First post")
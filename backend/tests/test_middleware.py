@@ -1,7 +1,12 @@
-from django.http import HttpResponse
-from django.test import RequestFactory, SimpleTestCase, override_settings
-
-from backend.middleware import CanonicalHostRedirectMiddleware
+from django.contrib.redirects.models import Redirect
+from django.contrib.sites.models import Site
+from django.http import HttpResponse, HttpResponseNotFound
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from backend.middleware import (
+    CanonicalHostRedirectMiddleware,
+    PathOnlyRedirectFallbackMiddleware,
+)
 
 
 def _middleware():
@@ -76,3 +81,79 @@ class CanonicalHostRedirectMiddlewareTests(SimpleTestCase):
         response = _middleware()(request)
 
         self.assertEqual(response["Location"], "https://www.django-cms.org/")
+
+
+def _redirect_middleware():
+    return PathOnlyRedirectFallbackMiddleware(
+        lambda request: HttpResponseNotFound("missing")
+    )
+
+
+class PathOnlyRedirectFallbackMiddlewareTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.site = Site.objects.get_current()
+
+    def redirect(self, old_path, new_path):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Redirect.objects.create(
+                site=self.site, old_path=old_path, new_path=new_path
+            )
+
+    def get(self, path, **params):
+        return _redirect_middleware()(self.factory.get(path, params))
+
+    def test_redirects_on_path_and_forwards_query_string(self):
+        self.redirect("/en/faq/", "/en/help/")
+
+        response = self.get("/en/faq/", utm_source="newsletter")
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["Location"], "/en/help/?utm_source=newsletter")
+
+    def test_slash_variant_matches(self):
+        self.redirect("/en/faq/", "/en/help/")
+
+        response = self.get("/en/faq")
+
+        self.assertEqual(response["Location"], "/en/help/")
+
+    def test_exact_match_wins_over_slash_variant(self):
+        self.redirect("/en/faq/", "/en/help/")
+        self.redirect("/en/faq", "/en/questions/")
+
+        response = self.get("/en/faq")
+
+        self.assertEqual(response["Location"], "/en/questions/")
+
+    def test_empty_target_is_gone(self):
+        self.redirect("/en/old/", "")
+
+        self.assertEqual(self.get("/en/old/").status_code, 410)
+
+    def test_unknown_path_keeps_404(self):
+        self.assertEqual(self.get("/wp-login.php").status_code, 404)
+
+    @override_settings(REDIRECT_HITS_FLUSH_INTERVAL=3600)
+    def test_lookups_do_not_query_the_database_once_loaded(self):
+        self.redirect("/en/faq/", "/en/help/")
+        self.get("/en/faq/")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get("/en/faq/").status_code, 302)
+            self.assertEqual(self.get("/.env").status_code, 404)
+
+    def test_saving_or_deleting_a_redirect_invalidates_the_index(self):
+        redirect = self.redirect("/en/faq/", "/en/help/")
+        self.get("/en/faq/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            redirect.new_path = "/en/support/"
+            redirect.save()
+            # Until the commit, the index keeps serving the committed rows.
+            self.assertEqual(self.get("/en/faq/")["Location"], "/en/help/")
+        self.assertEqual(self.get("/en/faq/")["Location"], "/en/support/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            redirect.delete()
+        self.assertEqual(self.get("/en/faq/").status_code, 404)
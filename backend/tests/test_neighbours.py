@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+from django.contrib.sites.models import Site
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase
+from django.utils.timezone import now
+
+from backend.cache import PAGES, bump_generation
+from backend.models import PostCard
+from backend.neighbours import adjacent_urls
+from backend.tests.utils import create_app_config, create_post, create_user
+
+
+class NeighbourTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.config = create_app_config()
+        self.site = Site.objects.get_current()
+        self.start = now() - timedelta(days=30)
+        self.first, self.second, self.third = (
+            self.publish(f"Post {day}", day) for day in (1, 2, 3)
+        )
+
+    def publish(self, title, day, **post_fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            content = create_post(self.config, self.user, title, publish=False)
+            post = content.post
+            post.date_published = self.start + timedelta(days=day)
+            for name, value in post_fields.items():
+                setattr(post, name, value)
+            post.save()
+            content.versions.get().publish(self.user)
+        return content
+
+    def urls(self, content):
+        return adjacent_urls(content, self.site)
+
+    def test_list_order(self):
+        self.assertEqual(
+            self.urls(self.second),
+            {"previous": self.third.card.url, "next": self.first.card.url},
+        )
+        self.assertEqual(self.urls(self.third), {"previous": "", "next": self.second.card.url})
+        self.assertEqual(self.urls(self.first), {"previous": self.second.card.url, "next": ""})
+
+    def test_cached_until_publish(self):
+        self.urls(self.second)
+        with self.assertNumQueries(0):
+            self.urls(self.second)
+
+        between = self.publish("Between", 2.5)
+        with self.assertNumQueries(1):
+            urls = self.urls(self.second)
+        self.assertEqual(urls["previous"], between.card.url)
+
+    def test_rebuilt_when_pages_change(self):
+        self.urls(self.second)
+
+        bump_generation(PAGES)
+        with self.assertNumQueries(1):
+            self.urls(self.second)
+
+    def test_posts_without_cards(self):
+        PostCard.objects.all().delete()
+        self.assertEqual(
+            self.urls(self.second),
+            {
+                "previous": self.third.get_absolute_url("en"),
+                "next": self.first.get_absolute_url("en"),
+            },
+        )
+
+    def test_skips_posts_outside_their_publication_window(self):
+        self.publish("Scheduled", 2.5, date_published=now() + timedelta(days=1))
+        self.publish("Expired", 2.6, date_published_end=now() - timedelta(days=1))
+        self.assertEqual(self.urls(self.second)["previous"], self.third.card.url)
+
+    def test_other_sites_left_out(self):
+        other = Site.objects.create(domain="other.example.com", name="Other")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.third.post.sites.set([other])
+        self.assertEqual(self.urls(self.second)["previous"], "")
+
+    def test_unlisted_post_placed_by_date(self):
+        draft = create_post(self.config, self.user, "Draft", publish=False)
+        draft.post.date_published = self.start + timedelta(days=2.5)
+        draft.post.save()
+        self.assertEqual(
+            self.urls(draft),
+            {"previous": self.third.card.url, "next": self.second.card.url},
+        )
+
+    def test_template_tag(self):
+        request = RequestFactory().get("/")
+        template = Template(
+            "{% load blog_tags %}{% adjacent_post_urls post_content as nav %}"
+            "{{ nav.previous }}|{{ nav.next }}"
+        )
+        self.assertEqual(
+            template.render(Context({"request": request, "post_content": self.second})),
+            f"{self.third.card.url}|{self.first.card.url}",
+        )
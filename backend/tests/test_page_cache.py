@@ -0,0 +1,146 @@
+from cms.api import add_plugin, create_page
+from cms.models import PageContent
+from django.contrib import messages
+from django.contrib.messages.storage import default_storage
+from django.contrib.sessions.backends.db import SessionStore
+from django.http import HttpResponse, JsonResponse
+from django.test import RequestFactory, override_settings
+from djangocms_alias.models import Alias, AliasContent, Category
+from djangocms_versioning.constants import OPERATION_ARCHIVE, OPERATION_PUBLISH
+from djangocms_versioning.models import Version
+
+from backend.page_cache import invalidate_page_cache, is_cacheable
+from backend.tests.utils import (
+    TEST_STORAGES,
+    ApphookTestCase,
+    create_app_config,
+    create_blog_page,
+    create_post,
+    create_user,
+)
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class AnonymousPageCacheTests(ApphookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        self.config = create_app_config()
+        create_blog_page(self.user, self.config)
+        self.publish("First post")
+
+    def publish(self, title):
+        with self.captureOnCommitCallbacks(execute=True):
+            return create_post(self.config, self.user, title)
+
+    def get(self, url="/blog/"):
+        return self.client.get(url, secure=True)
+
+    def test_served_from_cache(self):
+        response = self.get()
+        self.client.cookies.clear()
+        with self.assertNumQueries(0):
+            cached = self.get()
+        self.assertEqual(cached.status_code, 200)
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(cached["Content-Type"], response["Content-Type"])
+        # Set by the language cookie middleware above the cache.
+        self.assertEqual(cached.cookies["django_language"].value, "en")
+
+    def test_query_parameters(self):
+        self.get("/blog/?q=first")
+        with self.assertNumQueries(0):
+            self.get("/blog/?q=first&utm_source=newsletter")
+        self.assertNotEqual(self.get("/blog/?q=second").content, self.get("/blog/?q=first").content)
+        with self.assertNumQueries(0):
+            self.get("/blog/?q=second")
+
+        self.get("/blog/")
+        self.get("/blog/?edit")
+        with self.assertNumQueries(0):
+            self.get("/blog/")
+        response = self.get("/blog/?toolbar_on")
+        self.assertIsNotNone(response.context)
+
+    def test_bypassed_with_a_session(self):
+        self.get()
+        self.client.force_login(self.user)
+        response = self.get()
+        self.assertIsNotNone(response.context)
+        self.assertTrue(response.context["request"].user.is_staff)
+
+    def test_dropped_on_publish(self):
+        self.get()
+        create_post(self.config, self.user, "Draft post", publish=False)
+        self.assertNotContains(self.get(), "Draft post")
+
+        self.publish("Second post")
+        self.assertContains(self.get(), "Second post")
+
+    def test_dropped_on_alias_publish_only(self):
+        self.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_page_cache(sender=AliasContent, operation=OPERATION_ARCHIVE)
+        with self.assertNumQueries(0):
+            self.get()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_page_cache(sender=AliasContent, operation=OPERATION_PUBLISH)
+        self.assertIsNotNone(self.get().context)
+
+    def test_cms_page_cache_dropped_as_well(self):
+        page = create_page("About", "cms_theme/base.html", "en", slug="about", created_by=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            content = PageContent.admin_manager.get(page=page, language="en")
+            Version.objects.get_for_content(content).publish(self.user)
+        self.get("/about/")
+
+        alias = Alias.objects.create(
+            static_code="footer", category=Category.objects.create(name="Static")
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            content = AliasContent.objects.with_user(self.user).create(
+                alias=alias, name="footer", language="en"
+            )
+            add_plugin(content.placeholder, "TextPlugin", "en", body="<p>Made with care</p>")
+            Version.objects.get_for_content(content).publish(self.user)
+        self.assertContains(self.get("/about/"), "Made with care")
+
+
+class CacheableResponseTests(ApphookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.request = RequestFactory().get("/")
+
+    def test_html_pages(self):
+        self.assertTrue(is_cacheable(self.request, HttpResponse("<p>Hi</p>")))
+        self.assertFalse(is_cacheable(self.request, JsonResponse({})))
+        self.assertFalse(is_cacheable(self.request, HttpResponse(status=404)))
+
+    def test_personal_responses(self):
+        response = HttpResponse()
+        response.set_cookie("sessionid", "x")
+        self.assertFalse(is_cacheable(self.request, response))
+        self.assertFalse(
+            is_cacheable(self.request, HttpResponse(headers={"Cache-Control": "private"}))
+        )
+        self.assertFalse(is_cacheable(self.request, HttpResponse(headers={"Vary": "Cookie"})))
+
+        self.request.META["CSRF_COOKIE_NEEDS_UPDATE"] = True
+        self.assertFalse(is_cacheable(self.request, HttpResponse()))
+
+    def test_session_and_messages(self):
+        self.request.session = SessionStore()
+        self.request._messages = default_storage(self.request)
+        # Reading an empty session or showing no messages changes nothing.
+        self.request.session.get("cart")
+        list(self.request._messages)
+        self.assertTrue(is_cacheable(self.request, HttpResponse()))
+
+        messages.info(self.request, "Saved")
+        self.assertFalse(is_cacheable(self.request, HttpResponse()))
+
+        request = RequestFactory().get("/")
+        request.session = SessionStore()
+        request.session["cart"] = [1]
+        self.assertFalse(is_cacheable(request, HttpResponse()))
@@ -0,0 +1,227 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.paginator import InvalidPage
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils.timezone import now
+from djangocms_stories.models import Post, PostContent
+
+from backend.cache import PAGES, POSTS, generation_timeout, next_post_change
+from backend.pagination import (
+    CachedCountPaginator,
+    KeysetPaginator,
+    decode_cursor,
+    estimate_count,
+)
+from backend.tests.utils import (
+    TEST_STORAGES,
+    ApphookTestCase,
+    create_app_config,
+    create_blog_page,
+    create_post,
+    create_user,
+)
+
+
+def create_posts(count):
+    user = create_user()
+    config = create_app_config()
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for index in range(count):
+        content = create_post(config, user, f"Post {index}")
+        # Pairs of posts share a date, so the post id has to break ties.
+        Post.objects.filter(pk=content.post_id).update(
+            date_published=start + timedelta(days=index // 2)
+        )
+    return user, config
+
+
+class KeysetPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_posts(11)
+
+    def paginator(self):
+        return KeysetPaginator(PostContent.objects.all(), 2, numbered_pages=2)
+
+    def titles(self, page):
+        return [content.title for content in page]
+
+    def test_walking_cursors_matches_numbered_pages(self):
+        paginator = self.paginator()
+        numbered = [self.titles(paginator.page(number)) for number in (1, 2, 5, 6)]
+        self.assertEqual(numbered[0], ["Post 10", "Post 9"])
+        self.assertEqual(numbered[-1], ["Post 0"])
+
+        page = paginator.page(1)
+        walked = [self.titles(page)]
+        while page.has_next():
+            parameter, cursor = page.cursors[page.number + 1]
+            page = paginator.cursor_page(page.number + 1, **{parameter: cursor})
+            walked.append(self.titles(page))
+        self.assertEqual(walked[:2] + walked[-2:], numbered)
+        self.assertEqual(
+            [title for titles in walked for title in titles],
+            [f"Post {index}" for index in range(10, -1, -1)],
+        )
+
+        backwards = [self.titles(page)]
+        while page.has_previous():
+            parameter, cursor = page.cursors[page.number - 1]
+            page = paginator.cursor_page(page.number - 1, **{parameter: cursor})
+            backwards.append(self.titles(page))
+        self.assertEqual(backwards, walked[::-1])
+
+    def test_pages_near_the_end_are_read_backwards(self):
+        paginator = self.paginator()
+        with self.assertNumQueries(2):
+            self.assertEqual(self.titles(paginator.page(5)), ["Post 2", "Post 1"])
+        self.assertEqual(self.titles(paginator.page(6)), ["Post 0"])
+
+    def test_deep_pages_need_a_cursor(self):
+        with self.assertNumQueries(1), self.assertRaises(InvalidPage):
+            self.paginator().page(3)
+
+    def test_cursor_queries_use_no_offset(self):
+        paginator = self.paginator()
+        page = paginator.page(2)
+        parameter, cursor = page.cursors[3]
+
+        with self.assertNumQueries(1) as queries:
+            paginator.cursor_page(3, **{parameter: cursor})
+        self.assertNotIn("OFFSET", queries.captured_queries[0]["sql"])
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(InvalidPage):
+            self.paginator().cursor_page(2, after="yesterday")
+
+
+class CachedCountTests(TestCase):
+    scope = ("djangocms_stories", "posts-latest", [], "", "en", 1)
+
+    def setUp(self):
+        cache.clear()
+        self.user, self.config = create_posts(3)
+
+    def count(self, **kwargs):
+        paginator = CachedCountPaginator(
+            PostContent.objects.all(), 2, count_scope=self.scope, **kwargs
+        )
+        return paginator.count
+
+    def test_count_cached_until_publish(self):
+        self.assertEqual(self.count(), 3)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.count(), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_post(self.config, self.user, "Another")
+        self.assertEqual(self.count(), 4)
+
+    def test_no_scope_counts_every_time(self):
+        paginator = CachedCountPaginator(PostContent.objects.all(), 2)
+        with self.assertNumQueries(1):
+            self.assertEqual(paginator.count, 3)
+
+    def test_estimate_only_on_postgres(self):
+        self.assertIsNone(estimate_count(PostContent.objects.all()))
+
+    @override_settings(BLOG_ESTIMATED_COUNT_THRESHOLD=1000)
+    def test_large_estimates_replace_the_count(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_post(self.config, self.user, "Bump the generation")
+        with mock.patch("backend.pagination.estimate_count", return_value=25000):
+            self.assertEqual(self.count(estimate=True), 25000)
+        with mock.patch("backend.pagination.estimate_count", return_value=900):
+            with self.captureOnCommitCallbacks(execute=True):
+                create_post(self.config, self.user, "And again")
+            self.assertEqual(self.count(estimate=True), 5)
+
+    def test_estimated_count_pages_near_the_end(self):
+        with mock.patch("backend.pagination.estimate_count", return_value=25000):
+            paginator = KeysetPaginator(
+                PostContent.objects.all(),
+                2,
+                numbered_pages=2,
+                count_scope=("estimated",),
+                estimate=True,
+            )
+            with override_settings(BLOG_ESTIMATED_COUNT_THRESHOLD=1000):
+                self.assertEqual(paginator.num_pages, 12500)
+        self.assertEqual(len(paginator.page(2)), 1)
+        self.assertEqual(len(paginator.page(12500)), 2)
+        self.assertEqual(len(paginator.page(12499)), 1)
+        with self.assertRaises(InvalidPage):
+            paginator.page(3)
+
+    def test_generation_expires_with_the_next_scheduled_post(self):
+        self.assertIsNone(next_post_change())
+        self.assertIsNone(generation_timeout(POSTS))
+
+        goes_live = now() + timedelta(hours=1)
+        Post.objects.filter(pk=PostContent.objects.first().post_id).update(
+            date_published=goes_live, date_published_end=goes_live + timedelta(days=1)
+        )
+
+        self.assertEqual(next_post_change(), goes_live)
+        self.assertIn(generation_timeout(POSTS), (3601, 3602))
+        self.assertIsNone(generation_timeout(PAGES))
+
+
+class CursorTests(SimpleTestCase):
+    def test_decode(self):
+        self.assertEqual(
+            decode_cursor("1735689600000001.42"),
+            (datetime(2025, 1, 1, 0, 0, 0, 1, tzinfo=timezone.utc), 42),
+        )
+
+
+@override_settings(STORAGES=TEST_STORAGES, STORIES_PAGINATION=2, BLOG_NUMBERED_PAGES=2)
+class KeysetListViewTests(ApphookTestCase):
+    def test_neighbour_links_carry_cursors(self):
+        user, config = create_posts(11)
+        create_blog_page(user, config)
+
+        response = self.client.get("/blog/", {"page": 2}, secure=True)
+        page = response.context["page_obj"]
+        next_parameter, next_cursor = page.cursors[3]
+        self.assertContains(response, f'href="?page=3&amp;{next_parameter}={next_cursor}"')
+        self.assertContains(response, 'href="?page=6"')
+
+        response = self.client.get(
+            "/blog/", {"page": 3, next_parameter: next_cursor}, secure=True
+        )
+        self.assertEqual(
+            [content.title for content in response.context["postcontent_list"]],
+            ["Post 6", "Post 5"],
+        )
+
+    def test_deep_numbered_page_is_not_found(self):
+        user, config = create_posts(11)
+        create_blog_page(user, config)
+
+        response = self.client.get("/blog/", {"page": 3}, secure=True)
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_cursor_is_not_found(self):
+        user, config = create_posts(3)
+        create_blog_page(user, config)
+
+        response = self.client.get("/blog/", {"page": 2, "after": "x"}, secure=True)
+
+        self.assertEqual(response.status_code, 404)
+
+
+class PageUrlTagTests(SimpleTestCase):
+    def test_drops_stale_cursor(self):
+        request = RequestFactory().get("/blog/", {"page": 4, "after": "1.2", "q": ""})
+        template = Template("{% load blog_tags %}{% page_url 1 %}")
+
+        url = template.render(
+            Context({"request": request, "view": type("View", (), {"page_kwarg": "page"})})
+        )
+
+        self.assertEqual(url, "?page=1&amp;q=")
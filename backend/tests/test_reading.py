@@ -0,0 +1,73 @@
+from io import StringIO
+
+from cms.api import add_plugin
+from cms.models import Placeholder
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from djangocms_versioning.models import Version
+
+from backend.models import ReadingTime
+from backend.tests.utils import create_app_config, create_post, create_user
+from backend.text import BLOG_CONTENT_SLOT
+
+
+@override_settings(BLOG_READING_WORDS_PER_MINUTE=10)
+class ReadingTimeTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.config = create_app_config()
+        self.content = create_post(
+            self.config, self.user, "Post", publish=False, post_text="<p>one two three</p>"
+        )
+        placeholder = Placeholder.objects.create(source=self.content, slot=BLOG_CONTENT_SLOT)
+        add_plugin(placeholder, "TextPlugin", "en", body="<p>" + "word " * 10 + "</p>")
+        add_plugin(placeholder, "MDTextPlugin", "en", body="*more* " * 5)
+        add_plugin(
+            placeholder,
+            "CodePlugin",
+            "en",
+            config={"code_content": "pip install django-cms", "code_type": "code"},
+        )
+
+    def read_time(self):
+        return Template("{% load blog_tags %}{{ post_content|est_read_time }}").render(
+            Context({"post_content": self.content})
+        )
+
+    def test_stored_on_publish(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Version.objects.get_for_content(self.content).publish(self.user)
+
+        reading_time = ReadingTime.objects.get(post_content=self.content)
+        self.assertEqual(reading_time.words, 21)
+        self.assertEqual(reading_time.minutes, 3)
+        self.content.refresh_from_db()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.read_time(), "3")
+
+    def test_drafts_estimated_while_rendering(self):
+        self.assertEqual(self.read_time(), "3")
+        self.assertFalse(ReadingTime.objects.exists())
+
+    def test_at_least_a_minute(self):
+        content = create_post(self.config, self.user, "Empty")
+        self.assertEqual(
+            Template("{% load blog_tags %}{{ post_content|est_read_time }}").render(
+                Context({"post_content": content})
+            ),
+            "1",
+        )
+
+    def test_backfill_command(self):
+        Version.objects.get_for_content(self.content).publish(self.user)
+        create_post(self.config, self.user, "Draft", publish=False)
+        out = StringIO()
+
+        call_command("backfill_reading_times", workers=1, stdout=out)
+
+        self.assertIn("Stored the reading time of 1 post(s)", out.getvalue())
+        self.assertEqual(ReadingTime.objects.get().minutes, 3)
+
+        call_command("backfill_reading_times", workers=1, stdout=out)
+        self.assertIn("Stored the reading time of 0 post(s)", out.getvalue())
@@ -0,0 +1,394 @@
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+from unittest import mock
+
+from cms.api import create_page
+from cms.models import PageContent
+from django.apps import apps
+from django.contrib.redirects.models import Redirect
+from django.contrib.sites.models import Site
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils.timezone import now
+from djangocms_versioning.models import Version
+
+from backend.models import RedirectHit, RedirectRule
+from backend.redirects import (
+    RuleMatcher,
+    hit_counter,
+    redirect_index,
+)
+from backend.tests.utils import create_user
+
+
+class RedirectIndexStatsTests(TestCase):
+    def test_stats_count_slash_variants(self):
+        site = Site.objects.get_current()
+        with self.captureOnCommitCallbacks(execute=True):
+            Redirect.objects.create(site=site, old_path="/en/faq/", new_path="/")
+            Redirect.objects.create(site=site, old_path="/old.html", new_path="/")
+
+        stats = redirect_index.stats()
+
+        self.assertEqual(stats["paths"], 3)
+        self.assertEqual(stats["rules"], 0)
+
+
+def _rule(pk, pattern, replacement, match_type=RedirectRule.MatchType.REGEX):
+    return RedirectRule(
+        pk=pk, site_id=1, pattern=pattern, replacement=replacement, match_type=match_type
+    )
+
+
+class RuleMatcherTests(SimpleTestCase):
+    def test_prefix_rule_appends_the_rest_of_the_path(self):
+        matcher = RuleMatcher(
+            [_rule(1, "/en/blog/2019/", "/en/archive/", RedirectRule.MatchType.PREFIX)]
+        )
+
+        target = matcher.match("/en/blog/2019/some-post/")
+
+        self.assertEqual(target.new_path, "/en/archive/some-post/")
+        self.assertEqual(target.pk, 1)
+
+    def test_regex_rule_substitutes_captured_groups(self):
+        matcher = RuleMatcher(
+            [_rule(1, r"/news/(?P<year>\d{4})/(?P<slug>[-\w]+)/", r"/en/blog/\g<slug>/?y=\1")]
+        )
+
+        target = matcher.match("/news/2018/release-notes/")
+
+        self.assertEqual(target.new_path, "/en/blog/release-notes/?y=2018")
+
+    def test_first_matching_rule_in_order_wins(self):
+        matcher = RuleMatcher(
+            [
+                _rule(1, r"/docs/(?P<page>[-\w]+)/", r"/en/docs/\g<page>/"),
+                _rule(2, "/docs/", "/en/", RedirectRule.MatchType.PREFIX),
+                _rule(3, r"/(?P<page>.*)", r"/en/\g<page>"),
+            ]
+        )
+
+        self.assertEqual(matcher.match("/docs/install/").pk, 1)
+        self.assertEqual(matcher.match("/docs/a/b/").pk, 2)
+        self.assertEqual(matcher.match("/about/").pk, 3)
+
+    def test_regex_must_match_the_whole_path(self):
+        matcher = RuleMatcher([_rule(1, r"/news/\d+/", "/en/blog/")])
+
+        self.assertIsNone(matcher.match("/news/12/extra/"))
+
+    def test_empty_replacement_means_gone(self):
+        matcher = RuleMatcher([_rule(1, "/forum/", "", RedirectRule.MatchType.PREFIX)])
+
+        self.assertEqual(matcher.match("/forum/thread/1/").new_path, "")
+
+    def test_invalid_rules_are_skipped(self):
+        with self.assertLogs("backend.redirects", "WARNING"):
+            matcher = RuleMatcher([_rule(1, "/broken/(", "/"), _rule(2, "/ok/", "/")])
+
+        self.assertEqual(len(matcher), 1)
+        self.assertEqual(matcher.match("/ok/").pk, 2)
+
+    def test_rules_with_backreferences_are_skipped(self):
+        with self.assertLogs("backend.redirects", "WARNING"):
+            matcher = RuleMatcher(
+                [_rule(1, r"/(\w+)/\1/", "/"), _rule(2, r"/(\w+)/", r"/\1/")]
+            )
+
+        self.assertEqual(len(matcher), 1)
+        self.assertEqual(matcher.match("/a/").new_path, "/a/")
+
+    def test_rules_that_do_not_combine_are_matched_one_by_one(self):
+        rules = [
+            _rule(1, "/old/", "/new/", RedirectRule.MatchType.PREFIX),
+            _rule(2, "(?i)/faq/", "/help/"),
+        ]
+        with self.assertLogs("backend.redirects", "WARNING"):
+            matcher = RuleMatcher(rules)
+
+        self.assertEqual(len(matcher), 2)
+        self.assertEqual(matcher.match("/old/x/").new_path, "/new/x/")
+        self.assertEqual(matcher.match("/FAQ/").new_path, "/help/")
+        self.assertIsNone(matcher.match("/other/"))
+
+
+class RedirectRuleValidationTests(SimpleTestCase):
+    def test_prefix_must_start_with_a_slash(self):
+        with self.assertRaises(ValidationError):
+            _rule(1, "en/blog/", "/", RedirectRule.MatchType.PREFIX).clean()
+
+    def test_invalid_regex_is_rejected(self):
+        with self.assertRaises(ValidationError):
+            _rule(1, "/news/(", "/").clean()
+
+    def test_unknown_group_reference_is_rejected(self):
+        with self.assertRaises(ValidationError):
+            _rule(1, r"/news/(?P<slug>\w+)/", r"/\g<name>/").clean()
+        with self.assertRaises(ValidationError):
+            _rule(1, r"/news/(\w+)/", r"/\2/").clean()
+
+    def test_backreferences_in_the_pattern_are_rejected(self):
+        with self.assertRaises(ValidationError):
+            _rule(1, r"/(\w+)/\1/", "/").clean()
+
+    def test_valid_rule_passes(self):
+        _rule(1, r"/news/(?P<slug>\w+)/", r"/en/blog/\g<slug>/").clean()
+
+
+class RedirectIndexRuleTests(TestCase):
+    def setUp(self):
+        self.site = Site.objects.get_current()
+
+    def test_exact_redirect_wins_over_rules(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            RedirectRule.objects.create(
+                site=self.site, pattern="/en/", replacement="/", match_type="prefix"
+            )
+            Redirect.objects.create(site=self.site, old_path="/en/faq/", new_path="/en/help/")
+
+        self.assertEqual(redirect_index.lookup(self.site.pk, "/en/faq/").model, Redirect)
+        self.assertEqual(
+            redirect_index.lookup(self.site.pk, "/en/other/").model, RedirectRule
+        )
+
+    def test_inactive_rules_are_ignored_and_changes_invalidate(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            rule = RedirectRule.objects.create(
+                site=self.site, pattern="/old/", replacement="/", is_active=False
+            )
+        self.assertIsNone(redirect_index.lookup(self.site.pk, "/old/x"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            rule.is_active = True
+            rule.save()
+
+        self.assertEqual(redirect_index.lookup(self.site.pk, "/old/x").new_path, "/x")
+
+
+@override_settings(REDIRECT_INDEX_MAX_AGE=60)
+class RedirectIndexReloadTests(TestCase):
+    def setUp(self):
+        self.site = Site.objects.get_current()
+
+    def import_redirect(self):
+        # Like another process would: no signal reaches this one.
+        Redirect.objects.bulk_create(
+            [Redirect(site=self.site, old_path="/imported/", new_path="/")]
+        )
+
+    def lookup(self, at):
+        with mock.patch("backend.redirects.time.monotonic", return_value=at):
+            return redirect_index.lookup(self.site.pk, "/imported/")
+
+    def test_reloaded_after_max_age_with_a_per_process_cache(self):
+        self.assertIsNone(self.lookup(6000))
+        self.import_redirect()
+        self.assertIsNone(self.lookup(6059))
+        self.assertEqual(self.lookup(6060).new_path, "/")
+
+    def test_kept_with_a_shared_cache(self):
+        with mock.patch("backend.redirects.is_shared", return_value=True):
+            self.assertIsNone(self.lookup(6000))
+            self.import_redirect()
+            self.assertIsNone(self.lookup(6060))
+
+
+@override_settings(REDIRECT_HITS_FLUSH_THRESHOLD=3, REDIRECT_HITS_FLUSH_INTERVAL=3600)
+class HitCounterTests(TestCase):
+    def setUp(self):
+        hit_counter.flush()
+        self.site = Site.objects.get_current()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.redirect = Redirect.objects.create(
+                site=self.site, old_path="/en/faq/", new_path="/en/help/"
+            )
+            self.rule = RedirectRule.objects.create(
+                site=self.site, pattern="/old/", replacement="/"
+            )
+
+    def hit(self, path):
+        hit_counter.record(redirect_index.lookup(self.site.pk, path))
+
+    def test_hits_below_the_threshold_are_not_written(self):
+        self.hit("/en/faq/")
+
+        with self.assertNumQueries(0):
+            self.hit("/en/faq/")
+
+        self.assertEqual(RedirectHit.objects.get(redirect=self.redirect).hits, 0)
+
+    def test_reaching_the_threshold_flushes_aggregated_counts(self):
+        self.hit("/en/faq/")
+        self.hit("/en/faq")
+        self.hit("/old/page/")
+
+        stats = RedirectHit.objects.get(redirect=self.redirect)
+        self.assertEqual(stats.hits, 2)
+        self.assertIsNotNone(stats.last_hit)
+        self.rule.refresh_from_db()
+        self.assertEqual(self.rule.hits, 1)
+
+    def test_flushes_add_to_stored_counts(self):
+        RedirectHit.objects.filter(redirect=self.redirect).update(hits=10)
+
+        self.hit("/en/faq/")
+        hit_counter.flush()
+
+        self.assertEqual(RedirectHit.objects.get(redirect=self.redirect).hits, 11)
+
+    def test_older_flushes_do_not_move_last_hit_back(self):
+        later = now() + timedelta(hours=1)
+        RedirectHit.objects.filter(redirect=self.redirect).update(last_hit=later)
+        RedirectRule.objects.filter(pk=self.rule.pk).update(last_hit=later)
+
+        self.hit("/en/faq/")
+        self.hit("/old/page/")
+        hit_counter.flush()
+
+        self.assertEqual(RedirectHit.objects.get(redirect=self.redirect).last_hit, later)
+        self.rule.refresh_from_db()
+        self.assertEqual(self.rule.last_hit, later)
+        self.assertEqual(self.rule.hits, 1)
+
+    def test_deleted_redirects_are_dropped(self):
+        self.hit("/en/faq/")
+        self.redirect.delete()
+
+        hit_counter.flush()
+
+        self.assertFalse(RedirectHit.objects.exists())
+
+
+class UnusedRedirectsCommandTests(TestCase):
+    def setUp(self):
+        hit_counter.flush()
+        site = Site.objects.get_current()
+        self.recent = Redirect.objects.create(site=site, old_path="/recent/", new_path="/")
+        self.stale = Redirect.objects.create(site=site, old_path="/stale/", new_path="/")
+        self.never = Redirect.objects.create(site=site, old_path="/never/", new_path="/")
+        self.new = Redirect.objects.create(site=site, old_path="/new/", new_path="/")
+        long_ago = now() - timedelta(days=400)
+        RedirectHit.objects.filter(redirect=self.recent).update(hits=5, last_hit=now())
+        RedirectHit.objects.filter(redirect=self.stale).update(hits=1, last_hit=long_ago)
+        RedirectHit.objects.filter(redirect=self.never).update(created=long_ago)
+        RedirectRule.objects.create(site=site, pattern="/rule/", replacement="/")
+
+    def call(self, *args):
+        out = StringIO()
+        call_command("unused_redirects", *args, stdout=out)
+        return out.getvalue()
+
+    def test_lists_redirects_unused_for_the_period(self):
+        output = self.call("--days", "365")
+
+        self.assertIn("/stale/", output)
+        self.assertIn("/never/ -> / (never hit)", output)
+        self.assertNotIn("/recent/", output)
+        self.assertNotIn("/new/", output)
+        self.assertIn("2 redirect(s) and 0 rule(s)", output)
+        self.assertEqual(Redirect.objects.count(), 4)
+
+    def test_delete_removes_unused_redirects(self):
+        self.call("--days", "365", "--delete")
+
+        self.assertQuerySetEqual(
+            Redirect.objects.values_list("old_path", flat=True).order_by("old_path"),
+            ["/new/", "/recent/"],
+        )
+        self.assertTrue(RedirectRule.objects.exists())
+
+
+    def test_redirects_older_than_hit_counting_are_backfilled(self):
+        RedirectHit.objects.filter(redirect=self.stale).delete()
+        migration = import_module("backend.migrations.0010_backfill_redirect_hits")
+
+        migration.backfill_redirect_hits(apps, None)
+
+        stats = RedirectHit.objects.get(redirect=self.stale)
+        self.assertIsNone(stats.last_hit)
+        self.assertGreater(stats.created, now() - timedelta(minutes=1))
+        self.assertNotIn("/stale/", self.call("--days", "365"))
+        self.assertEqual(RedirectHit.objects.count(), 4)
+
+class FlattenRedirectsCommandTests(TestCase):
+    def setUp(self):
+        self.site = Site.objects.get_current()
+
+    def redirect(self, old_path, new_path):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Redirect.objects.create(
+                site=self.site, old_path=old_path, new_path=new_path
+            )
+
+    def call(self, *args):
+        out = StringIO()
+        call_command("flatten_redirects", *args, stdout=out)
+        return out.getvalue()
+
+    def new_path(self, redirect):
+        redirect.refresh_from_db()
+        return redirect.new_path
+
+    def test_chains_point_at_their_final_target(self):
+        first = self.redirect("/a/", "/b")
+        second = self.redirect("/b/", "/c/?ref=legacy")
+        self.redirect("/c/", "/en/")
+
+        output = self.call()
+
+        self.assertEqual(self.new_path(first), "/en/?ref=legacy")
+        self.assertEqual(self.new_path(second), "/en/?ref=legacy")
+        self.assertIn("1 redirect(s) with 3 hop(s)", output)
+
+    def test_chains_do_not_follow_redirect_rules(self):
+        first = self.redirect("/a/", "/news/2019/")
+        with self.captureOnCommitCallbacks(execute=True):
+            RedirectRule.objects.create(site=self.site, pattern="/", replacement="/en/")
+
+        self.call()
+
+        self.assertEqual(self.new_path(first), "/news/2019/")
+
+    def test_chains_stop_at_live_pages_and_views(self):
+        user = create_user()
+        page = create_page("B", "cms_theme/base.html", "en", slug="b", created_by=user)
+        content = PageContent.admin_manager.get(page=page, language="en")
+        Version.objects.get_for_content(content).publish(user)
+        to_page = self.redirect("/a/", "/b/")
+        self.redirect("/b/", "/c/")
+        to_view = self.redirect("/d/", "/search/")
+        self.redirect("/search/", "/c/")
+
+        self.call()
+
+        self.assertEqual(self.new_path(to_page), "/b/")
+        self.assertEqual(self.new_path(to_view), "/search/")
+
+    def test_chain_ending_in_gone_becomes_gone(self):
+        first = self.redirect("/a/", "/b/")
+        self.redirect("/b/", "")
+
+        self.call()
+
+        self.assertEqual(self.new_path(first), "")
+
+    def test_cycles_are_left_unchanged(self):
+        first = self.redirect("/a/", "/b/")
+        self.redirect("/b/", "/a/")
+
+        output = self.call()
+
+        self.assertEqual(self.new_path(first), "/b/")
+        self.assertIn("2 cycle(s) left unchanged", output)
+
+    def test_dry_run_does_not_write(self):
+        first = self.redirect("/a/", "/b/")
+        self.redirect("/b/", "/c/")
+
+        output = self.call("--dry-run")
+
+        self.assertEqual(self.new_path(first), "/b/")
+        self.assertIn("Would rewrite 1 redirect(s)", output)
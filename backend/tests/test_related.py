@@ -0,0 +1,125 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.sites.models import Site
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from djangocms_versioning.models import Version
+
+from backend.models import RelatedPost
+from backend.related import related_posts, words
+from backend.tests.utils import create_app_config, create_category, create_post, create_user
+
+
+class RelatedPostTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.config = create_app_config()
+
+    def publish(self, title, text="", **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return create_post(self.config, self.user, title, post_text=f"<p>{text}</p>", **fields)
+
+    def titles(self, content):
+        return [card.title for card in related_posts(content)]
+
+    def test_shared_words(self):
+        release = self.publish("Django release", "security fixes and upgrade notes")
+        security = self.publish("Security release", "upgrade now for the security fixes")
+        garden = self.publish("Garden party", "cake, lemonade, lawn")
+
+        self.assertEqual(self.titles(release), ["Security release"])
+        self.assertEqual(self.titles(security), ["Django release"])
+        self.assertEqual(self.titles(garden), [])
+
+    def test_shared_categories_and_tags(self):
+        news = create_category(self.config, "News")
+        first = self.publish("First", "alpha")
+        second = self.publish("Second", "beta")
+        third = self.publish("Third", "gamma")
+        with self.captureOnCommitCallbacks(execute=True):
+            first.post.categories.add(news)
+            second.post.categories.add(news)
+            first.post.tags.add("cms")
+            third.post.tags.add("cms")
+            second.post.tags.add("other")
+
+        self.assertEqual(self.titles(first), ["Third", "Second"])
+        self.assertEqual(self.titles(second), ["First"])
+
+    @override_settings(BLOG_RELATED_POSTS_COUNT=1)
+    def test_best_kept_as_posts_are_published(self):
+        base = self.publish("Plugins", "placeholder plugin toolbar")
+        self.publish("Toolbar", "toolbar")
+        self.assertEqual(self.titles(base), ["Toolbar"])
+
+        self.publish("Plugin toolbar", "placeholder plugin toolbar")
+        self.assertEqual(self.titles(base), ["Plugin toolbar"])
+        self.assertEqual(RelatedPost.objects.filter(card__post=base.post).count(), 1)
+
+    def test_unpublished_posts_replaced(self):
+        base = self.publish("Plugins", "placeholder plugin toolbar")
+        gone = self.publish("Plugin toolbar", "placeholder plugin toolbar")
+        self.publish("Toolbar", "toolbar")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Version.objects.get_for_content(gone).unpublish(self.user)
+
+        self.assertEqual(self.titles(base), ["Toolbar"])
+
+    def test_word_counts_reused(self):
+        self.publish("Plugins", "placeholder plugin toolbar")
+        self.publish("Toolbar", "toolbar")
+
+        with mock.patch("backend.related.words", wraps=words) as counted:
+            self.publish("Plugin toolbar", "placeholder plugin toolbar")
+
+        counted.assert_called_once()
+
+    def test_unpublish_relates_only_listing_posts(self):
+        base = self.publish("Plugins", "placeholder plugin toolbar")
+        gone = self.publish("Plugin toolbar", "placeholder plugin toolbar")
+        self.publish("Garden party", "cake, lemonade, lawn")
+
+        with mock.patch("backend.related.relate_posts") as relate:
+            with self.captureOnCommitCallbacks(execute=True):
+                Version.objects.get_for_content(gone).unpublish(self.user)
+
+        relate.assert_called_once_with(self.config.pk, "en", [base.post_id])
+
+    def test_other_sites_left_out(self):
+        base = self.publish("Plugins", "placeholder plugin")
+        other = self.publish("Plugin", "placeholder plugin")
+        with self.captureOnCommitCallbacks(execute=True):
+            other.post.sites.set([Site.objects.create(domain="other.example.com", name="Other")])
+        self.assertEqual(self.titles(base), [])
+
+    def test_drafts_show_published_related_posts(self):
+        base = self.publish("Plugins", "placeholder plugin")
+        self.publish("Plugin", "placeholder plugin")
+        draft = Version.objects.get_for_content(base).copy(self.user).content
+        self.assertEqual(self.titles(draft), ["Plugin"])
+
+    def test_template_tag(self):
+        base = self.publish("Plugins", "placeholder plugin")
+        self.publish("Plugin", "placeholder plugin")
+        template = Template(
+            "{% load blog_tags %}{% related_post_cards post_content as cards %}"
+            "{% for card in cards %}{{ card.title }}:{{ card.url }}{% endfor %}"
+        )
+        with self.assertNumQueries(1):
+            rendered = template.render(Context({"post_content": base}))
+        related = RelatedPost.objects.get(card__post=base.post).related
+        self.assertEqual(rendered, f"Plugin:{related.url}")
+
+    def test_rebuild_command(self):
+        base = self.publish("Plugins", "placeholder plugin")
+        self.publish("Plugin", "placeholder plugin")
+        RelatedPost.objects.all().delete()
+        out = StringIO()
+
+        call_command("rebuild_related_posts", stdout=out)
+
+        self.assertIn("Related 2 post(s)", out.getvalue())
+        self.assertEqual(self.titles(base), ["Plugin"])
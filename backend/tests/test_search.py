@@ -0,0 +1,212 @@
+from io import StringIO
+
+from cms.api import add_plugin, create_page
+from cms.models import PageContent, Placeholder
+from django.contrib.sites.models import Site
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from djangocms_stories.models import PostContent
+from djangocms_versioning.models import Version
+
+from backend.models import PageSearchDocument, PostSearchDocument
+from backend.search import search_posts, search_site
+from backend.tests.utils import (
+    TEST_STORAGES,
+    create_app_config,
+    create_post,
+    create_user,
+)
+from backend.text import BLOG_CONTENT_SLOT, html_to_text, post_content_text
+
+
+class TextExtractionTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.content = create_post(
+            create_app_config(), self.user, "Plugins", post_text="<p>Legacy &amp; text</p>"
+        )
+        self.placeholder = Placeholder.objects.create(
+            source=self.content, slot=BLOG_CONTENT_SLOT
+        )
+
+    def test_html_to_text(self):
+        self.assertEqual(html_to_text("<p>One\n  <b>two</b></p> &lt;3"), "One two <3")
+
+    def test_text_and_markdown_plugins_in_order(self):
+        add_plugin(self.placeholder, "TextPlugin", "en", body="<p>Written in text</p>")
+        add_plugin(self.placeholder, "MDTextPlugin", "en", body="Written in *markdown*")
+        other = Placeholder.objects.create(source=self.content, slot="Side Bar")
+        add_plugin(other, "TextPlugin", "en", body="<p>Sidebar</p>")
+
+        text = post_content_text(self.content)
+
+        self.assertEqual(
+            text.split("\n"), ["Legacy & text", "Written in text", "Written in markdown"]
+        )
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.config = create_app_config()
+
+    def publish(self, title, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return create_post(self.config, self.user, title, **fields)
+
+    def search(self, query):
+        return list(search_posts(PostContent.objects.all(), query, "en"))
+
+    def test_publish_indexes_title_abstract_and_body(self):
+        content = self.publish(
+            "Caching pages", abstract="<p>Faster <b>responses</b></p>", post_text="Varnish"
+        )
+
+        document = PostSearchDocument.objects.get(post=content.post, language="en")
+        self.assertEqual(document.post_content, content)
+        self.assertEqual(document.abstract, "Faster responses")
+        self.assertEqual(document.body, "Varnish")
+        self.assertEqual(self.search("varnish"), [content])
+        self.assertEqual(self.search("respons"), [content])
+        self.assertEqual(self.search("caching responses"), [content])
+        self.assertEqual(self.search("caching nginx"), [])
+
+    def test_title_matches_rank_first(self):
+        in_body = self.publish("Release notes", post_text="Upgrading to version five")
+        in_title = self.publish("Upgrading guide")
+
+        self.assertEqual(self.search("upgrading"), [in_title, in_body])
+
+    def test_drafts_are_not_indexed(self):
+        create_post(self.config, self.user, "Draft", publish=False)
+
+        self.assertFalse(PostSearchDocument.objects.exists())
+
+    def test_new_version_replaces_document(self):
+        content = self.publish("Old title")
+        draft = Version.objects.get_for_content(content).copy(self.user)
+        draft.content.title = "New title"
+        draft.content.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            draft.publish(self.user)
+
+        self.assertEqual(PostSearchDocument.objects.get().title, "New title")
+        self.assertEqual(self.search("old"), [])
+        self.assertEqual(self.search("new"), [draft.content])
+
+    def test_unpublish_removes_document(self):
+        content = self.publish("Retired")
+        with self.captureOnCommitCallbacks(execute=True):
+            Version.objects.get_for_content(content).unpublish(self.user)
+
+        self.assertFalse(PostSearchDocument.objects.exists())
+        self.assertEqual(self.search("retired"), [])
+
+    def test_rebuild_command(self):
+        content = create_post(self.config, self.user, "Imported")
+        create_post(self.config, self.user, "Draft", publish=False)
+        out = StringIO()
+
+        call_command("rebuild_search_index", workers=1, stdout=out)
+
+        self.assertIn("Indexed 1 page(s) and post(s)", out.getvalue())
+        self.assertEqual(self.search("imported"), [content])
+
+    def test_rebuild_updates_in_place_and_prunes(self):
+        kept = self.publish("Kept")
+        retired = self.publish("Retired")
+        document = PostSearchDocument.objects.get(post=kept.post)
+        # Unpublished without the signal, as if the index had missed it.
+        Version.objects.get_for_content(retired).unpublish(self.user)
+
+        call_command("rebuild_search_index", workers=1, chunk_size=1, stdout=StringIO())
+
+        self.assertEqual(PostSearchDocument.objects.get().pk, document.pk)
+        self.assertEqual(self.search("retired"), [])
+        self.assertEqual(self.search("kept"), [kept])
+
+
+class SiteSearchTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.config = create_app_config()
+        self.site = Site.objects.get_current()
+
+    def create_page(self, title, publish=True, **kwargs):
+        page = create_page(
+            title, "cms_theme/base.html", "en", created_by=self.user, **kwargs
+        )
+        page_content = PageContent.admin_manager.get(page=page, language="en")
+        if publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                Version.objects.get_for_content(page_content).publish(self.user)
+        return page_content
+
+    def add_hero(self, page_content, heading, body):
+        placeholder = page_content.get_placeholders().get(slot="content")
+        add_plugin(
+            placeholder,
+            "HeroPlugin",
+            "en",
+            config={"heading": heading, "body": body, "main_image_url": "https://x.org/"},
+        )
+
+    def test_component_text_is_indexed(self):
+        page_content = self.create_page("Features", publish=False)
+        self.add_hero(page_content, "Structured content", "<p>Built for editors</p>")
+        with self.captureOnCommitCallbacks(execute=True):
+            Version.objects.get_for_content(page_content).publish(self.user)
+
+        document = PageSearchDocument.objects.get(page=page_content.page)
+        self.assertEqual(document.body, "Structured content Built for editors")
+
+    def test_pages_and_posts_share_one_ranking(self):
+        page = self.create_page("Plugins marketplace")
+        with self.captureOnCommitCallbacks(execute=True):
+            create_post(self.config, self.user, "Release notes", post_text="New plugins")
+
+        results = search_site("plugins", "en", self.site)
+
+        self.assertEqual(
+            [result.title for result in results], ["Plugins marketplace", "Release notes"]
+        )
+        self.assertEqual(results[0].url, page.page.get_absolute_url("en"))
+
+    def test_scores_are_normalised_per_kind(self):
+        self.create_page("Plugins marketplace")
+        in_body = self.create_page("Extensions", publish=False)
+        self.add_hero(in_body, "Add-ons", "<p>Third-party plugins</p>")
+        with self.captureOnCommitCallbacks(execute=True):
+            Version.objects.get_for_content(in_body).publish(self.user)
+            create_post(self.config, self.user, "Release notes", post_text="New plugins")
+
+        results = search_site("plugins", "en", self.site)
+
+        self.assertEqual(
+            [result.title for result in results],
+            ["Plugins marketplace", "Release notes", "Extensions"],
+        )
+        self.assertEqual([result.score for result in results][:2], [1.0, 1.0])
+
+    def test_login_required_pages_are_not_indexed(self):
+        self.create_page("Members area", login_required=True)
+
+        self.assertEqual(search_site("members", "en", self.site), [])
+
+    def test_unpublished_page_is_removed(self):
+        page_content = self.create_page("Temporary")
+        with self.captureOnCommitCallbacks(execute=True):
+            Version.objects.get_for_content(page_content).unpublish(self.user)
+
+        self.assertFalse(PageSearchDocument.objects.exists())
+
+    @override_settings(STORAGES=TEST_STORAGES)
+    def test_search_view(self):
+        self.create_page("Community")
+
+        response = self.client.get(reverse("site-search"), {"q": "community"}, secure=True)
+
+        self.assertEqual(response.status_code, 200)
+        results = response.context["results"]
+        self.assertEqual([result.title for result in results], ["Community"])
@@ -0,0 +1,99 @@
+import gzip
+from unittest import mock, skipIf
+
+from cms.sitemaps import CMSSitemap
+from django.test import override_settings
+from djangocms_stories.sitemaps import StoriesSitemap
+
+from backend import sitemaps
+from backend.cache import invalidate_pages
+from backend.tests.utils import (
+    ApphookTestCase,
+    create_app_config,
+    create_blog_page,
+    create_post,
+    create_user,
+)
+
+
+class SitemapTests(ApphookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        self.config = create_app_config()
+        create_blog_page(self.user, self.config)
+        self.publish("First post")
+
+    def publish(self, title):
+        with self.captureOnCommitCallbacks(execute=True):
+            return create_post(self.config, self.user, title)
+
+    def get(self, url="/sitemap.xml", **headers):
+        return self.client.get(url, secure=True, headers=headers)
+
+    def test_lists_pages_and_posts(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/xml")
+        self.assertIn(b"<urlset", response.content)
+        self.assertIn(b"https://example.com/blog/</loc>", response.content)
+        self.assertIn(b"/first-post/</loc>", response.content)
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertIn("Last-Modified", response)
+
+    def test_gzip(self):
+        plain = self.get()
+        response = self.get(accept_encoding="gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertNotEqual(response["ETag"], plain["ETag"])
+
+    @skipIf(sitemaps.brotli is None, "brotli is not installed")
+    def test_brotli(self):
+        plain = self.get()
+        response = self.get(accept_encoding="gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(sitemaps.brotli.decompress(response.content), plain.content)
+
+    def test_not_modified(self):
+        response = self.get(accept_encoding="gzip")
+        self.assertEqual(
+            self.get(accept_encoding="gzip", if_none_match=response["ETag"]).status_code, 304
+        )
+        self.assertEqual(self.get(if_modified_since=response["Last-Modified"]).status_code, 304)
+
+    def test_publish_regenerates_its_section_only(self):
+        self.get()
+        with (
+            mock.patch.object(CMSSitemap, "items", side_effect=AssertionError),
+            mock.patch.object(StoriesSitemap, "items", side_effect=AssertionError),
+        ):
+            self.assertIn(b"/first-post/</loc>", self.get().content)
+
+        self.publish("Second post")
+        with mock.patch.object(CMSSitemap, "items", side_effect=AssertionError):
+            response = self.get()
+        self.assertIn(b"/second-post/</loc>", response.content)
+        self.assertIn(b"https://example.com/blog/</loc>", response.content)
+
+    def test_page_change_regenerates_posts(self):
+        self.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_pages()
+        with mock.patch.object(StoriesSitemap, "items", return_value=[]) as items:
+            self.get()
+        items.assert_called()
+
+    @override_settings(SITEMAP_INDEX_THRESHOLD=1)
+    def test_index_of_sections(self):
+        response = self.get()
+        self.assertIn(b"<sitemapindex", response.content)
+        self.assertIn(b"<loc>https://example.com/sitemap-cmspages.xml</loc>", response.content)
+        self.assertIn(b"<loc>https://example.com/sitemap-stories.xml</loc>", response.content)
+
+        stories = self.get("/sitemap-stories.xml")
+        self.assertIn(b"/first-post/</loc>", stories.content)
+        self.assertNotIn(b"https://example.com/blog/</loc>", stories.content)
+        self.assertEqual(self.get("/sitemap-stories.xml?p=2").status_code, 404)
+        self.assertEqual(self.get("/sitemap-stories.xml?p=x").status_code, 404)
+        self.assertEqual(self.get("/sitemap-other.xml").status_code, 404)
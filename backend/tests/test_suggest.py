@@ -0,0 +1,102 @@
+import json
+
+from django.contrib.sites.models import Site
+from django.test import RequestFactory, TestCase
+from django.urls import ResolverMatch
+from djangocms_versioning.models import Version
+
+from backend.cache import PAGES, bump_generation
+from backend.suggest import suggest_index
+from backend.tests.utils import (
+    ApphookTestCase,
+    create_app_config,
+    create_blog_page,
+    create_post,
+    create_user,
+)
+from backend.views import PostSuggestView
+
+
+class SuggestIndexTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.config = create_app_config()
+
+    def publish(self, title, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return create_post(self.config, self.user, title, **kwargs)
+
+    def lookup(self, prefix, site_id=1, namespace="djangocms_stories"):
+        return [
+            suggestion.title
+            for suggestion in suggest_index.lookup(namespace, "en", site_id, prefix)
+        ]
+
+    def test_matches_any_word_prefix(self):
+        self.publish("django CMS 5 released")
+        self.publish("CMS plugins explained")
+        self.publish("Release planning")
+
+        self.assertEqual(self.lookup("cms"), ["django CMS 5 released", "CMS plugins explained"])
+        self.assertEqual(self.lookup("  RELEAS "), ["Release planning", "django CMS 5 released"])
+        self.assertEqual(self.lookup("cms 5"), ["django CMS 5 released"])
+        self.assertEqual(self.lookup("wagtail"), [])
+        self.assertEqual(self.lookup(""), [])
+
+    def test_lookups_do_not_query_the_database(self):
+        self.publish("Caching")
+        self.lookup("c")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.lookup("cach"), ["Caching"])
+
+    def test_rebuilt_after_publish_and_unpublish(self):
+        content = self.publish("First post")
+        self.assertEqual(self.lookup("first"), ["First post"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Version.objects.get_for_content(content).unpublish(self.user)
+        self.assertEqual(self.lookup("first"), [])
+
+    def test_rebuilt_when_pages_change(self):
+        self.publish("Caching")
+        self.lookup("c")
+        built = suggest_index._state
+
+        bump_generation(PAGES)
+        self.assertEqual(self.lookup("cach"), ["Caching"])
+        self.assertIsNot(suggest_index._state, built)
+
+    def test_drafts_other_sites_and_namespaces_are_excluded(self):
+        create_post(self.config, self.user, "Draft post", publish=False)
+        other_site = Site.objects.create(domain="other.example.com", name="Other")
+        content = self.publish("Other site post")
+        with self.captureOnCommitCallbacks(execute=True):
+            content.post.sites.set([other_site])
+
+        self.assertEqual(self.lookup("draft"), [])
+        self.assertEqual(self.lookup("other"), [])
+        self.assertEqual(self.lookup("other", site_id=other_site.pk), ["Other site post"])
+        self.assertEqual(self.lookup("other", site_id=other_site.pk, namespace="news"), [])
+
+
+class PostSuggestViewTests(ApphookTestCase):
+    def test_json_response(self):
+        user = create_user()
+        config = create_app_config()
+        with self.captureOnCommitCallbacks(execute=True):
+            create_blog_page(user, config)
+            content = create_post(config, user, "Search as you type")
+        request = RequestFactory().get("/en/blog/suggest/", {"q": "sea"})
+        request.resolver_match = ResolverMatch(
+            PostSuggestView.as_view(), (), {}, namespaces=["djangocms_stories"]
+        )
+
+        response = PostSuggestView.as_view()(request)
+
+        url = content.get_absolute_url()
+        self.assertTrue(url.startswith("/blog/"))
+        self.assertEqual(
+            json.loads(response.content),
+            {"query": "sea", "suggestions": [{"title": "Search as you type", "url": url}]},
+        )
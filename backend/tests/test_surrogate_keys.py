@@ -0,0 +1,173 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from cms.api import create_page
+from cms.models import PageContent
+from django.test import SimpleTestCase, override_settings
+from djangocms_alias.models import Alias, AliasContent, Category
+from djangocms_versioning.constants import OPERATION_ARCHIVE, OPERATION_PUBLISH
+from djangocms_versioning.models import Version
+
+from authors.models import AuthorProfile
+from backend import surrogate_keys
+from backend.tests.utils import (
+    TEST_STORAGES,
+    ApphookTestCase,
+    create_app_config,
+    create_blog_page,
+    create_category,
+    create_post,
+    create_user,
+)
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class SurrogateKeyHeaderTests(ApphookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        self.config = create_app_config()
+        self.page = create_blog_page(self.user, self.config)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.content = create_post(self.config, self.user, "First post")
+
+    def keys(self, url="/blog/"):
+        response = self.client.get(url, secure=True)
+        self.assertEqual(response.status_code, 200)
+        keys = set(response["Surrogate-Key"].split(" "))
+        self.assertEqual(set(response["Cache-Tag"].split(",")), keys)
+        return keys
+
+    def test_listing(self):
+        self.assertLessEqual(
+            {
+                f"page-{self.page.pk}",
+                f"post-{self.content.post_id}",
+                "posts",
+                "categories",
+                "menu",
+            },
+            self.keys(),
+        )
+
+    def test_post_detail(self):
+        category = create_category(self.config, "News")
+        self.content.post.categories.add(category)
+        keys = self.keys(self.content.get_absolute_url())
+        self.assertLessEqual(
+            {
+                f"page-{self.page.pk}",
+                f"post-{self.content.post_id}",
+                f"author-{self.user.pk}",
+                f"category-{category.pk}",
+            },
+            keys,
+        )
+
+    def test_static_aliases(self):
+        alias = Alias.objects.create(
+            static_code="footer", category=Category.objects.create(name="Static")
+        )
+        self.assertIn(f"alias-{alias.pk}", self.keys())
+
+    def test_replayed_from_page_cache(self):
+        keys = self.keys()
+        self.client.cookies.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.keys(), keys)
+
+    @override_settings(PAGE_CACHE_ENABLED=False)
+    def test_replayed_from_cms_page_cache(self):
+        page = create_page("About", "cms_theme/base.html", "en", slug="about", created_by=self.user)
+        content = PageContent.admin_manager.get(page=page, language="en")
+        Version.objects.get_for_content(content).publish(self.user)
+        keys = self.keys("/about/")
+        self.assertIn(f"page-{page.pk}", keys)
+        self.client.cookies.clear()
+        with mock.patch("cms.views.get_page_from_request", side_effect=AssertionError):
+            self.assertEqual(self.keys("/about/"), keys)
+
+
+@override_settings(SURROGATE_KEY_PURGE_BACKEND="backend.surrogate_keys.InMemoryPurgeBackend")
+class PurgeTests(ApphookTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        self.config = create_app_config()
+        self.backend = surrogate_keys.get_purge_backend()
+        self.backend.purged.clear()
+
+    def test_post_publish_and_unpublish(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            content = create_post(self.config, self.user, "First post")
+        self.assertEqual(self.backend.purged, [[f"post-{content.post_id}", "posts"]])
+
+        self.backend.purged.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            Version.objects.get_for_content(content).unpublish(self.user)
+        self.assertEqual(self.backend.purged, [[f"post-{content.post_id}", "posts"]])
+
+    def test_drafts_are_not_purged(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_post(self.config, self.user, "Draft", publish=False)
+        self.assertEqual(self.backend.purged, [])
+
+    def test_alias_publish(self):
+        alias = Alias.objects.create(
+            static_code="navbar", category=Category.objects.create(name="Static")
+        )
+        content = AliasContent.objects.with_user(self.user).create(
+            alias=alias, name="navbar", language="en"
+        )
+        version = SimpleNamespace(content=content)
+        with self.captureOnCommitCallbacks(execute=True):
+            surrogate_keys.on_version_operation(AliasContent, version, OPERATION_ARCHIVE)
+            surrogate_keys.on_version_operation(AliasContent, version, OPERATION_PUBLISH)
+        self.assertEqual(self.backend.purged, [[f"alias-{alias.pk}"]])
+
+    def test_page_publish_purges_menus(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            page = create_blog_page(self.user, self.config)
+        self.assertIn(["menu", f"page-{page.pk}"], self.backend.purged)
+
+    def test_category_change(self):
+        category = create_category(self.config, "News")
+        self.backend.purged.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            category.set_current_language("en")
+            category.name = "Releases"
+            category.save()
+        self.assertIn(["categories", f"category-{category.pk}"], self.backend.purged)
+
+    def test_author_change(self):
+        content = create_post(self.config, self.user, "First post")
+        self.backend.purged.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            AuthorProfile.objects.create(user=self.user, name="Ada", slug="ada")
+        self.assertEqual(
+            self.backend.purged, [[f"author-{self.user.pk}", f"post-{content.post_id}"]]
+        )
+
+
+class CollectTests(SimpleTestCase):
+    def test_outside_a_response(self):
+        surrogate_keys.add("posts")
+        with surrogate_keys.collect() as keys:
+            surrogate_keys.add("posts", None)
+            with surrogate_keys.collect() as inner:
+                surrogate_keys.add("menu")
+        self.assertEqual(keys, {"posts"})
+        self.assertEqual(inner, {"menu"})
+
+    def test_unknown_objects(self):
+        with self.assertRaises(TypeError):
+            surrogate_keys.object_keys(object())
+
+
+class LoggingPurgeBackendTests(SimpleTestCase):
+    def test_logs_keys(self):
+        with self.assertLogs("backend.surrogate_keys", "INFO") as logs:
+            surrogate_keys.LoggingPurgeBackend().purge({"posts", "post-1"})
+        self.assertEqual(
+            logs.output, ["INFO:backend.surrogate_keys:Purge surrogate keys: post-1 posts"]
+        )
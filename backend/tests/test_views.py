@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+from djangocms_stories.models import PostContent
+
+from backend.templatetags.blog_tags import primary_category
+from backend.tests.utils import (
+    TEST_STORAGES,
+    ApphookTestCase,
+    create_app_config,
+    create_blog_page,
+    create_category,
+    create_post,
+    create_user,
+)
+from backend.cards import LISTED_CATEGORIES
+from backend.views import OptimizedListMixin
+
+
+class PrimaryCategoryTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.config = create_app_config()
+        self.post = create_post(self.config, self.user, "Post").post
+        self.post.categories.add(
+            create_category(self.config, "Unranked"),
+            create_category(self.config, "Second", priority=2),
+            create_category(self.config, "First", priority=1),
+        )
+
+    def test_first_by_priority(self):
+        self.assertEqual(primary_category(self.post).name, "First")
+
+    def test_reads_prefetched_categories(self):
+        class Base:
+            def get_queryset(self):
+                return PostContent.objects.all()
+
+        class View(OptimizedListMixin, Base):
+            # Only drafts, listed in edit mode, have no card to render from.
+            request = SimpleNamespace(
+                toolbar=SimpleNamespace(edit_mode_active=True, preview_mode_active=False)
+            )
+
+        content = View().get_queryset().get()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                [category.name for category in getattr(content.post, LISTED_CATEGORIES)],
+                ["First", "Second", "Unranked"],
+            )
+            self.assertEqual(str(primary_category(content.post)), "First")
+
+    def test_no_category(self):
+        self.post.categories.clear()
+        self.assertIsNone(primary_category(self.post))
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class ListingQueryTests(ApphookTestCase):
+    """Every optimized list route costs the same number of queries for 1 or 4 posts."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        self.config = create_app_config()
+        self.category = create_category(self.config, "News")
+        create_blog_page(self.user, self.config)
+        self.publish()
+
+    def publish(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            content = create_post(self.config, self.user, f"Post {now().timestamp()}")
+            content.post.categories.add(self.category)
+            content.post.tags.add("release")
+
+    def count_queries(self, url, posts):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, secure=True)
+        self.assertEqual(len(response.context["postcontent_list"]), posts)
+        return len(queries)
+
+    def assert_constant_queries(self, url):
+        # The first request fills per-process caches (content types, apphooks).
+        self.client.get(url, secure=True)
+        queries = self.count_queries(url, 1)
+        for _ in range(3):
+            self.publish()
+        self.assertEqual(self.count_queries(url, 4), queries)
+
+    def test_latest(self):
+        self.assert_constant_queries("/blog/")
+
+    def test_category(self):
+        self.assert_constant_queries("/blog/category/news/")
+
+    def test_archive(self):
+        self.assert_constant_queries(f"/blog/{now().year}/")
+
+    def test_author(self):
+        self.assert_constant_queries(f"/blog/author/{self.user.username}/")
+
+    def test_tagged(self):
+        self.assert_constant_queries("/blog/tag/release/")
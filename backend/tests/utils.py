@@ -0,0 +1,92 @@
+from cms.api import create_page
+from cms.models import PageContent
+from cms.utils.apphook_reload import reload_urlconf
+from django.contrib.auth import get_user_model
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils.text import slugify
+from django.utils.timezone import now
+from djangocms_stories.cms_appconfig import StoriesConfig
+from djangocms_stories.models import Post, PostCategory, PostContent
+from djangocms_versioning.models import Version
+
+# Rendering full pages in tests needs static files without a collected manifest.
+TEST_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+def create_user(username="editor"):
+    return get_user_model().objects.create_superuser(
+        username=username, email=f"{username}@example.com", password="password"
+    )
+
+
+def create_app_config(namespace="djangocms_stories"):
+    return StoriesConfig.objects.language("en").create(
+        namespace=namespace,
+        app_title="Blog",
+        object_name="Post",
+        url_patterns="full_date",
+        template_prefix="blog",
+        set_author=True,
+        menu_structure="complete",
+        menu_empty_categories=True,
+        sitemap_changefreq="monthly",
+        sitemap_priority="0.5",
+    )
+
+
+def create_post(app_config, user, title, language="en", publish=True, **fields):
+    """Create a post with one content version, published unless ``publish`` is false."""
+    post = Post.objects.create(app_config=app_config, author=user, date_published=now())
+    post.sites.add(Site.objects.get_current())
+    content = PostContent.objects.with_user(user).create(
+        post=post, language=language, title=title, **fields
+    )
+    if publish:
+        Version.objects.get_for_content(content).publish(user)
+    return content
+
+
+def create_category(app_config, name, **fields):
+    return PostCategory.objects.language("en").create(
+        app_config=app_config, name=name, slug=slugify(name), **fields
+    )
+
+
+def create_blog_page(user, app_config, slug="blog"):
+    """Publish a page hooking the stories app of ``app_config`` in at ``/<slug>/``."""
+    page = create_page(
+        "Blog",
+        "cms_theme/base.html",
+        "en",
+        slug=slug,
+        created_by=user,
+        apphook="StoriesApp",
+        apphook_namespace=app_config.namespace,
+    )
+    page_content = PageContent.admin_manager.get(page=page, language="en")
+    Version.objects.get_for_content(page_content).publish(user)
+    reload_urlconf()
+    return page
+
+
+class ApphookTestCase(TestCase):
+    """Test case for pages created with :func:`create_blog_page`.
+
+    Apphooks are resolved into the URLconf, which outlives the rolled-back
+    pages; it is reloaded once the class is done. Every test starts with an
+    empty cache, as cached listings outlive their posts as well.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        reload_urlconf()
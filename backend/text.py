@@ -0,0 +1,81 @@
+from functools import lru_cache
+from html import unescape
+
+from django import forms
+from django.utils.html import strip_tags
+
+from cms.utils.plugins import downcast_plugins, get_plugin_class
+
+BLOG_CONTENT_SLOT = "Blog Content"
+
+# Component form fields that are CharFields but hold identifiers or data, not prose.
+NON_TEXT_CONFIG_FIELDS = frozenset({"anchor", "link_list"})
+
+
+def html_to_text(html):
+    """Strip markup and collapse whitespace."""
+    return " ".join(unescape(strip_tags(html or "")).split())
+
+
+@lru_cache(maxsize=None)
+def _config_text_fields(plugin_type):
+    """Names of the free-text fields a frontend component stores in ``config``."""
+    try:
+        form = get_plugin_class(plugin_type).form
+    except KeyError:
+        return ()
+    return tuple(
+        name
+        for name, field in getattr(form, "base_fields", {}).items()
+        if isinstance(field, forms.CharField)
+        and not isinstance(field, (forms.URLField, forms.SlugField, forms.EmailField))
+        and name not in NON_TEXT_CONFIG_FIELDS
+    )
+
+
+def plugin_text(instance):
+    """Return the readable text of one bound (downcast) plugin instance.
+
+    Covers markdown plugins (their rendered HTML), djangocms-frontend items
+    including our ``cms_components`` (the text fields of ``config``) and text
+    plugins (``body``). Anything else contributes no text.
+    """
+    body_rendered = getattr(instance, "body_rendered", None)
+    if isinstance(body_rendered, str):
+        return html_to_text(body_rendered)
+    config = getattr(instance, "config", None)
+    if isinstance(config, dict):
+        return " ".join(
+            html_to_text(config[name])
+            for name in _config_text_fields(instance.plugin_type)
+            if isinstance(config.get(name), str) and config[name]
+        )
+    body = getattr(instance, "body", None)
+    if isinstance(body, str):
+        return html_to_text(body)
+    return ""
+
+
+def placeholder_text(placeholder, language):
+    """Return the text of all plugins in ``placeholder``, in plugin order."""
+    plugins = list(placeholder.get_plugins(language).order_by("position"))
+    texts = (plugin_text(instance) for instance in downcast_plugins(plugins))
+    return "\n".join(text for text in texts if text)
+
+
+def post_content_text(post_content, slot=BLOG_CONTENT_SLOT):
+    """Return the body text of a post: its ``slot`` placeholder plus ``post_text``."""
+    texts = [html_to_text(post_content.post_text)]
+    placeholder = post_content.placeholders.filter(slot=slot).first()
+    if placeholder is not None:
+        texts.append(placeholder_text(placeholder, post_content.language))
+    return "\n".join(text for text in texts if text)
+
+
+def page_content_text(page_content):
+    """Return the text of all placeholders of a CMS page, one placeholder after another."""
+    texts = (
+        placeholder_text(placeholder, page_content.language)
+        for placeholder in page_content.placeholders.order_by("pk")
+    )
+    return "\n".join(text for text in texts if text)
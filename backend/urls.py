@@ -1,17 +1,11 @@
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.contrib.sitemaps.views import sitemap
 from django.urls import include, path
 from django.views.generic import TemplateView
 
-from cms.sitemaps import CMSSitemap
-from djangocms_stories.sitemaps import StoriesSitemap
-
-sitemaps = {
-    "cmspages": CMSSitemap,
-    "stories": StoriesSitemap,
-}
+from backend.sitemaps import sitemap_view
+from backend.views import SiteSearchView
 
 urlpatterns = [
     path(
@@ -21,12 +15,14 @@ urlpatterns = [
             content_type="text/plain",
         ),
     ),
+    # Pre-rendered and precompressed, see backend.sitemaps.
     path(
         "sitemap.xml",
-        sitemap,
-        {"sitemaps": sitemaps},
+        sitemap_view,
         name="django.contrib.sitemaps.views.sitemap",
     ),
+    path("sitemap-<str:section>.xml", sitemap_view, name="sitemap-section"),
+    path("search/", SiteSearchView.as_view(), name="site-search"),
     path("admin/", admin.site.urls),
 ]
 
@@ -1,5 +1,12 @@
-from django.db.models import Q
+from django.conf import settings
+from django.contrib.sites.shortcuts import get_current_site
+from django.core.paginator import InvalidPage
+from django.db.models import Prefetch
+from django.http import Http404, JsonResponse
+from django.utils.translation import get_language
+from django.views.generic import TemplateView, View
 
+from djangocms_stories.models import PostCategory
 from djangocms_stories.views import (
     AuthorEntriesView,
     CategoryEntriesView,
@@ -8,37 +15,183 @@ from djangocms_stories.views import (
     TaggedListView,
 )
 
+from .archive import has_posts
+from .cards import CATEGORY_ORDER, LISTED_CATEGORIES
+from .facets import cached_facets, count_facets
+from .pagination import AFTER, BEFORE, CachedCountPaginator, KeysetPaginator
+from .search import search_posts, search_site
+from .suggest import suggest_index
+
+# The library's prefetches made redundant by the cards of published posts.
+CARD_PREFETCHES = (
+    "post__categories",
+    "post__categories__translations",
+    "post__categories__app_config",
+)
+
+
+def shows_drafts(request):
+    """Whether blog views list draft versions, i.e. in edit and preview mode."""
+    toolbar = getattr(request, "toolbar", None)
+    return toolbar is not None and (toolbar.edit_mode_active or toolbar.preview_mode_active)
+
 
 class OptimizedListMixin:
     """Extend the library's list-view query optimization for our templates.
 
-    The base ``optimize()`` only covers ``post__app_config`` and
-    ``post__categories``. Our blog list templates additionally render, per post,
-    the main image (``post_item.html`` / ``card_image_top.html``) and the author
-    profile with its photo (``card_author.html``). Pulling those in avoids an
-    N+1 query per post in the list. All paths are nullable FKs / a reverse
-    OneToOne, so select_related uses LEFT JOINs.
+    Published posts are rendered from their :class:`backend.models.PostCard`,
+    which is joined in; the library's category prefetches
+    (``CARD_PREFETCHES``) are dropped, as the cards carry the category name.
+    Other prefetches are kept.
+
+    Drafts, listed in edit and preview mode, have no card; theirs are built
+    while rendering (see the ``post_card`` tag), from the main image
+    (``post_item.html`` / ``card_image_top.html``), the author profile with
+    its photo (``card_author.html``) and the first category by priority.
+    Pulling those in avoids an N+1 query per post in the list. All paths are
+    nullable FKs / a reverse OneToOne, so select_related uses LEFT JOINs.
+    Post URLs are built from the slug of the post's published contents,
+    which are prefetched as well. The ordered categories with their
+    translations are prefetched into ``LISTED_CATEGORIES`` in
+    ``get_queryset()``, as the library's views may call ``optimize()`` twice
+    and a ``Prefetch`` with a queryset cannot be repeated.
     """
 
     def optimize(self, qs):
-        return super().optimize(qs).select_related(
+        qs = super().optimize(qs).select_related("card")
+        if not shows_drafts(self.request):
+            lookups = [
+                lookup
+                for lookup in qs._prefetch_related_lookups
+                if getattr(lookup, "prefetch_to", lookup) not in CARD_PREFETCHES
+            ]
+            return qs.prefetch_related(None).prefetch_related(*lookups)
+        return qs.select_related(
             "post__main_image",
             "post__author",
             "post__author__author_profile",
             "post__author__author_profile__photo",
+        ).prefetch_related(
+            # Post URLs read the slug through ``Post.get_content()``.
+            "post__postcontent_set"
+        )
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if not shows_drafts(self.request):
+            return qs
+        return qs.prefetch_related(
+            Prefetch(
+                "post__categories",
+                queryset=PostCategory.objects.order_by(*CATEGORY_ORDER).prefetch_related(
+                    "translations"
+                ),
+                to_attr=LISTED_CATEGORIES,
+            )
+        )
+
+
+def listing_scope(view):
+    """Identify the result set of a blog list view, for caching what is derived from it.
+
+    Returns ``None`` in edit and preview mode, where drafts are listed and
+    nothing is cached.
+    """
+    if shows_drafts(view.request):
+        return None
+    return (
+        view.namespace,
+        view.request.resolver_match.url_name,
+        sorted(view.kwargs.items()),
+        view.request.GET.get("q", "").strip(),
+        get_language(),
+        get_current_site(view.request).pk,
+    )
+
+
+class KeysetPaginationMixin:
+    """Paginate by (sort date, post id) with cursors; see :class:`KeysetPaginator`.
+
+    Search results keep a numbered paginator, as they are ordered by rank.
+    Either way the count is cached per listing (:func:`listing_scope`). The
+    unfiltered latest-posts listing may use the Postgres planner's estimate.
+    """
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return CachedCountPaginator(
+            queryset, per_page, count_scope=listing_scope(self), **kwargs
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.request.GET.get("q", "").strip():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = KeysetPaginator(
+            queryset,
+            page_size,
+            numbered_pages=getattr(settings, "BLOG_NUMBERED_PAGES", 5),
+            count_scope=listing_scope(self),
+            estimate=self.request.resolver_match.url_name == "posts-latest",
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
         )
+        params = self.request.GET
+        number = self.kwargs.get(self.page_kwarg) or params.get(self.page_kwarg) or 1
+        if number == "last":
+            number = paginator.num_pages
+        try:
+            if params.get(AFTER) or params.get(BEFORE):
+                page = paginator.cursor_page(
+                    number, after=params.get(AFTER), before=params.get(BEFORE)
+                )
+            else:
+                page = paginator.page(number)
+        except InvalidPage as exc:
+            raise Http404(f"Invalid page ({number}): {exc}")
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class PostFacetsMixin:
+    """Add category, tag and year counts of the whole result set as ``facets``.
+
+    See :func:`backend.facets.count_facets`. Counts are cached per listing
+    (:func:`listing_scope`); in edit and preview mode they include drafts and
+    are never cached. ``blog_wide_facets`` tells whether the listing shows
+    every post, so that the counts hold for the whole blog.
+    """
+
+    def blog_wide_facets(self):
+        return (
+            self.request.resolver_match.url_name == "posts-latest"
+            and not self.request.GET.get("q", "").strip()
+        )
+
+    def get_facets(self):
+        scope = listing_scope(self)
+        if scope is None:
+            return count_facets(self.object_list)
+        return cached_facets(self.object_list, scope)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["facets"] = self.get_facets()
+        context["blog_wide_facets"] = self.blog_wide_facets()
+        return context
 
 
-class SearchPostListView(OptimizedListMixin, PostListView):
-    """Extends PostListView with ?q= search filtering on title and abstract."""
+class SearchPostListView(
+    KeysetPaginationMixin, PostFacetsMixin, OptimizedListMixin, PostListView
+):
+    """Extends PostListView with ?q= full-text search, best matches first.
+
+    Matching and ranking are done by :func:`backend.search.search_posts` over
+    the title, abstract and body text of the published posts.
+    """
 
     def get_queryset(self):
         qs = super().get_queryset()
         query = self.request.GET.get("q", "").strip()
         if query:
-            qs = qs.filter(
-                Q(title__icontains=query) | Q(abstract__icontains=query)
-            )
+            qs = search_posts(qs, query, get_language())
         return qs
 
     def get_context_data(self, **kwargs):
@@ -47,17 +200,89 @@ class SearchPostListView(OptimizedListMixin, PostListView):
         return context
 
 
-class OptimizedPostArchiveView(OptimizedListMixin, PostArchiveView):
-    pass
+class PostSuggestView(View):
+    """Title suggestions for search-as-you-type (``?q=<prefix>``), as JSON.
+
+    Answered from :data:`backend.suggest.suggest_index`. The app instance is
+    taken from the resolved URL rather than from the apphook page, so a
+    keystroke costs no database query.
+    """
+
+    limit = 8
+
+    def get(self, request, *args, **kwargs):
+        query = request.GET.get("q", "")
+        suggestions = suggest_index.lookup(
+            request.resolver_match.namespace,
+            get_language(),
+            get_current_site(request).pk,
+            query,
+            self.limit,
+        )
+        return JsonResponse(
+            {
+                "query": query,
+                "suggestions": [
+                    {"title": suggestion.title, "url": suggestion.url}
+                    for suggestion in suggestions
+                ],
+            }
+        )
+
+
+class OptimizedPostArchiveView(
+    KeysetPaginationMixin, PostFacetsMixin, OptimizedListMixin, PostArchiveView
+):
+    """Years and months without posts are told by the month index of
+    :mod:`backend.archive`, so their pages run no list, count or facet query.
+    """
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if shows_drafts(self.request):
+            return qs
+        month = self.kwargs.get("month")
+        if not has_posts(
+            self.config.pk,
+            get_language(),
+            get_current_site(self.request).pk,
+            int(self.kwargs["year"]),
+            int(month) if month else None,
+        ):
+            return qs.none()
+        return qs
 
 
-class OptimizedTaggedListView(OptimizedListMixin, TaggedListView):
+class OptimizedTaggedListView(
+    KeysetPaginationMixin, PostFacetsMixin, OptimizedListMixin, TaggedListView
+):
     pass
 
 
-class OptimizedAuthorEntriesView(OptimizedListMixin, AuthorEntriesView):
+class OptimizedAuthorEntriesView(
+    KeysetPaginationMixin, PostFacetsMixin, OptimizedListMixin, AuthorEntriesView
+):
     pass
 
 
-class OptimizedCategoryEntriesView(OptimizedListMixin, CategoryEntriesView):
+class OptimizedCategoryEntriesView(
+    KeysetPaginationMixin, PostFacetsMixin, OptimizedListMixin, CategoryEntriesView
+):
     pass
+
+
+class SiteSearchView(TemplateView):
+    """Searches published CMS pages and blog posts together (``?q=``)."""
+
+    template_name = "search.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get("q", "").strip()
+        context["search_query"] = query
+        context["results"] = (
+            search_site(query, get_language(), get_current_site(self.request))
+            if query
+            else []
+        )
+        return context